@@ -5,8 +5,19 @@ from flask import Flask
 from flask_cors import CORS
 from flask_migrate import Migrate
 from app.routes import auth_service_bp
+from app.cli import login_events_cli, refresh_tokens_cli, users_cli
 from app.config import get_config
-from app.database import init_db, db
+from app.database import init_db, init_replica_routing, db
+from app.service.auth_record_cache import init_auth_record_cache
+from app.service.credential_cache import init_credential_cache
+from app.service.hashing import init_hashing
+from app.service.last_login import init_last_login
+from app.service.login_events import init_login_events
+from app.service.profile_cache import init_profile_cache
+from app.service.revocation import init_revocation
+from app.service.token_versions import init_token_versions
+from app.service.username_filter import init_username_filter
+
 
 def create_app():
     app = Flask(__name__)
@@ -25,9 +36,23 @@ def create_app():
     # Set up detailed logging after configuration
     setup_logging(app)
 
-    # Initialize the database
-    init_db(app)
-    logger.debug("Database has been initialized.")
+    # Initialize the database, then the per-worker caches and background
+    # services built on it
+    for init, component in (
+        (init_db, "Database"),
+        (init_replica_routing, "Replica routing"),
+        (init_hashing, "Hashing pool"),
+        (init_credential_cache, "Credential cache"),
+        (init_auth_record_cache, "Auth record cache"),
+        (init_username_filter, "Username filter"),
+        (init_profile_cache, "Profile cache"),
+        (init_revocation, "Revocation list"),
+        (init_token_versions, "Token version cache"),
+        (init_login_events, "Login audit log"),
+        (init_last_login, "Last login tracking"),
+    ):
+        init(app)
+        logger.debug(f"{component} has been initialized.")
 
     # Initialize Flask-Migrate
     Migrate(app, db)
@@ -40,6 +65,12 @@ def create_app():
     app.register_blueprint(auth_service_bp)
     logger.debug("Auth service blueprint registered.")
 
+    # Register CLI commands
+    app.cli.add_command(users_cli)
+    app.cli.add_command(login_events_cli)
+    app.cli.add_command(refresh_tokens_cli)
+    logger.debug("CLI commands registered.")
+
     # Conditionally register Swagger UI in development environment
     if app.config.get("ENV") == "development":
         register_swagger_ui(app, logger)
@@ -47,6 +78,7 @@ def create_app():
     logger.info("Flask application creation complete.")
     return app
 
+
 def setup_logging(app) -> None:
     """Configures logging for the Flask application."""
     # Remove default handlers to prevent duplicate logs
@@ -74,6 +106,7 @@ def setup_logging(app) -> None:
         file_handler.setFormatter(formatter)
         app.logger.addHandler(file_handler)
 
+
 def register_swagger_ui(app, logger) -> None:
     """Registers Swagger UI for API documentation in development environment."""
     try:
@@ -0,0 +1,125 @@
+# app/cli.py
+
+import json
+import logging
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.database import get_db
+from app.service import user_export
+from app.service.login_events import maintain_partitions
+from app.service.refresh_tokens import prune_refresh_tokens
+from app.service.user_import import (
+    FORMATS,
+    ImportCheckpoint,
+    import_users,
+    read_rows,
+)
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+users_cli = AppGroup("users", help="Manage user accounts.")
+login_events_cli = AppGroup("login-events", help="Manage the login audit log.")
+refresh_tokens_cli = AppGroup("refresh-tokens", help="Manage refresh tokens.")
+
+
+@users_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(FORMATS),
+    help="Input format; defaults to the file extension.",
+)
+@click.option("--batch-size", type=int, help="Rows inserted per transaction.")
+@click.option(
+    "--checkpoint",
+    "checkpoint_path",
+    type=click.Path(dir_okay=False),
+    help="Progress file for resuming; defaults to PATH.checkpoint.",
+)
+@click.option("--restart", is_flag=True, help="Ignore any existing checkpoint.")
+def import_users_command(path, fmt, batch_size, checkpoint_path, restart):
+    """Create users from a CSV or NDJSON file, printing NDJSON progress."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise click.BadParameter(
+            f"Cannot infer the format of {path}", param_hint="--format"
+        )
+
+    checkpoint = ImportCheckpoint(checkpoint_path or f"{path}.checkpoint")
+    resume_after = 0 if restart else checkpoint.load()
+    if resume_after:
+        click.echo(f"Resuming after row {resume_after}", err=True)
+
+    with open(path, newline="", encoding="utf-8") as f, get_db() as db:
+        for event in import_users(
+            read_rows(f, fmt),
+            db,
+            batch_size=batch_size or current_app.config["USER_IMPORT_BATCH_SIZE"],
+            resume_after=resume_after,
+            checkpoint=checkpoint,
+            hash_workers=current_app.config.get("USER_IMPORT_HASH_WORKERS"),
+        ):
+            click.echo(json.dumps(event))
+
+
+@users_cli.command("export")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(user_export.FORMATS),
+    default="ndjson",
+    show_default=True,
+)
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output.")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default="-",
+    help="File to write; defaults to stdout.",
+)
+@click.option("--batch-size", type=int, help="Rows fetched per round trip.")
+def export_users_command(fmt, compress, output, batch_size):
+    """Stream every user as NDJSON or CSV."""
+    with get_db() as db:
+        chunks = user_export.export_users(
+            db,
+            fmt,
+            batch_size=batch_size or current_app.config["USER_EXPORT_BATCH_SIZE"],
+        )
+        if compress:
+            chunks = user_export.gzip_chunks(chunks)
+        else:
+            chunks = (chunk.encode("utf-8") for chunk in chunks)
+        with click.open_file(output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+
+@login_events_cli.command("maintain")
+@click.option("--retention-days", type=int, help="Days of events to keep.")
+@click.option("--days-ahead", type=int, help="Days of partitions to create ahead.")
+def maintain_login_events_command(retention_days, days_ahead):
+    """Drop expired login events and create upcoming daily partitions."""
+    config = current_app.config
+    with get_db() as db:
+        result = maintain_partitions(
+            db,
+            retention_days=retention_days or config["LOGIN_EVENTS_RETENTION_DAYS"],
+            days_ahead=days_ahead or config["LOGIN_EVENTS_PARTITIONS_AHEAD"],
+        )
+    click.echo(json.dumps(result))
+
+
+@refresh_tokens_cli.command("prune")
+@click.option("--batch-size", type=int, default=1000, show_default=True)
+def prune_refresh_tokens_command(batch_size):
+    """Delete expired refresh tokens, including rotated and revoked ones."""
+    with get_db() as db:
+        deleted = prune_refresh_tokens(db, batch_size=batch_size)
+    click.echo(json.dumps({"deleted": deleted}))
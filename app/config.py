@@ -7,8 +7,191 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def engine_options(database_uri, pool_size=5, max_overflow=10, pool_recycle=1800):
+    """Build SQLALCHEMY_ENGINE_OPTIONS, letting DB_* variables override defaults.
+
+    Each uWSGI process holds its own pool, so the database sees up to
+    processes * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections. SQLite URIs
+    (tests, local runs) keep Flask-SQLAlchemy's defaults.
+    """
+    if not database_uri or database_uri.startswith("sqlite"):
+        return {}
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", str(pool_size))),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", str(max_overflow))),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", str(pool_recycle))),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        # Compiled-SQL cache entries per engine; see statement_cache in /metrics
+        "query_cache_size": int(os.getenv("DB_QUERY_CACHE_SIZE", "500")),
+    }
+    if database_uri.startswith("mysql"):
+        # Both mysqlclient and PyMySQL accept these, in seconds
+        options["connect_args"] = {
+            "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+            "read_timeout": int(os.getenv("DB_READ_TIMEOUT", "30")),
+            "write_timeout": int(os.getenv("DB_WRITE_TIMEOUT", "30")),
+        }
+    return options
+
+
+def client_credentials(name):
+    """Parse an "id:secret,id:secret" variable into a dict of secrets by id."""
+    return dict(
+        client.split(":", 1)
+        for client in os.getenv(name, "").split(",")
+        if ":" in client
+    )
+
+
+def replica_binds(pool_size=5, max_overflow=10):
+    """Build SQLALCHEMY_BINDS with the optional read replica.
+
+    DATABASE_REPLICA_URL may point at a single replica or a load-balanced
+    reader endpoint; without it every query goes to the primary.
+    """
+    replica_url = os.getenv("DATABASE_REPLICA_URL")
+    if not replica_url:
+        return {}
+    return {
+        "replica": {
+            "url": replica_url,
+            **engine_options(
+                replica_url, pool_size=pool_size, max_overflow=max_overflow
+            ),
+        }
+    }
+
+
 class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Password hashing pool (per uWSGI process)
+    HASH_POOL_MAX_WORKERS = int(os.getenv("HASH_POOL_MAX_WORKERS", "2"))
+    HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", "32"))
+    HASH_POOL_RETRY_AFTER = int(os.getenv("HASH_POOL_RETRY_AFTER", "1"))
+
+    # bcrypt work factor; set BCRYPT_TARGET_MS to calibrate it at startup
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_TARGET_MS = int(os.getenv("BCRYPT_TARGET_MS", "0"))
+    BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+    BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+
+    # Algorithm for new hashes (bcrypt, scrypt or argon2id); existing hashes
+    # are migrated to it on login
+    PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "bcrypt")
+    SCRYPT_N = int(os.getenv("SCRYPT_N", "16384"))
+    SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+    SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+    ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "19456"))
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+
+    # Opt-in per-process cache of recently verified credentials
+    CREDENTIAL_CACHE_ENABLED = (
+        os.getenv("CREDENTIAL_CACHE_ENABLED", "false").lower() == "true"
+    )
+    CREDENTIAL_CACHE_TTL = int(os.getenv("CREDENTIAL_CACHE_TTL", "60"))
+    CREDENTIAL_CACHE_MAX_ENTRIES = int(
+        os.getenv("CREDENTIAL_CACHE_MAX_ENTRIES", "10000")
+    )
+
+    # Opt-in per-worker cache of login lookups keyed by username
+    AUTH_RECORD_CACHE_ENABLED = (
+        os.getenv("AUTH_RECORD_CACHE_ENABLED", "false").lower() == "true"
+    )
+    AUTH_RECORD_CACHE_TTL = int(os.getenv("AUTH_RECORD_CACHE_TTL", "10"))
+    AUTH_RECORD_CACHE_MAX_ENTRIES = int(
+        os.getenv("AUTH_RECORD_CACHE_MAX_ENTRIES", "10000")
+    )
+    # Optional shared tier: "uwsgi" (one node), "redis" (cluster) or "memory"
+    AUTH_RECORD_CACHE_BACKEND = os.getenv("AUTH_RECORD_CACHE_BACKEND", "")
+    AUTH_RECORD_CACHE_URL = os.getenv("AUTH_RECORD_CACHE_URL")
+    AUTH_RECORD_CACHE_UWSGI_NAME = os.getenv(
+        "AUTH_RECORD_CACHE_UWSGI_NAME", "auth_records"
+    )
+    AUTH_RECORD_CACHE_SHARED_TTL = int(os.getenv("AUTH_RECORD_CACHE_SHARED_TTL", "60"))
+    AUTH_RECORD_CACHE_SYNC_INTERVAL = int(
+        os.getenv("AUTH_RECORD_CACHE_SYNC_INTERVAL", "1")
+    )
+
+    # Per-worker cache of public profiles served by users:batchGet
+    PROFILE_CACHE_ENABLED = os.getenv("PROFILE_CACHE_ENABLED", "true").lower() == "true"
+    PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", "30"))
+    PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "20000"))
+
+    # Opt-in per-worker Bloom filter that rejects unknown usernames at login.
+    # It only rejects with a shared tier recording new names: "uwsgi" (one
+    # node), "redis" (cluster) or "memory"
+    USERNAME_FILTER_ENABLED = (
+        os.getenv("USERNAME_FILTER_ENABLED", "false").lower() == "true"
+    )
+    USERNAME_FILTER_BACKEND = os.getenv("USERNAME_FILTER_BACKEND", "")
+    USERNAME_FILTER_URL = os.getenv("USERNAME_FILTER_URL")
+    USERNAME_FILTER_UWSGI_NAME = os.getenv(
+        "USERNAME_FILTER_UWSGI_NAME", "username_filter"
+    )
+    USERNAME_FILTER_REBUILD_INTERVAL = int(
+        os.getenv("USERNAME_FILTER_REBUILD_INTERVAL", "300")
+    )
+    USERNAME_FILTER_CAPACITY = int(os.getenv("USERNAME_FILTER_CAPACITY", "100000"))
+    USERNAME_FILTER_ERROR_RATE = float(os.getenv("USERNAME_FILTER_ERROR_RATE", "0.01"))
+
+    # Shared secret for the admin routes; they are disabled when unset
+    ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+    # Resource servers allowed to introspect tokens, as "id:secret,id:secret"
+    # sent with HTTP Basic auth; introspection is disabled when unset
+    INTROSPECTION_CLIENTS = client_credentials("INTROSPECTION_CLIENTS")
+    # Services allowed to call users:batchGet, in the same format; they get
+    # read-only profile lookups without holding ADMIN_API_TOKEN
+    USER_LOOKUP_CLIENTS = client_credentials("USER_LOOKUP_CLIENTS")
+
+    # Bulk user import
+    USER_IMPORT_BATCH_SIZE = int(os.getenv("USER_IMPORT_BATCH_SIZE", "500"))
+    # Hashing threads per CLI import; unset means one per CPU. Imports over
+    # the API hash on the shared hashing pool instead
+    USER_IMPORT_HASH_WORKERS = (
+        int(os.getenv("USER_IMPORT_HASH_WORKERS"))
+        if os.getenv("USER_IMPORT_HASH_WORKERS")
+        else None
+    )
+    # Rows per server-side cursor fetch for the user export
+    USER_EXPORT_BATCH_SIZE = int(os.getenv("USER_EXPORT_BATCH_SIZE", "1000"))
+
+    # Login audit log, queued in memory and written in batches by a
+    # background thread; retention drops whole daily partitions
+    LOGIN_EVENTS_ENABLED = os.getenv("LOGIN_EVENTS_ENABLED", "true").lower() == "true"
+    LOGIN_EVENTS_BATCH_SIZE = int(os.getenv("LOGIN_EVENTS_BATCH_SIZE", "500"))
+    LOGIN_EVENTS_FLUSH_INTERVAL = float(os.getenv("LOGIN_EVENTS_FLUSH_INTERVAL", "1"))
+    LOGIN_EVENTS_MAX_QUEUE = int(os.getenv("LOGIN_EVENTS_MAX_QUEUE", "10000"))
+    LOGIN_EVENTS_RETENTION_DAYS = int(os.getenv("LOGIN_EVENTS_RETENTION_DAYS", "90"))
+    LOGIN_EVENTS_PARTITIONS_AHEAD = int(os.getenv("LOGIN_EVENTS_PARTITIONS_AHEAD", "7"))
+
+    # users.last_login_at is buffered per worker and written in bulk, so it
+    # may lag a login by up to the flush interval (seconds)
+    LAST_LOGIN_TRACKING_ENABLED = (
+        os.getenv("LAST_LOGIN_TRACKING_ENABLED", "true").lower() == "true"
+    )
+    LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", "30"))
+    LAST_LOGIN_BATCH_SIZE = int(os.getenv("LAST_LOGIN_BATCH_SIZE", "1000"))
+
+    # Per-worker copy of the revoked-token denylist
+    REVOCATION_REFRESH_INTERVAL = int(os.getenv("REVOCATION_REFRESH_INTERVAL", "5"))
+    REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "10000"))
+    REVOCATION_BLOOM_ERROR_RATE = float(
+        os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001")
+    )
+
+    # Per-worker cache of each user's token_version
+    TOKEN_VERSION_CACHE_TTL = int(os.getenv("TOKEN_VERSION_CACHE_TTL", "5"))
+    TOKEN_VERSION_CACHE_MAX_ENTRIES = int(
+        os.getenv("TOKEN_VERSION_CACHE_MAX_ENTRIES", "100000")
+    )
+
+    # Read replica routing; see replica_binds for the replica URL
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "2"))
+    REPLICA_LAG_CHECK_INTERVAL = int(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
     logger.debug("Config base class initialized.")
 
 
@@ -16,6 +199,10 @@ class DevConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "LOCAL_DATABASE_URL", "mysql://auth_user:auth_password@db:3306/auth_db"
     )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        SQLALCHEMY_DATABASE_URI, pool_size=2, max_overflow=2
+    )
+    SQLALCHEMY_BINDS = replica_binds(pool_size=2, max_overflow=2)
     DEBUG = True
     ENV = "development"
     logger.debug("DevConfig initialized with DEBUG=True and ENV=development.")
@@ -34,6 +221,10 @@ class StagingConfig(Config):
     SQLALCHEMY_DATABASE_URI = (
         f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        SQLALCHEMY_DATABASE_URI, pool_size=2, max_overflow=4
+    )
+    SQLALCHEMY_BINDS = replica_binds(pool_size=2, max_overflow=4)
     logger.debug("StagingConfig initialized with DEBUG=True and ENV=staging.")
 
 
@@ -50,6 +241,10 @@ class ProdConfig(Config):
     SQLALCHEMY_DATABASE_URI = (
         f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        SQLALCHEMY_DATABASE_URI, pool_size=4, max_overflow=8
+    )
+    SQLALCHEMY_BINDS = replica_binds(pool_size=4, max_overflow=8)
     logger.debug("ProdConfig initialized with DEBUG=False and ENV=production.")
 
 
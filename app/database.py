@@ -1,19 +1,253 @@
 # app/database.py
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.exc import SQLAlchemyError
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, default
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
 import logging
+import threading
+import time
 from contextlib import contextmanager
 
-# Initialize Flask-SQLAlchemy
-db = SQLAlchemy()
-
 # Get the logger
 logger = logging.getLogger(__name__)
 
+REPLICA_BIND = "replica"
+
+# Session.info keys used for routing
+_USE_REPLICA = "use_replica"
+_HAS_WRITTEN = "has_written"
+_READ_REPLICA = "read_replica"
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection.
+
+    The time covers waiting for a free connection and, on overflow, opening a
+    new one, so it shows when the pool is too small for the worker's load.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": self.overflow(),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "checkout_wait_avg_ms": (
+                    round(self._wait_total / self._checkouts * 1000, 3)
+                    if self._checkouts
+                    else 0.0
+                ),
+                "checkout_wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+class ReplicaLagMonitor:
+    """Tracks how far the replica is behind, probing at most every interval.
+
+    While the lag is unknown or above ``max_lag`` the replica is skipped and
+    reads fall back to the primary.
+    """
+
+    def __init__(self, max_lag=2.0, check_interval=5) -> None:
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._lag = None
+        self._last_check = None
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+
+    def healthy(self, engine):
+        now = time.monotonic()
+        if (
+            self._last_check is None or now - self._last_check >= self.check_interval
+        ) and self._lock.acquire(blocking=False):
+            try:
+                self._last_check = now
+                self._lag = self._probe(engine)
+            finally:
+                self._lock.release()
+        return self._lag is not None and self._lag <= self.max_lag
+
+    def _probe(self, engine):
+        """Return the replica's lag in seconds, or None if it is unknown."""
+        if engine.dialect.name != "mysql":
+            return 0.0
+        try:
+            with engine.connect() as conn:
+                try:
+                    row = conn.exec_driver_sql("SHOW REPLICA STATUS").mappings().first()
+                except SQLAlchemyError:
+                    # MySQL before 8.0.22
+                    row = conn.exec_driver_sql("SHOW SLAVE STATUS").mappings().first()
+        except SQLAlchemyError as e:
+            logger.warning(f"Replica lag check failed: {e}")
+            return None
+        if row is None:
+            # Not a replica (e.g. a managed reader endpoint); nothing to lag
+            return 0.0
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        if lag is None:
+            logger.warning("Replication is not running on the replica")
+            return None
+        return float(lag)
+
+    def stats(self):
+        return {
+            "lag_seconds": self._lag,
+            "max_lag_seconds": self.max_lag,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+_replica_monitor = ReplicaLagMonitor()
+
+
+class RoutingSession(Session):
+    """Session that sends opted-in reads to the replica bind.
+
+    Reads run on the replica only inside ``use_replica`` and only until the
+    session writes, so a request always reads its own writes. Without a
+    replica bind, or while the replica lags, everything uses the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if isinstance(clause, UpdateBase):
+            self.info[_HAS_WRITTEN] = True
+        if (
+            bind is None
+            and self.info.get(_USE_REPLICA)
+            and not self.info.get(_HAS_WRITTEN)
+        ):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                if _replica_monitor.healthy(replica):
+                    _replica_monitor.replica_reads += 1
+                    self.info[_READ_REPLICA] = True
+                    return replica
+                _replica_monitor.primary_fallbacks += 1
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def close(self) -> None:
+        super().close()
+        self.info.pop(_HAS_WRITTEN, None)
+        self.info.pop(_READ_REPLICA, None)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(session, flush_context) -> None:
+    session.info[_HAS_WRITTEN] = True
+
+
+class StatementCacheStats:
+    """Counts how often executed statements were served from the engine's
+    compiled-SQL cache. Misses that keep growing under steady traffic mean a
+    statement is rebuilt per request or ``query_cache_size`` is too small.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "uncached": 0}
+
+    def record(self, cache_hit) -> None:
+        if cache_hit is default.CACHE_HIT:
+            key = "hits"
+        elif cache_hit is default.CACHE_MISS:
+            key = "misses"
+        else:
+            key = "uncached"
+        with self._lock:
+            self._counts[key] += 1
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+        cached = counts["hits"] + counts["misses"]
+        counts["hit_rate"] = round(counts["hits"] / cached, 4) if cached else 0.0
+        return counts
+
+
+_statement_cache_stats = StatementCacheStats()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement_cache(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        _statement_cache_stats.record(context.cache_hit)
+
+
+def get_statement_cache_stats():
+    return _statement_cache_stats.stats()
+
+
+# Initialize Flask-SQLAlchemy
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+@contextmanager
+def use_replica(session):
+    """Run the enclosed read-only queries on the replica when it is usable."""
+    previous = session.info.get(_USE_REPLICA, False)
+    session.info[_USE_REPLICA] = True
+    try:
+        yield session
+    finally:
+        session.info[_USE_REPLICA] = previous
+
+
+def read_from_replica(session):
+    """Whether any read in this session so far was served by the replica."""
+    return session.info.get(_READ_REPLICA) is True
+
+
+def _with_timed_pool(engine_options):
+    if "pool_size" in engine_options:
+        return {"poolclass": TimedQueuePool, **engine_options}
+    return engine_options
+
 
 def init_db(app) -> None:
     """Initializes the database with the Flask app."""
+    engine_options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    if "pool_size" in engine_options:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _with_timed_pool(engine_options)
+    binds = app.config.get("SQLALCHEMY_BINDS") or {}
+    if binds:
+        app.config["SQLALCHEMY_BINDS"] = {
+            key: _with_timed_pool(value) if isinstance(value, dict) else value
+            for key, value in binds.items()
+        }
     db.init_app(app)
     logger.debug("Database has been initialized.")
 
@@ -34,3 +268,31 @@ def get_db():
     finally:
         db_session.close()
         logger.debug("Database session closed")
+
+
+def init_replica_routing(app) -> None:
+    """Configures the replica lag threshold from the Flask app config."""
+    global _replica_monitor
+    _replica_monitor = ReplicaLagMonitor(
+        max_lag=app.config.get("REPLICA_MAX_LAG_SECONDS", 2.0),
+        check_interval=app.config.get("REPLICA_LAG_CHECK_INTERVAL", 5),
+    )
+    replica = REPLICA_BIND in (app.config.get("SQLALCHEMY_BINDS") or {})
+    logger.debug(f"Replica routing enabled: {replica}")
+
+
+def get_replica_stats():
+    return _replica_monitor.stats()
+
+
+def get_pool_stats():
+    """Returns connection pool stats for each engine (the primary is "default")."""
+    stats = {}
+    for bind_key, engine in db.engines.items():
+        pool = engine.pool
+        name = bind_key or "default"
+        if isinstance(pool, TimedQueuePool):
+            stats[name] = pool.stats()
+        else:
+            stats[name] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    return stats
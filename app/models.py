@@ -6,6 +6,21 @@ from datetime import datetime
 
 class User(db.Model):
     __tablename__ = "users"
+    __table_args__ = (
+        # Covers the login lookup so it never touches the clustered row
+        db.Index(
+            "ix_users_auth_lookup",
+            "username",
+            "is_active",
+            "password",
+            "id",
+            "token_version",
+        ),
+        # Keyset pagination for the user listing, with and without the
+        # is_active filter
+        db.Index("ix_users_created_at_id", "created_at", "id"),
+        db.Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, index=True)
     email = db.Column(db.String(255), unique=True, index=True, nullable=False)
@@ -15,6 +30,10 @@ class User(db.Model):
     last_name = db.Column(db.String(150), nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Embedded in issued tokens; bumping it invalidates all of them at once
+    token_version = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    # Written in batches by app.service.last_login, so it may lag slightly
+    last_login_at = db.Column(db.DateTime, nullable=True)
 
     def set_password(self, new_password) -> None:
         """Set a new password for the user."""
@@ -30,4 +49,83 @@ class User(db.Model):
             "last_name": self.last_name,
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None,
+            "last_login_at": (
+                self.last_login_at.isoformat() if self.last_login_at else None
+            ),
         }
+
+
+class UserAuthRecord:
+    """The columns login needs, loaded without an ORM entity.
+
+    Plain attributes instead of a mapped instance skip identity-map
+    bookkeeping and the unused profile columns on the hottest query.
+    """
+
+    __slots__ = ("id", "password", "is_active", "token_version")
+
+    COLUMNS = (User.id, User.password, User.is_active, User.token_version)
+
+    def __init__(self, id, password, is_active, token_version) -> None:
+        self.id = id
+        self.password = password
+        self.is_active = is_active
+        self.token_version = token_version
+
+
+class RefreshToken(db.Model):
+    __tablename__ = "refresh_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id"), index=True, nullable=False
+    )
+    # Public prefix of the opaque token, used to find the row
+    lookup = db.Column(db.String(32), unique=True, index=True, nullable=False)
+    # SHA-256 of the secret part of the token
+    token_hash = db.Column(db.String(64), nullable=False)
+    # Every token issued by rotating from the same login shares a family
+    family_id = db.Column(db.String(32), index=True, nullable=False)
+    # Rows are pruned once expired; see prune_refresh_tokens
+    expires_at = db.Column(db.DateTime, index=True, nullable=False)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RevokedToken(db.Model):
+    __tablename__ = "revoked_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), unique=True, index=True, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    # Rows are pruned once the token would have expired anyway
+    expires_at = db.Column(db.DateTime, index=True, nullable=False)
+    # Watermark for the workers' incremental refresh
+    revoked_at = db.Column(
+        db.DateTime, default=datetime.utcnow, index=True, nullable=False
+    )
+
+
+class LoginEvent(db.Model):
+    """Append-only audit trail of logins, registrations and deactivations.
+
+    On MySQL the table is range-partitioned by day on ``created_at`` so old
+    days are dropped as whole partitions. Partitioned InnoDB tables cannot
+    have foreign keys and every unique key must contain the partition
+    column, hence the bare ``user_id`` and the ``(created_at, id)`` primary
+    key with an application-generated id.
+    """
+
+    __tablename__ = "login_events"
+    __table_args__ = (
+        db.Index("ix_login_events_user_id_created_at", "user_id", "created_at"),
+    )
+
+    created_at = db.Column(db.DateTime, primary_key=True, default=datetime.utcnow)
+    id = db.Column(db.String(32), primary_key=True)
+    event = db.Column(db.String(32), nullable=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    username = db.Column(db.String(150), nullable=True)
+    # Why a login failed, e.g. "unknown_user" or "bad_password"
+    reason = db.Column(db.String(64), nullable=True)
+    ip_address = db.Column(db.String(45), nullable=True)
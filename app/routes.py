@@ -1,14 +1,45 @@
-from flask import Blueprint, request, jsonify
+import io
+import json
+from flask import Blueprint, current_app, request, jsonify, stream_with_context
 from app.service.auth import (
     login,
     register,
     logout,
+    logout_all,
     reset_password,
     change_password,
     deactivate_account,
+    introspect,
+    introspect_batch,
+    refresh,
+    get_auth_record_lookups,
+)
+from app.service.auth_record_cache import get_auth_record_cache
+from app.service.credential_cache import get_credential_cache
+from app.service.hashers import get_preferred_hasher
+from app.service.hashing import get_bcrypt_rounds, get_hashing_pool
+from app.service.jwt import JWKS_MAX_AGE, get_claims_cache, get_jwks_document
+from app.service.last_login import get_last_logins
+from app.service.login_events import get_login_events
+from app.service.revocation import get_revocation_list
+from app.service.token_versions import get_token_versions
+from app.service.username_filter import get_username_filter
+from app.service import user_export
+from app.service.user_import import FORMATS, import_users, read_rows
+from app.service.profile_cache import get_profile_cache
+from app.service.users import batch_get_users, list_users
+from app.utils.admin import admin_required
+from app.utils.client_auth import (
+    introspection_client_required,
+    user_lookup_client_required,
 )
 from app.utils.request_handler import handle_request
-from app.database import get_db
+from app.database import (
+    get_db,
+    get_pool_stats,
+    get_replica_stats,
+    get_statement_cache_stats,
+)
 import logging
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -18,6 +49,13 @@ logger = logging.getLogger(__name__)
 auth_service_bp = Blueprint("auth", __name__, url_prefix="/service/auth")
 
 
+def _bearer_token():
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token.strip()
+    return None
+
+
 @auth_service_bp.route("/login", methods=["POST"])
 def login_route():
     data = request.json
@@ -27,7 +65,11 @@ def login_route():
     try:
         with get_db() as db:
             response = handle_request(
-                login, data.get("username"), data.get("password"), db=db
+                login,
+                data.get("username"),
+                data.get("password"),
+                with_refresh_token=data.get("with_refresh_token", False),
+                db=db,
             )
             logger.debug(f"Response: {response}")
             return response
@@ -69,10 +111,12 @@ def register_route():
 @auth_service_bp.route("/logout", methods=["POST"])
 def logout_route():
     logger.info("Logout request received")
+    # The token comes from the Authorization header or the JSON body
+    token = _bearer_token() or (request.get_json(silent=True) or {}).get("token")
 
     try:
         with get_db() as db:
-            response = handle_request(logout, db=db)
+            response = handle_request(logout, token, db=db)
             logger.debug(f"Response: {response}")
             return response
     except SQLAlchemyError as db_err:
@@ -83,6 +127,24 @@ def logout_route():
         return jsonify({"error": "An unexpected error occurred"}), 500
 
 
+@auth_service_bp.route("/logout/all", methods=["POST"])
+def logout_all_route():
+    logger.info("Logout everywhere request received")
+    token = _bearer_token() or (request.get_json(silent=True) or {}).get("token")
+
+    try:
+        with get_db() as db:
+            response = handle_request(logout_all, token, db=db)
+            logger.debug(f"Response: {response}")
+            return response
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during logout everywhere: {db_err}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error during logout everywhere: {e}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+
 @auth_service_bp.route("/reset-password", methods=["POST"])
 def reset_password_route():
     data = request.json
@@ -147,7 +209,216 @@ def deactivate_account_route():
         return jsonify({"error": "An unexpected error occurred"}), 500
 
 
+@auth_service_bp.route("/introspect", methods=["POST"])
+@introspection_client_required
+def introspect_route():
+    # RFC 7662 clients send a form-encoded body; JSON is accepted as well
+    data = request.form or request.get_json(silent=True) or {}
+    logger.info("Introspect request received")
+
+    try:
+        with get_db() as db:
+            response = handle_request(introspect, data.get("token"), db=db)
+            logger.debug(f"Response: {response}")
+            return response
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during introspection: {db_err}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error during introspection: {e}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+
+@auth_service_bp.route("/introspect/batch", methods=["POST"])
+@introspection_client_required
+def introspect_batch_route():
+    data = request.json
+    logger.info("Batch introspect request received")
+
+    try:
+        with get_db() as db:
+            response = handle_request(introspect_batch, data.get("tokens"), db=db)
+            logger.debug(f"Response: {response}")
+            return response
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during batch introspection: {db_err}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error during batch introspection: {e}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+
+@auth_service_bp.route("/token/refresh", methods=["POST"])
+def refresh_route():
+    data = request.json
+    logger.info("Token refresh request received")
+
+    try:
+        with get_db() as db:
+            response = handle_request(refresh, data.get("refresh_token"), db=db)
+            logger.debug(f"Response: {response}")
+            return response
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during token refresh: {db_err}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error during token refresh: {e}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+
+@auth_service_bp.route("/users", methods=["GET"])
+@admin_required
+def list_users_route():
+    logger.info("List users request received")
+
+    try:
+        with get_db() as db:
+            response = handle_request(list_users, request.args.to_dict(), db=db)
+            logger.debug(f"Response: {response}")
+            return response
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error while listing users: {db_err}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error while listing users: {e}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+
+@auth_service_bp.route("/users:batchGet", methods=["POST"])
+@user_lookup_client_required
+def batch_get_users_route():
+    data = request.json
+    logger.info("Batch get users request received")
+
+    try:
+        with get_db() as db:
+            response = handle_request(
+                batch_get_users, data.get("ids"), data.get("usernames"), db=db
+            )
+            logger.debug(f"Response: {response}")
+            return response
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during batch get users: {db_err}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error during batch get users: {e}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+
+_IMPORT_MIMETYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson"}
+
+
+@auth_service_bp.route("/admin/users/import", methods=["POST"])
+@admin_required
+def import_users_route():
+    """Creates users from a CSV or NDJSON body and streams NDJSON progress."""
+    logger.info("User import request received")
+    fmt = request.args.get("format") or _IMPORT_MIMETYPES.get(request.mimetype)
+    if fmt not in FORMATS:
+        return jsonify({"error": "Send text/csv or application/x-ndjson"}), 415
+    batch_size = request.args.get(
+        "batch_size", current_app.config["USER_IMPORT_BATCH_SIZE"], type=int
+    )
+    resume_after = request.args.get("resume_after", 0, type=int)
+    stream = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+
+    def generate():
+        try:
+            with get_db() as db:
+                for event in import_users(
+                    read_rows(stream, fmt),
+                    db,
+                    batch_size=batch_size,
+                    resume_after=resume_after,
+                    # Never more hashing threads than the worker was sized for
+                    shared_pool=True,
+                ):
+                    yield json.dumps(event) + "\n"
+        except Exception as e:
+            # The status line is already sent; report the failure in-band
+            logger.error(f"Unexpected error during user import: {e}")
+            yield json.dumps({"error": "An unexpected error occurred"}) + "\n"
+
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
+
+
+@auth_service_bp.route("/admin/users/export", methods=["GET"])
+@admin_required
+def export_users_route():
+    """Streams every user as NDJSON or CSV, optionally gzipped."""
+    logger.info("User export request received")
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in user_export.FORMATS:
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    compress = request.args.get("gzip", "false").lower() == "true"
+    batch_size = request.args.get(
+        "batch_size", current_app.config["USER_EXPORT_BATCH_SIZE"], type=int
+    )
+
+    def generate():
+        try:
+            with get_db() as db:
+                chunks = user_export.export_users(db, fmt, batch_size=batch_size)
+                if compress:
+                    chunks = user_export.gzip_chunks(chunks)
+                yield from chunks
+        except Exception as e:
+            # Headers are already sent; a truncated body is the only signal
+            logger.error(f"Unexpected error during user export: {e}")
+
+    filename = f"users.{fmt}" + (".gz" if compress else "")
+    return current_app.response_class(
+        stream_with_context(generate()),
+        mimetype="application/gzip" if compress else user_export.MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@auth_service_bp.route("/.well-known/jwks.json", methods=["GET"])
+def jwks():
+    """Publishes the public token signing keys for local verification."""
+    try:
+        body, etag = get_jwks_document()
+    except Exception as e:
+        logger.error(f"Unexpected error building JWKS: {e}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = JWKS_MAX_AGE
+    return response.make_conditional(request)
+
+
 @auth_service_bp.route("/health", methods=["GET"])
 def health():
     """Health check endpoint to verify that the auth_service is running."""
     return jsonify({"status": "OK"}), 200
+
+
+@auth_service_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Exposes in-process runtime metrics for this worker."""
+    data = {
+        "hashing": {
+            **get_hashing_pool().stats(),
+            "password_hasher": get_preferred_hasher().algorithm,
+            "bcrypt_rounds": get_bcrypt_rounds(),
+        },
+        "credential_cache": get_credential_cache().stats(),
+        "auth_record_cache": get_auth_record_cache().stats(),
+        "username_filter": get_username_filter().stats(),
+        "auth_record_lookups": get_auth_record_lookups().stats(),
+        "profile_cache": get_profile_cache().stats(),
+        "login_events": get_login_events().stats(),
+        "last_login": get_last_logins().stats(),
+        "token_claims_cache": get_claims_cache().stats(),
+        "token_revocation": get_revocation_list().stats(),
+        "token_versions": get_token_versions().stats(),
+        "db_pool": get_pool_stats(),
+        "db_replica": get_replica_stats(),
+        "statement_cache": get_statement_cache_stats(),
+    }
+    return jsonify(data), 200
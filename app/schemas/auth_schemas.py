@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, ValidationError, fields, validate, validates_schema
 
 
 class RegisterSchema(Schema):
@@ -44,6 +44,7 @@ class LoginSchema(Schema):
     password = fields.String(
         required=True, error_messages={"required": "Password is required."}
     )
+    with_refresh_token = fields.Boolean(load_default=False)
 
 
 class ResetPasswordSchema(Schema):
@@ -73,3 +74,61 @@ class DeactivateAccountSchema(Schema):
     password = fields.String(
         required=True, error_messages={"required": "Password is required."}
     )
+
+
+class IntrospectSchema(Schema):
+    token = fields.String(
+        required=True, error_messages={"required": "Token is required."}
+    )
+
+
+class IntrospectBatchSchema(Schema):
+    tokens = fields.List(
+        fields.String(),
+        required=True,
+        validate=validate.Length(min=1, max=100),
+        error_messages={
+            "required": "Tokens are required.",
+            "validate": "Between 1 and 100 tokens may be introspected at once.",
+        },
+    )
+
+
+class RefreshSchema(Schema):
+    refresh_token = fields.String(
+        required=True, error_messages={"required": "Refresh token is required."}
+    )
+
+
+class LogoutSchema(Schema):
+    token = fields.String(
+        required=True, error_messages={"required": "Token is required."}
+    )
+
+
+class ListUsersSchema(Schema):
+    limit = fields.Integer(
+        load_default=50,
+        validate=validate.Range(min=1, max=200),
+        error_messages={"invalid": "Limit must be an integer."},
+    )
+    cursor = fields.String(load_default=None)
+    username_prefix = fields.String(load_default=None, validate=validate.Length(min=1))
+    email_prefix = fields.String(load_default=None, validate=validate.Length(min=1))
+    is_active = fields.Boolean(load_default=None)
+    # Comma-separated sparse fieldset, e.g. "id,username"
+    field_names = fields.String(data_key="fields", load_default=None)
+
+
+class BatchGetUsersSchema(Schema):
+    ids = fields.List(fields.Integer(), load_default=list)
+    usernames = fields.List(fields.String(), load_default=list)
+
+    @validates_schema
+    def validate_count(self, data, **kwargs):
+        count = len(data["ids"]) + len(data["usernames"])
+        if not 1 <= count <= 100:
+            raise ValidationError(
+                "Between 1 and 100 ids and usernames may be looked up at once.",
+                "_schema",
+            )
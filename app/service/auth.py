@@ -1,24 +1,75 @@
 import logging
-import bcrypt
 import re
-from app.models import User
-from app.service.jwt import generate_jwt
+from app.database import read_from_replica, use_replica
+from app.models import User, UserAuthRecord
+from app.service.auth_record_cache import get_auth_record_cache
+from app.service.credential_cache import get_credential_cache
+from app.service.profile_cache import get_profile_cache
+from app.service.hashing import hash_password, needs_rehash, verify_password
+from app.service.jwt import decode_jwt, generate_jwt
+from app.service.last_login import get_last_logins
+from app.service import login_events
+from app.service.login_events import get_login_events
+from app.service.revocation import get_revocation_list, revoke_token
+from app.service.token_versions import bump_token_version, get_token_versions
+from app.service.username_filter import get_username_filter
+from app.service.refresh_tokens import (
+    issue_refresh_token,
+    revoke_user_refresh_tokens,
+    rotate_refresh_token,
+)
+from app.utils.singleflight import SingleFlight
 from app.utils.exceptions import (
     ValidationError,
     AuthenticationError,
     AuthorizationError,
     DatabaseError,
+    ServiceUnavailableError,
 )
 from app.schemas.auth_schemas import (
     RegisterSchema,
     LoginSchema,
+    LogoutSchema,
     DeactivateAccountSchema,
+    IntrospectSchema,
+    IntrospectBatchSchema,
+    RefreshSchema,
 )
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 # Get the logger
 logger = logging.getLogger(__name__)
 
+# Hot-path statements are built once at import. Executing the same statement
+# object with new bound values skips query construction and reuses the
+# engine's compiled-SQL cache entry (see get_statement_cache_stats).
+_AUTH_RECORD_BY_USERNAME = select(*UserAuthRecord.COLUMNS).where(
+    User.username == bindparam("username")
+)
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+_USERNAME_BY_ID = select(User.username).where(User.id == bindparam("user_id"))
+_USER_BY_EMAIL_OR_USERNAME = (
+    select(User)
+    .where(
+        or_(User.email == bindparam("email"), User.username == bindparam("username"))
+    )
+    .limit(1)
+)
+_UPDATE_PASSWORD = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(password=bindparam("new_password"))
+    .execution_options(synchronize_session=False)
+)
+
+# Concurrent logins for the same username share one auth record query
+_auth_record_lookups = SingleFlight()
+
+
+def get_auth_record_lookups():
+    return _auth_record_lookups
+
 
 def register(*args, db=None, **kwargs):
     schema = RegisterSchema()
@@ -45,39 +96,16 @@ def register(*args, db=None, **kwargs):
         logger.info("Registering new user")
         logger.debug(f"User details: email={email}, username={username}")
 
-        # Check if the email or username is already in use
-        existing_user = (
-            db.query(User)
-            .filter((User.email == email) | (User.username == username))
-            .first()
-        )
-        if existing_user:
-            if existing_user.is_active:
-                logger.warning("Email or username is already in use")
-                raise ValidationError(
-                    {"message": "Email or username is already in use"}
-                )
-            else:
-                # Reactivate the existing user
-                logger.info("Reactivating existing user")
-                hashed_password = bcrypt.hashpw(
-                    password.encode("utf-8"), bcrypt.gensalt()
-                ).decode("utf-8")
-                existing_user.password = hashed_password
-                existing_user.first_name = first_name
-                existing_user.last_name = last_name
-                existing_user.username = username
-                existing_user.is_active = True
-                db.commit()
-                logger.info("Account reactivated successfully")
-                return {"message": "Account reactivated successfully"}, 200
-
-        # Hash the password (bcrypt automatically handles the salt)
-        hashed_password = bcrypt.hashpw(
-            password.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
-
-        # Create a new user and add to the database
+        # Hash the password with the preferred algorithm (salted per hash);
+        # reactivation needs the hash too, so it is computed up front
+        hashed_password = hash_password(password)
+
+        # Before anything commits, so no worker's username filter turns the
+        # name away; covers the rename on reactivation too
+        get_username_filter().announce(username)
+
+        # Insert optimistically and let the unique indexes on email and
+        # username detect conflicts, so the common case is one round trip
         new_user = User(
             email=email,
             username=username,
@@ -86,7 +114,17 @@ def register(*args, db=None, **kwargs):
             last_name=last_name,
         )
         db.add(new_user)
-        db.commit()
+        try:
+            # Flushing first assigns the id without a reload after commit
+            db.flush()
+            user_id = new_user.id
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return _register_conflict(
+                email, username, hashed_password, first_name, last_name, db
+            )
+        get_login_events().record(login_events.REGISTER, user_id, username)
         logger.info("Registration successful")
         return {"message": "Registration successful"}, 201
     except SQLAlchemyError as db_err:
@@ -95,18 +133,56 @@ def register(*args, db=None, **kwargs):
         raise DatabaseError()
     except ValidationError as ve:
         raise ve
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         logger.exception(f"Error registering user: {e}")
         raise
 
 
-def login(*args, db=None, **kwargs):
+def _register_conflict(email, username, hashed_password, first_name, last_name, db):
+    """Resolve a unique violation: reactivate an inactive account or reject."""
+    existing_user = db.scalars(
+        _USER_BY_EMAIL_OR_USERNAME, {"email": email, "username": username}
+    ).first()
+    if existing_user is None:
+        # The violation came from some other constraint
+        logger.error("Integrity error during registration without a conflicting user")
+        raise DatabaseError()
+    if existing_user.is_active:
+        logger.warning("Email or username is already in use")
+        raise ValidationError({"message": "Email or username is already in use"})
+
+    logger.info("Reactivating existing user")
+    previous_username = existing_user.username
+    existing_user.password = hashed_password
+    existing_user.first_name = first_name
+    existing_user.last_name = last_name
+    existing_user.username = username
+    existing_user.is_active = True
+    try:
+        db.commit()
+    except IntegrityError:
+        # The new username belongs to another account
+        db.rollback()
+        logger.warning("Email or username is already in use")
+        raise ValidationError({"message": "Email or username is already in use"})
+    get_credential_cache().invalidate(existing_user.id)
+    get_auth_record_cache().invalidate(previous_username, username)
+    get_profile_cache().invalidate(existing_user.id, previous_username, username)
+    get_login_events().record(login_events.REACTIVATE, existing_user.id, username)
+    logger.info("Account reactivated successfully")
+    return {"message": "Account reactivated successfully"}, 200
+
+
+def login(*args, db=None, with_refresh_token=False, **kwargs):
     schema = LoginSchema()
     try:
         data = schema.load(
             {
                 "username": args[0],
                 "password": args[1],
+                "with_refresh_token": with_refresh_token,
             }
         )
     except ValidationError as ve:
@@ -119,41 +195,178 @@ def login(*args, db=None, **kwargs):
         logger.info("Login attempt")
         logger.debug(f"Username: {username}")
 
-        user = db.query(User).filter_by(username=username).first()
+        audit = get_login_events()
+        user = _lookup_auth_record(db, username)
         if not user:
+            audit.record(login_events.LOGIN_FAILURE, None, username, "unknown_user")
             logger.warning("Invalid username or password")
             raise AuthenticationError("Invalid username or password")
 
         if not user.is_active:
+            audit.record(login_events.LOGIN_FAILURE, user.id, username, "inactive")
             logger.warning("User account is inactive")
             raise AuthorizationError("User account is inactive")
 
-        # Retrieve the hashed password from the database
-        hashed_password = user.password.encode("utf-8")
+        _check_login_password(user, username, password, db, audit)
+        response = _issue_login_tokens(user, data.get("with_refresh_token"), db)
 
-        # Use bcrypt to check the password
-        if not bcrypt.checkpw(password.encode("utf-8"), hashed_password):
-            logger.warning("Invalid username or password")
-            raise AuthenticationError("Invalid username or password")
+        # Buffered and written in bulk in the background
+        get_last_logins().touch(user.id)
+        audit.record(login_events.LOGIN_SUCCESS, user.id, username)
+        logger.info("Login successful")
+        return response, 200
+    except (AuthenticationError, AuthorizationError) as ae:
+        raise ae
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during login: {db_err}", exc_info=True)
+        db.rollback()
+        raise DatabaseError()
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        logger.exception(f"Error logging in user: {e}")
+        raise
 
-        token = generate_jwt(user.id)
+
+def refresh(refresh_token, db=None):
+    data = RefreshSchema().load({"refresh_token": refresh_token})
+
+    try:
+        logger.info("Token refresh request received")
+        user_id, token_version, new_refresh_token = rotate_refresh_token(
+            db, data["refresh_token"]
+        )
+
+        token = generate_jwt(user_id, token_version)
         if not token:
             logger.error("Failed to generate JWT")
             raise Exception("JWT generation failed")
 
-        logger.info("Login successful")
-        return {"message": "Login successful", "token": token}, 200
-    except (AuthenticationError, AuthorizationError) as ae:
+        db.commit()
+        logger.info("Token refreshed")
+        return {
+            "message": "Token refreshed",
+            "token": token,
+            "refresh_token": new_refresh_token,
+        }, 200
+    except AuthenticationError as ae:
+        logger.warning(f"Token refresh rejected: {ae.message}")
         raise ae
     except SQLAlchemyError as db_err:
-        logger.error(f"Database error during login: {db_err}", exc_info=True)
+        logger.error(f"Database error during token refresh: {db_err}", exc_info=True)
         db.rollback()
         raise DatabaseError()
     except Exception as e:
-        logger.exception(f"Error logging in user: {e}")
+        logger.exception(f"Error refreshing token: {e}")
         raise
 
 
+def _fetch_auth_record(db, username):
+    """Load only the columns login needs, served by ix_users_auth_lookup.
+
+    Also returns whether the replica answered, since the result is shared
+    with coalesced callers whose sessions never ran the query.
+    """
+    row = db.execute(_AUTH_RECORD_BY_USERNAME, {"username": username}).first()
+    record = UserAuthRecord(*row) if row else None
+    return record, read_from_replica(db)
+
+
+def _lookup_auth_record(db, username):
+    """Return the auth record for a login, or None for an unknown username.
+
+    Repeat logins are served from this worker's record cache; misses read
+    from the replica, falling back to the primary when it lags.
+    """
+    record_cache = get_auth_record_cache()
+    user = record_cache.get(username)
+    if user is not None:
+        return user
+    # Names the username filter knows do not exist skip the query
+    username_filter = get_username_filter()
+    if not username_filter.might_exist(username):
+        return None
+    # Read before the query, so an invalidation that lands while it runs
+    # keeps the result out of the cache
+    version = record_cache.version(username)
+    with use_replica(db):
+        user, from_replica = _auth_record_lookups.do(
+            username, lambda: _fetch_auth_record(db, username)
+        )
+    if user is None:
+        username_filter.record_missing(username)
+        return None
+    # A replica row can be older than the last invalidation, so only primary
+    # reads fill the cache shared with other workers
+    record_cache.store(username, user, version, shared=not from_replica)
+    return user
+
+
+def _check_login_password(user, username, password, db, audit) -> None:
+    """Raise AuthenticationError unless ``password`` matches the record."""
+    # A recently verified password skips the hash check entirely
+    credential_cache = get_credential_cache()
+    if credential_cache.check(user.id, password, user.password):
+        logger.debug("Credential cache hit")
+        return
+    # Check the password against the stored hash on the hashing pool
+    if not verify_password(password, user.password):
+        audit.record(login_events.LOGIN_FAILURE, user.id, username, "bad_password")
+        logger.warning("Invalid username or password")
+        raise AuthenticationError("Invalid username or password")
+
+    if needs_rehash(user.password) and _upgrade_password_hash(user, password, db):
+        # Other workers would otherwise see the old hash in the shared tier
+        # and upgrade it again
+        get_auth_record_cache().invalidate(username)
+
+    credential_cache.store(user.id, password, user.password)
+
+
+def _issue_login_tokens(user, with_refresh_token, db):
+    """Build the login response with a new JWT and, if asked, a refresh token."""
+    token = generate_jwt(user.id, user.token_version)
+    if not token:
+        logger.error("Failed to generate JWT")
+        raise Exception("JWT generation failed")
+
+    response = {"message": "Login successful", "token": token}
+    # Refresh tokens are opt-in; without one login writes nothing
+    # synchronously
+    if with_refresh_token:
+        response["refresh_token"] = issue_refresh_token(db, user.id)
+        db.commit()
+    return response
+
+
+def _invalidate_auth_record(db, user_id) -> None:
+    """Drop a cached auth record for a user known only by id."""
+    record_cache = get_auth_record_cache()
+    if record_cache.enabled:
+        record_cache.invalidate(db.scalar(_USERNAME_BY_ID, {"user_id": user_id}))
+
+
+def _upgrade_password_hash(user, password, db):
+    """Re-hash a just-verified password whose stored algorithm or cost is stale.
+
+    Failures are logged and swallowed; the login itself already succeeded.
+    The record is updated in place. Returns whether the hash was replaced.
+    """
+    try:
+        new_hash = hash_password(password)
+        db.execute(_UPDATE_PASSWORD, {"user_id": user.id, "new_password": new_hash})
+        db.commit()
+        user.password = new_hash
+        logger.info("Password hash upgraded")
+        return True
+    except ServiceUnavailableError:
+        logger.debug("Hashing pool busy, deferring password hash upgrade")
+    except SQLAlchemyError as db_err:
+        logger.warning(f"Failed to upgrade password hash: {db_err}")
+        db.rollback()
+    return False
+
+
 def validate_email(email):
     email_regex = r"^[A-Za-z0-9]+([._+-][A-Za-z0-9]+)*@[A-Za-z0-9-]+\.[A-Za-z0-9-]+(\.[A-Za-z0-9-]+)*$"
     is_valid = re.match(email_regex, email) is not None
@@ -168,10 +381,69 @@ def validate_name(name):
     return is_valid
 
 
-def logout():
-    logger.info("Logout request received")
-    # Simple mock logout function for basic usage
-    return {"message": "Logout successful"}, 200
+def logout(token=None, db=None):
+    data = LogoutSchema().load({"token": token})
+
+    try:
+        logger.info("Logout request received")
+        claims = decode_jwt(data["token"])
+        if claims is None:
+            logger.warning("Logout with an invalid or revoked token")
+            raise AuthenticationError("Invalid token")
+
+        if "jti" not in claims:
+            # Issued before tokens carried an id; it lapses at its expiry
+            logger.warning("Token has no jti and cannot be revoked")
+            return {"message": "Logout successful"}, 200
+
+        expires_at = revoke_token(db, claims)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker already revoked it
+            db.rollback()
+        get_revocation_list().add(claims["jti"], expires_at)
+        logger.info("Logout successful")
+        return {"message": "Logout successful"}, 200
+    except AuthenticationError as ae:
+        raise ae
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during logout: {db_err}", exc_info=True)
+        db.rollback()
+        raise DatabaseError()
+    except Exception as e:
+        logger.exception(f"Error logging out user: {e}")
+        raise
+
+
+def logout_all(token=None, db=None):
+    """Sign the token's user out of every session with one version bump."""
+    data = LogoutSchema().load({"token": token})
+
+    try:
+        logger.info("Logout everywhere request received")
+        claims = decode_jwt(data["token"])
+        if claims is None:
+            logger.warning("Logout with an invalid or revoked token")
+            raise AuthenticationError("Invalid token")
+
+        user_id = claims["user_id"]
+        bump_token_version(db, user_id)
+        revoke_user_refresh_tokens(db, user_id)
+        db.commit()
+        get_token_versions().invalidate(user_id)
+        _invalidate_auth_record(db, user_id)
+        logger.info("Logged out of all sessions")
+        return {"message": "Logged out of all sessions"}, 200
+    except AuthenticationError as ae:
+        raise ae
+    except SQLAlchemyError as db_err:
+        logger.error(f"Database error during logout: {db_err}", exc_info=True)
+        db.rollback()
+        raise DatabaseError()
+    except Exception as e:
+        logger.exception(f"Error logging out user: {e}")
+        raise
 
 
 def reset_password(email):
@@ -214,9 +486,13 @@ def deactivate_account(username, password, db=None):
         logger.info("Deactivate account request received")
         logger.debug(f"Username: {username}")
 
-        user = db.query(User).filter_by(username=username).first()
+        audit = get_login_events()
+        user = db.scalars(_USER_BY_USERNAME, {"username": username}).first()
 
         if not user:
+            audit.record(
+                login_events.DEACTIVATE_FAILURE, None, username, "unknown_user"
+            )
             logger.warning("Invalid username or password")
             return {"error": "Invalid username or password"}, 400
 
@@ -224,16 +500,56 @@ def deactivate_account(username, password, db=None):
             logger.warning("User account is already inactive")
             return {"error": "User account is already inactive"}, 400
 
-        # Use bcrypt to check the password
-        if not bcrypt.checkpw(password.encode("utf-8"), user.password.encode("utf-8")):
+        # Check the password against the stored hash on the hashing pool
+        if not verify_password(password, user.password):
+            audit.record(
+                login_events.DEACTIVATE_FAILURE, user.id, username, "bad_password"
+            )
             logger.warning("Invalid username or password")
             return {"error": "Invalid username or password"}, 400
 
         # Deactivate the account
         user.is_active = False
+        bump_token_version(db, user.id)
+        revoke_user_refresh_tokens(db, user.id)
         db.commit()
+        get_credential_cache().invalidate(user.id)
+        get_token_versions().invalidate(user.id)
+        get_auth_record_cache().invalidate(username)
+        get_profile_cache().invalidate(user.id, user.username)
+        audit.record(login_events.DEACTIVATE, user.id, username)
         logger.info("Account deactivated successfully")
         return {"message": "Account deactivated successfully"}, 200
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error deactivating account: {e}", exc_info=True)
         return {"message": "Internal server error"}, 500
+
+
+def _introspection_response(token):
+    """Build an RFC 7662 introspection response for a single token."""
+    claims = decode_jwt(token)
+    if claims is None:
+        return {"active": False}
+    return {
+        "active": True,
+        "token_type": "Bearer",
+        "sub": str(claims["user_id"]),
+        **claims,
+    }
+
+
+def introspect(token, db=None):
+    data = IntrospectSchema().load({"token": token})
+
+    logger.info("Token introspection request received")
+    return _introspection_response(data["token"]), 200
+
+
+def introspect_batch(tokens, db=None):
+    data = IntrospectBatchSchema().load({"tokens": tokens})
+
+    logger.info(f"Batch token introspection request for {len(data['tokens'])} tokens")
+    results = [_introspection_response(token) for token in data["tokens"]]
+    return {"results": results}, 200
@@ -0,0 +1,245 @@
+# app/service/auth_record_cache.py
+
+import json
+import logging
+import secrets
+import time
+
+from app.models import UserAuthRecord
+from app.utils.cache import TTLCache
+from app.utils.cache_backends import create_backend
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 10
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_SHARED_TTL = 60
+DEFAULT_SYNC_INTERVAL = 1
+
+_KEY_PREFIX = "auth_record:"
+# Rewritten with a random value whenever a username is invalidated. Cached
+# entries remember the value they were read under and are dropped once it
+# changes. Outlives any cached entry, so an expired marker is never mistaken
+# for the one an entry was stored under.
+_VERSION_PREFIX = "auth_record:version:"
+_VERSION_TTL = 24 * 3600
+_NO_VERSION = ""
+
+
+def _dump(record, version):
+    values = [getattr(record, name) for name in UserAuthRecord.__slots__]
+    return json.dumps({"version": version, "record": values}).encode("utf-8")
+
+
+def _load(value):
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    entry = json.loads(value)
+    return entry["version"], UserAuthRecord(*entry["record"])
+
+
+class AuthRecordCache:
+    """Two-tier cache of login lookups keyed by username.
+
+    Holds the ``UserAuthRecord`` (id, password hash, is_active,
+    token_version) for recently seen users so repeat logins skip the
+    database. The first tier is this worker's LRU. The optional second tier
+    is a ``CacheBackend`` shared by the node's workers (uWSGI cache) or the
+    whole cluster (Redis), so a restarted worker starts warm.
+
+    Invalidations delete the entry from both tiers and rewrite the
+    username's version marker. Every entry carries the marker it was read
+    under: shared entries are checked on each read, and local ones at most
+    once per ``sync_interval`` seconds, so only the invalidated usernames
+    are dropped. Callers read ``version`` before querying the database and
+    pass it to ``store``, which skips records an invalidation overtook.
+    Without a shared tier, changes made elsewhere are seen once the local
+    entry expires after ``ttl``. Shared-tier errors count as misses.
+
+    Records read from a lagging replica may predate an invalidation, so
+    callers store them with ``shared=False``: they stay in this worker's
+    short-lived tier and never reach the longer-lived shared one.
+    """
+
+    def __init__(
+        self,
+        enabled=False,
+        ttl=DEFAULT_TTL,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        shared=None,
+        shared_ttl=DEFAULT_SHARED_TTL,
+        sync_interval=DEFAULT_SYNC_INTERVAL,
+    ) -> None:
+        self.enabled = enabled
+        # Local entries are [record, version, last checked]
+        self._cache = TTLCache(max_size=max_entries, ttl=ttl)
+        self._shared = shared
+        self._shared_ttl = shared_ttl
+        self._sync_interval = sync_interval
+        self._shared_hits = 0
+        self._shared_misses = 0
+        self._shared_errors = 0
+        self._stale = 0
+
+    def get(self, username):
+        if not self.enabled:
+            return None
+        entry = self._cache.get(username)
+        if entry is not None and self._is_current(username, entry):
+            return entry[0]
+        if self._shared is None:
+            return None
+        return self._shared_get(username)
+
+    def version(self, username):
+        """Return the username's version marker, to pass to ``store``.
+
+        Read it before querying the database. None means it is unknown and
+        the record will not be shared.
+        """
+        if not self.enabled or self._shared is None:
+            return _NO_VERSION
+        try:
+            return self._read_version(username)
+        except Exception as e:
+            self._shared_error("version read", e)
+            return None
+
+    def store(self, username, record, version, shared=True) -> None:
+        """Cache ``record`` unless ``username`` was invalidated since ``version``."""
+        if not self.enabled:
+            return
+        if self._shared is not None and version is not None:
+            try:
+                current = self._read_version(username)
+            except Exception as e:
+                self._shared_error("version read", e)
+                current = None
+            if current is not None and current != version:
+                self._stale += 1
+                logger.debug("Skipped caching an auth record read before invalidation")
+                return
+            if current is None:
+                shared = False
+        self._cache.set(username, [record, version, time.monotonic()])
+        if shared and version is not None and self._shared is not None:
+            try:
+                self._shared.set(
+                    _KEY_PREFIX + username, _dump(record, version), self._shared_ttl
+                )
+            except Exception as e:
+                self._shared_error("store", e)
+
+    def invalidate(self, *usernames) -> None:
+        for username in usernames:
+            self._cache.delete(username)
+        if self._shared is None:
+            return
+        try:
+            for username in usernames:
+                if username is not None:
+                    self._shared.delete(_KEY_PREFIX + username)
+                    self._shared.set(
+                        _VERSION_PREFIX + username,
+                        secrets.token_hex(8).encode(),
+                        _VERSION_TTL,
+                    )
+        except Exception as e:
+            self._shared_error("invalidate", e)
+
+    def _read_version(self, username):
+        version = self._shared.get(_VERSION_PREFIX + username)
+        if isinstance(version, bytes):
+            version = version.decode("utf-8")
+        return version or _NO_VERSION
+
+    def _is_current(self, username, entry) -> bool:
+        record, version, checked_at = entry
+        now = time.monotonic()
+        if self._shared is None or now - checked_at < self._sync_interval:
+            return True
+        try:
+            current = self._read_version(username)
+        except Exception as e:
+            # Keep serving the local copy until it expires
+            self._shared_error("sync", e)
+            return True
+        if current == version:
+            entry[2] = now
+            return True
+        self._cache.delete(username)
+        self._stale += 1
+        logger.debug("Auth record dropped after remote invalidation")
+        return False
+
+    def _shared_get(self, username):
+        try:
+            value = self._shared.get(_KEY_PREFIX + username)
+            current = self._read_version(username) if value is not None else None
+        except Exception as e:
+            self._shared_error("read", e)
+            return None
+        if value is None:
+            self._shared_misses += 1
+            return None
+        version, record = _load(value)
+        if version != current:
+            self._shared_misses += 1
+            self._stale += 1
+            return None
+        self._shared_hits += 1
+        self._cache.set(username, [record, version, time.monotonic()])
+        return record
+
+    def _shared_error(self, operation, error) -> None:
+        self._shared_errors += 1
+        logger.warning(f"Shared auth record cache {operation} failed: {error}")
+
+    def stats(self):
+        stats = {"enabled": self.enabled, **self._cache.stats()}
+        if self._shared is not None:
+            stats["shared"] = {
+                "backend": self._shared.name,
+                "hits": self._shared_hits,
+                "misses": self._shared_misses,
+                "errors": self._shared_errors,
+                "stale": self._stale,
+            }
+        return stats
+
+
+_cache = AuthRecordCache()
+
+
+def init_auth_record_cache(app) -> None:
+    """Configures the auth record cache from the Flask app config."""
+    global _cache
+    enabled = app.config.get("AUTH_RECORD_CACHE_ENABLED", False)
+    shared = None
+    if enabled:
+        shared = create_backend(
+            app.config.get("AUTH_RECORD_CACHE_BACKEND"),
+            url=app.config.get("AUTH_RECORD_CACHE_URL"),
+            cache_name=app.config.get("AUTH_RECORD_CACHE_UWSGI_NAME"),
+        )
+    _cache = AuthRecordCache(
+        enabled=enabled,
+        ttl=app.config.get("AUTH_RECORD_CACHE_TTL", DEFAULT_TTL),
+        max_entries=app.config.get(
+            "AUTH_RECORD_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES
+        ),
+        shared=shared,
+        shared_ttl=app.config.get("AUTH_RECORD_CACHE_SHARED_TTL", DEFAULT_SHARED_TTL),
+        sync_interval=app.config.get(
+            "AUTH_RECORD_CACHE_SYNC_INTERVAL", DEFAULT_SYNC_INTERVAL
+        ),
+    )
+    logger.debug(
+        f"Auth record cache enabled: {_cache.enabled}, "
+        f"shared backend: {shared.name if shared else None}"
+    )
+
+
+def get_auth_record_cache():
+    return _cache
@@ -0,0 +1,75 @@
+# app/service/credential_cache.py
+
+import hashlib
+import hmac
+import logging
+import os
+
+from app.utils.cache import TTLCache
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class CredentialCache:
+    """Remembers recently verified passwords so repeat logins skip the hash.
+
+    One entry is kept per user id. It holds a keyed HMAC of the password that
+    was verified, along with the stored hash it was verified against. A lookup
+    only hits if both still match, so any change to ``User.password`` makes
+    the entry useless even in workers that never saw the change. The HMAC key
+    is random per process and never leaves memory.
+    """
+
+    def __init__(
+        self, enabled=False, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.enabled = enabled
+        self._key = os.urandom(32)
+        self._cache = TTLCache(max_size=max_entries, ttl=ttl)
+
+    def _digest(self, password):
+        return hmac.new(self._key, password.encode("utf-8"), hashlib.sha256).digest()
+
+    def check(self, user_id, password, hashed_password):
+        """Return True if this password was recently verified for the user."""
+        if not self.enabled:
+            return False
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return False
+        digest, verified_hash = entry
+        return verified_hash == hashed_password and hmac.compare_digest(
+            digest, self._digest(password)
+        )
+
+    def store(self, user_id, password, hashed_password) -> None:
+        if self.enabled:
+            self._cache.set(user_id, (self._digest(password), hashed_password))
+
+    def invalidate(self, user_id) -> None:
+        self._cache.delete(user_id)
+
+    def stats(self):
+        return {"enabled": self.enabled, **self._cache.stats()}
+
+
+_cache = CredentialCache()
+
+
+def init_credential_cache(app) -> None:
+    """Configures the verified-credential cache from the Flask app config."""
+    global _cache
+    _cache = CredentialCache(
+        enabled=app.config.get("CREDENTIAL_CACHE_ENABLED", False),
+        ttl=app.config.get("CREDENTIAL_CACHE_TTL", DEFAULT_TTL),
+        max_entries=app.config.get("CREDENTIAL_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+    )
+    logger.debug(f"Credential cache enabled: {_cache.enabled}")
+
+
+def get_credential_cache():
+    return _cache
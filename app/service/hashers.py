@@ -0,0 +1,249 @@
+# app/service/hashers.py
+
+import base64
+import hashlib
+import hmac
+import logging
+import os
+
+import bcrypt
+
+try:
+    import argon2
+except ImportError:  # pragma: no cover - exercised only without argon2-cffi
+    argon2 = None
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data):
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+class PasswordHasher:
+    """Base class for password hashing algorithms.
+
+    Encoded hashes carry their own algorithm prefix and parameters, so any
+    registered hasher can verify hashes produced with older settings.
+    """
+
+    algorithm = None
+    prefixes = ()
+
+    def identify(self, encoded):
+        return encoded.startswith(self.prefixes)
+
+    def hash(self, password):
+        raise NotImplementedError
+
+    def verify(self, password, encoded):
+        raise NotImplementedError
+
+    def needs_rehash(self, encoded):
+        raise NotImplementedError
+
+
+class BcryptHasher(PasswordHasher):
+    algorithm = "bcrypt"
+    prefixes = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds=12) -> None:
+        self.rounds = rounds
+
+    def hash(self, password):
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+    def verify(self, password, encoded):
+        return bcrypt.checkpw(password.encode("utf-8"), encoded.encode("utf-8"))
+
+    def needs_rehash(self, encoded):
+        # Hashes that cannot be parsed are left alone. Only weaker hashes are
+        # upgraded: the cost is calibrated per node, and rehashing on any
+        # difference would have nodes downgrading each other's hashes.
+        parts = encoded.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return False
+        return int(parts[2]) < self.rounds
+
+
+class ScryptHasher(PasswordHasher):
+    """scrypt via the standard library.
+
+    Encoded as ``$scrypt$ln=<log2 n>,r=<r>,p=<p>$<salt>$<key>``.
+    """
+
+    algorithm = "scrypt"
+    prefixes = ("$scrypt$",)
+
+    def __init__(self, n=2**14, r=8, p=1, salt_size=16, dklen=64) -> None:
+        if n < 2 or n & (n - 1):
+            raise ValueError("scrypt n must be a power of two greater than 1")
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.dklen = dklen
+
+    def _derive(self, password, salt, n, r, p, dklen):
+        # OpenSSL needs 128 * r * (n + p + 2) bytes; leave a little headroom
+        maxmem = 128 * r * (n + p + 2) + 1024 * 1024
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=maxmem,
+            dklen=dklen,
+        )
+
+    def _parse(self, encoded):
+        """Return ``(n, r, p, salt, key)``, or None for a malformed hash."""
+        try:
+            _, _, params, salt, key = encoded.split("$")
+            values = dict(item.split("=") for item in params.split(","))
+            ln = int(values["ln"])
+            if ln < 1:
+                return None
+            return (
+                2**ln,
+                int(values["r"]),
+                int(values["p"]),
+                _b64decode(salt),
+                _b64decode(key),
+            )
+        except (ValueError, KeyError):
+            return None
+
+    def hash(self, password):
+        salt = os.urandom(self.salt_size)
+        key = self._derive(password, salt, self.n, self.r, self.p, self.dklen)
+        ln = self.n.bit_length() - 1
+        return (
+            f"$scrypt$ln={ln},r={self.r},p={self.p}"
+            f"${_b64encode(salt)}${_b64encode(key)}"
+        )
+
+    def verify(self, password, encoded):
+        parsed = self._parse(encoded)
+        if parsed is None:
+            # A malformed stored hash matches no password
+            return False
+        n, r, p, salt, key = parsed
+        candidate = self._derive(password, salt, n, r, p, len(key))
+        return hmac.compare_digest(candidate, key)
+
+    def needs_rehash(self, encoded):
+        parsed = self._parse(encoded)
+        if parsed is None:
+            return False
+        n, r, p, _, key = parsed
+        return (n, r, p, len(key)) != (self.n, self.r, self.p, self.dklen)
+
+
+class Argon2Hasher(PasswordHasher):
+    """Argon2id via argon2-cffi, which must be installed to use it."""
+
+    algorithm = "argon2id"
+    prefixes = ("$argon2id$",)
+
+    def __init__(self, time_cost=2, memory_cost=19456, parallelism=1) -> None:
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = None
+        if argon2 is not None:
+            self._hasher = argon2.PasswordHasher(
+                time_cost=time_cost,
+                memory_cost=memory_cost,
+                parallelism=parallelism,
+                type=argon2.Type.ID,
+            )
+
+    @property
+    def available(self):
+        return self._hasher is not None
+
+    def _require(self):
+        if self._hasher is None:
+            raise RuntimeError("argon2-cffi is not installed")
+        return self._hasher
+
+    def hash(self, password):
+        return self._require().hash(password)
+
+    def verify(self, password, encoded):
+        hasher = self._require()
+        try:
+            return hasher.verify(encoded, password)
+        except (
+            argon2.exceptions.VerificationError,
+            argon2.exceptions.InvalidHashError,
+        ):
+            # A malformed stored hash matches no password
+            return False
+
+    def needs_rehash(self, encoded):
+        return self._require().check_needs_rehash(encoded)
+
+
+_hashers = {}
+_preferred = "bcrypt"
+
+
+def configure_hashers(config, bcrypt_rounds=12) -> None:
+    """Builds the hasher registry from the Flask app config."""
+    global _hashers, _preferred
+    hashers = {
+        "bcrypt": BcryptHasher(rounds=bcrypt_rounds),
+        "scrypt": ScryptHasher(
+            n=config.get("SCRYPT_N", 2**14),
+            r=config.get("SCRYPT_R", 8),
+            p=config.get("SCRYPT_P", 1),
+        ),
+        "argon2id": Argon2Hasher(
+            time_cost=config.get("ARGON2_TIME_COST", 2),
+            memory_cost=config.get("ARGON2_MEMORY_COST", 19456),
+            parallelism=config.get("ARGON2_PARALLELISM", 1),
+        ),
+    }
+
+    preferred = config.get("PASSWORD_HASHER", "bcrypt")
+    if preferred not in hashers:
+        logger.error(f"Unknown password hasher: {preferred}. Falling back to bcrypt.")
+        preferred = "bcrypt"
+    elif preferred == "argon2id" and not hashers["argon2id"].available:
+        logger.error("argon2-cffi is not installed. Falling back to bcrypt.")
+        preferred = "bcrypt"
+
+    _hashers = hashers
+    _preferred = preferred
+    logger.debug(f"Preferred password hasher: {preferred}")
+
+
+def get_hasher(algorithm):
+    return _hashers[algorithm]
+
+
+def get_preferred_hasher():
+    return _hashers[_preferred]
+
+
+def identify_hasher(encoded):
+    """Return the hasher that produced ``encoded``.
+
+    Hashes without a recognised prefix predate the registry and are bcrypt.
+    """
+    for hasher in _hashers.values():
+        if hasher.identify(encoded):
+            return hasher
+    return _hashers["bcrypt"]
+
+
+configure_hashers({})
@@ -0,0 +1,242 @@
+# app/service/hashing.py
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from app.service.hashers import (
+    configure_hashers,
+    get_hasher,
+    get_preferred_hasher,
+    identify_hasher,
+)
+from app.utils.background import PerProcess
+from app.utils.exceptions import ServiceUnavailableError
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_RETRY_AFTER = 1
+DEFAULT_BCRYPT_ROUNDS = 12
+DEFAULT_BCRYPT_MIN_ROUNDS = 10
+DEFAULT_BCRYPT_MAX_ROUNDS = 16
+
+
+class HashingPool:
+    """Bounded thread pool that runs password hashing off the request thread.
+
+    At most ``max_workers`` hashes run at once and at most ``max_queue`` more
+    may wait for a worker. Anything beyond that is rejected immediately with a
+    ServiceUnavailableError so a login burst cannot starve the process.
+    """
+
+    def __init__(
+        self,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_queue=DEFAULT_MAX_QUEUE,
+        retry_after=DEFAULT_RETRY_AFTER,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._executor = PerProcess(
+            lambda: ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="hashing"
+            )
+        )
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._started = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _record_wait(self, waited) -> None:
+        with self._lock:
+            self._started += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def run(self, fn, *args):
+        """Run ``fn(*args)`` on the pool and return its result."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            logger.warning("Hashing pool saturated, rejecting request")
+            raise ServiceUnavailableError(retry_after=self.retry_after)
+
+        enqueued_at = time.monotonic()
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+
+        def task():
+            self._record_wait(time.monotonic() - enqueued_at)
+            return fn(*args)
+
+        try:
+            return self._executor.get().submit(task).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        executor = self._executor.pop()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self):
+        """Return a snapshot of the pool counters."""
+        with self._lock:
+            wait_avg = self._wait_total / self._started if self._started else 0.0
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "queue_wait_avg_ms": round(wait_avg * 1000, 3),
+                "queue_wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+_pool = HashingPool()
+
+
+def _time_bcrypt(rounds):
+    """Return how long one bcrypt hash at ``rounds`` takes, in milliseconds."""
+    salt = bcrypt.gensalt(rounds=rounds)
+    started = time.perf_counter()
+    bcrypt.hashpw(b"bcrypt-calibration", salt)
+    return (time.perf_counter() - started) * 1000
+
+
+def calibrate_bcrypt_rounds(
+    target_ms,
+    min_rounds=DEFAULT_BCRYPT_MIN_ROUNDS,
+    max_rounds=DEFAULT_BCRYPT_MAX_ROUNDS,
+):
+    """Pick the highest bcrypt cost whose hash time fits within ``target_ms``.
+
+    Each extra round doubles the work, so the next cost is only measured when
+    twice the current timing still fits the budget. ``min_rounds`` is returned
+    even if it exceeds the budget, so calibration never weakens hashes below
+    the configured floor.
+    """
+    rounds = min_rounds
+    elapsed = _time_bcrypt(rounds)
+    while rounds < max_rounds and elapsed * 2 <= target_ms:
+        candidate = _time_bcrypt(rounds + 1)
+        if candidate > target_ms:
+            break
+        rounds += 1
+        elapsed = candidate
+    logger.info(
+        f"Calibrated bcrypt cost to {rounds} rounds "
+        f"({elapsed:.1f} ms, target {target_ms} ms)"
+    )
+    return rounds
+
+
+def init_hashing(app) -> None:
+    """Configures the hashing pool and password hashers from the app config."""
+    global _pool
+    target_ms = app.config.get("BCRYPT_TARGET_MS")
+    if target_ms:
+        bcrypt_rounds = calibrate_bcrypt_rounds(
+            target_ms,
+            min_rounds=app.config.get("BCRYPT_MIN_ROUNDS", DEFAULT_BCRYPT_MIN_ROUNDS),
+            max_rounds=app.config.get("BCRYPT_MAX_ROUNDS", DEFAULT_BCRYPT_MAX_ROUNDS),
+        )
+    else:
+        bcrypt_rounds = app.config.get("BCRYPT_ROUNDS", DEFAULT_BCRYPT_ROUNDS)
+    configure_hashers(app.config, bcrypt_rounds=bcrypt_rounds)
+
+    _pool.shutdown()
+    _pool = HashingPool(
+        max_workers=app.config.get("HASH_POOL_MAX_WORKERS", DEFAULT_MAX_WORKERS),
+        max_queue=app.config.get("HASH_POOL_MAX_QUEUE", DEFAULT_MAX_QUEUE),
+        retry_after=app.config.get("HASH_POOL_RETRY_AFTER", DEFAULT_RETRY_AFTER),
+    )
+    logger.debug(
+        f"Hashing pool configured: max_workers={_pool.max_workers}, "
+        f"max_queue={_pool.max_queue}"
+    )
+
+
+def get_hashing_pool():
+    return _pool
+
+
+def get_bcrypt_rounds():
+    return get_hasher("bcrypt").rounds
+
+
+def _hash(password):
+    return get_preferred_hasher().hash(password)
+
+
+def _verify(password, hashed_password):
+    return identify_hasher(hashed_password).verify(password, hashed_password)
+
+
+def hash_password(password):
+    """Hash a password with the preferred algorithm on the hashing pool."""
+    return _pool.run(_hash, password)
+
+
+def hash_passwords(passwords, executor=None):
+    """Hash many passwords with the preferred algorithm on ``executor``.
+
+    For bulk jobs, which must not queue behind or starve the request pool.
+    The hashers release the GIL, so a thread pool spreads the work across
+    cores. Returns the hashes in input order.
+
+    Without an executor, as inside a web worker, the passwords are hashed on
+    the shared hashing pool instead. The job keeps at most ``max_workers``
+    of them in flight, so it never fills the queue logins wait in, and waits
+    out rejections rather than failing.
+    """
+    if executor is not None:
+        return list(executor.map(_hash, passwords))
+    pool = _pool
+    with ThreadPoolExecutor(
+        max_workers=pool.max_workers, thread_name_prefix="hashing-batch"
+    ) as submitter:
+        return list(submitter.map(lambda password: _hash_on(pool, password), passwords))
+
+
+def _hash_on(pool, password):
+    while True:
+        try:
+            return pool.run(_hash, password)
+        except ServiceUnavailableError as e:
+            time.sleep(e.retry_after)
+
+
+def verify_password(password, hashed_password):
+    """Check a password against a stored hash on the hashing pool."""
+    return _pool.run(_verify, password, hashed_password)
+
+
+def needs_rehash(hashed_password):
+    """Return True if a stored hash should be replaced on next login.
+
+    That is the case when it was produced by another algorithm than the
+    preferred one, or with different cost parameters.
+    """
+    hasher = identify_hasher(hashed_password)
+    if hasher is not get_preferred_hasher():
+        return True
+    return hasher.needs_rehash(hashed_password)
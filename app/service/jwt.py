@@ -1,27 +1,157 @@
 import jwt
 import datetime
+import hashlib
 import os
 import logging
+import secrets
+import time
+from app.service.keyring import (
+    ASYMMETRIC_ALGORITHMS,
+    JWT_KEYRING_CHECK_INTERVAL,
+    JWT_KEYRING_PATH,
+    KeyRing,
+    KeyRingManager,
+    SigningKey,
+)
+from app.service.revocation import get_revocation_list
+from app.service.token_versions import get_token_versions
+from app.utils.cache import TTLCache
 
 # Get the logger
 logger = logging.getLogger(__name__)
 
 SECRET_KEY = os.getenv("SECRET_KEY", "smile-secret-key")
 
+# Without a key ring manifest (JWT_KEYRING_PATH) a single key is used: HS256
+# signs with SECRET_KEY, RS256 and EdDSA sign with the PEM private key at
+# JWT_PRIVATE_KEY_PATH and publish the public half through the JWKS route
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_PRIVATE_KEY_PATH = os.getenv("JWT_PRIVATE_KEY_PATH")
+JWT_KEY_ID = os.getenv("JWT_KEY_ID", "default")
+JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", "300"))
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "10000"))
+# Access token lifetime in seconds; sessions are renewed with refresh tokens
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", "3600"))
 
-def generate_jwt(user_id):
+
+def _load_env_keyring():
+    """Build a single-key ring from the environment."""
+    if JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS:
+        with open(JWT_PRIVATE_KEY_PATH, "rb") as key_file:
+            key = SigningKey.from_pem(JWT_ALGORITHM, key_file.read())
+    else:
+        key = SigningKey.from_secret(JWT_KEY_ID, SECRET_KEY)
+    logger.debug(f"Loaded {key.algorithm} signing key {key.kid}")
+    return KeyRing([key])
+
+
+# Decoded claims keyed by token digest, with the key that verified them;
+# each entry lives until the token expires
+_claims_cache = TTLCache(max_size=JWT_CLAIMS_CACHE_SIZE, ttl=ACCESS_TOKEN_TTL)
+
+_keyring = KeyRingManager(
+    _load_env_keyring,
+    manifest_path=JWT_KEYRING_PATH,
+    check_interval=JWT_KEYRING_CHECK_INTERVAL,
+)
+
+
+def get_keyring():
+    return _keyring.get()
+
+
+def get_claims_cache():
+    return _claims_cache
+
+
+def get_jwks():
+    """Return the JSON Web Key Set with the public signing keys."""
+    return get_keyring().jwks()
+
+
+def get_jwks_document():
+    """Return the serialized JWKS and its ETag."""
+    return get_keyring().jwks_document()
+
+
+def generate_jwt(user_id, token_version=0):
     logger.info("Generating JWT")
     logger.debug(f"User ID: {user_id}")
     try:
         now = datetime.datetime.now(datetime.UTC)
         payload = {
             "user_id": user_id,
-            "exp": now + datetime.timedelta(hours=1),
+            "exp": now + datetime.timedelta(seconds=ACCESS_TOKEN_TTL),
             "iat": now,
+            "jti": secrets.token_hex(16),
+            "ver": token_version,
         }
-        token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+        key = get_keyring().active_key(now)
+        token = jwt.encode(
+            payload,
+            key.signing_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+        )
         logger.debug(f"Generated JWT: {token}")
         return token
     except Exception as e:
         logger.error(f"Error generating JWT: {e}", exc_info=True)
         return None
+
+
+def decode_jwt(token):
+    """Verify a token and return its claims, or None if it is not valid.
+
+    The signing key is picked by the ``kid`` header; tokens without one are
+    checked against the active key only. Valid claims are cached until the
+    token expires, so repeat checks of the same token skip signature work.
+    A cached entry is only used while the key that verified it is still the
+    one the current key ring picks, so removing a key from the manifest
+    rejects its tokens at the next ring reload. Revocation is checked on
+    every call, cached or not.
+    """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    keyring = get_keyring()
+    cached = _claims_cache.get(digest)
+    if cached is not None:
+        kid, key, claims = cached
+        if _select_key(keyring, kid) is key:
+            return None if _is_revoked(claims) else claims
+        # The key was removed or replaced; verify against the current ring
+        _claims_cache.delete(digest)
+
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = _select_key(keyring, kid)
+        if key is None:
+            logger.debug(f"Unknown signing key id: {kid}")
+            return None
+        claims = jwt.decode(
+            token,
+            key.verification_key,
+            algorithms=[key.algorithm],
+            options={"require": ["exp", "iat"]},
+        )
+    except jwt.InvalidTokenError as e:
+        logger.debug(f"Invalid JWT: {e}")
+        return None
+
+    ttl = claims["exp"] - time.time()
+    if ttl > 0:
+        _claims_cache.set(digest, (kid, key, claims), ttl=ttl)
+    return None if _is_revoked(claims) else claims
+
+
+def _select_key(keyring, kid):
+    return keyring.get(kid) if kid else keyring.active_key()
+
+
+def _is_revoked(claims):
+    if get_revocation_list().is_revoked(claims.get("jti")):
+        logger.debug(f"Revoked JWT: {claims.get('jti')}")
+        return True
+    if get_token_versions().is_stale(claims):
+        logger.debug(f"JWT issued before token version bump: {claims.get('jti')}")
+        return True
+    return False
@@ -0,0 +1,228 @@
+# app/service/keyring.py
+
+import base64
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from cryptography.hazmat.primitives import serialization
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+# JSON manifest listing the signing keys; see load_keyring_manifest
+JWT_KEYRING_PATH = os.getenv("JWT_KEYRING_PATH")
+JWT_KEYRING_CHECK_INTERVAL = int(os.getenv("JWT_KEYRING_CHECK_INTERVAL", "30"))
+
+ASYMMETRIC_ALGORITHMS = {"RS256": RSAAlgorithm, "EdDSA": OKPAlgorithm}
+SYMMETRIC_ALGORITHMS = ("HS256",)
+
+# Members that make up the RFC 7638 thumbprint for each key type
+_THUMBPRINT_MEMBERS = {"RSA": ("e", "kty", "n"), "OKP": ("crv", "kty", "x")}
+
+_EPOCH = datetime.datetime.fromtimestamp(0, datetime.UTC)
+
+
+def _thumbprint(public_jwk):
+    """Compute the RFC 7638 JWK thumbprint used as the key id."""
+    members = {k: public_jwk[k] for k in _THUMBPRINT_MEMBERS[public_jwk["kty"]]}
+    canonical = json.dumps(members, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(canonical.encode("utf-8")).digest()
+    return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+
+class SigningKey:
+    """A parsed signing key, ready to hand to ``jwt.encode``/``jwt.decode``."""
+
+    __slots__ = (
+        "kid",
+        "algorithm",
+        "signing_key",
+        "verification_key",
+        "not_before",
+        "public_jwk",
+    )
+
+    def __init__(
+        self,
+        kid,
+        algorithm,
+        signing_key,
+        verification_key,
+        not_before=_EPOCH,
+        public_jwk=None,
+    ) -> None:
+        self.kid = kid
+        self.algorithm = algorithm
+        self.signing_key = signing_key
+        self.verification_key = verification_key
+        self.not_before = not_before
+        self.public_jwk = public_jwk
+
+    @classmethod
+    def from_secret(cls, kid, secret, not_before=_EPOCH):
+        secret = secret.encode("utf-8")
+        return cls(kid, "HS256", secret, secret, not_before=not_before)
+
+    @classmethod
+    def from_pem(cls, algorithm, pem, kid=None, not_before=_EPOCH):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+        private_key = serialization.load_pem_private_key(pem, None)
+        public_key = private_key.public_key()
+        public_jwk = ASYMMETRIC_ALGORITHMS[algorithm].to_jwk(public_key, as_dict=True)
+        kid = kid or _thumbprint(public_jwk)
+        public_jwk.update({"kid": kid, "alg": algorithm, "use": "sig"})
+        return cls(
+            kid,
+            algorithm,
+            private_key,
+            public_key,
+            not_before=not_before,
+            public_jwk=public_jwk,
+        )
+
+
+class KeyRing:
+    """The set of keys a worker signs and verifies with.
+
+    The active key is the newest one whose ``not_before`` has passed, so
+    rotation can be scheduled by listing the next key ahead of time. Every
+    other key is either retiring (still accepted for verification) or
+    pending (already published in the JWKS so caches pick it up early).
+    """
+
+    def __init__(self, keys) -> None:
+        if not keys:
+            raise ValueError("Key ring must contain at least one key")
+        self._keys = sorted(keys, key=lambda key: key.not_before, reverse=True)
+        self._by_kid = {key.kid: key for key in self._keys}
+        if len(self._by_kid) != len(self._keys):
+            raise ValueError("Key ids in a key ring must be unique")
+        self._jwks_document = None
+
+    def active_key(self, now=None):
+        now = now or datetime.datetime.now(datetime.UTC)
+        for key in self._keys:
+            if key.not_before <= now:
+                return key
+        # Nothing has started yet; sign with the earliest key
+        return self._keys[-1]
+
+    def get(self, kid):
+        return self._by_kid.get(kid)
+
+    def jwks(self):
+        # Symmetric keys have no public half and are never published
+        return {"keys": [key.public_jwk for key in self._keys if key.public_jwk]}
+
+    def jwks_document(self):
+        """Return the serialized JWKS and its ETag, built once per ring."""
+        if self._jwks_document is None:
+            body = json.dumps(self.jwks(), separators=(",", ":"), sort_keys=True)
+            etag = hashlib.sha256(body.encode("utf-8")).hexdigest()
+            self._jwks_document = (body, etag)
+        return self._jwks_document
+
+    def __iter__(self):
+        return iter(self._keys)
+
+
+def _parse_not_before(value):
+    if not value:
+        return _EPOCH
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.UTC)
+    return parsed
+
+
+def load_keyring_manifest(path):
+    """Build a key ring from a JSON manifest.
+
+    The manifest looks like::
+
+        {"keys": [
+            {"kid": "2024-11", "algorithm": "EdDSA",
+             "private_key_path": "2024-11.pem",
+             "not_before": "2024-11-01T00:00:00Z"},
+            {"kid": "legacy", "algorithm": "HS256", "secret_env": "SECRET_KEY"}
+        ]}
+
+    Relative key paths are resolved against the manifest's directory.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, "r") as manifest_file:
+        manifest = json.load(manifest_file)
+
+    keys = []
+    for entry in manifest["keys"]:
+        algorithm = entry.get("algorithm", "HS256")
+        not_before = _parse_not_before(entry.get("not_before"))
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            secret = os.environ[entry["secret_env"]]
+            keys.append(SigningKey.from_secret(entry["kid"], secret, not_before))
+        else:
+            key_path = os.path.join(base_dir, entry["private_key_path"])
+            with open(key_path, "rb") as key_file:
+                pem = key_file.read()
+            keys.append(
+                SigningKey.from_pem(algorithm, pem, entry.get("kid"), not_before)
+            )
+    return KeyRing(keys)
+
+
+class KeyRingManager:
+    """Holds the worker's key ring and reloads it when the manifest changes.
+
+    The manifest's mtime is checked at most once per ``check_interval``
+    seconds, so rotating keys only needs the file to be replaced. A manifest
+    that fails to load is logged and the previous ring stays in use.
+    """
+
+    def __init__(self, loader, manifest_path=None, check_interval=30) -> None:
+        self._loader = loader
+        self._path = manifest_path
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._ring = None
+        self._mtime = None
+        self._last_check = 0.0
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self._path).st_mtime_ns
+        except OSError as e:
+            logger.error(f"Cannot stat key ring manifest: {e}")
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            self._ring = load_keyring_manifest(self._path)
+            self._mtime = mtime
+            logger.info(f"Loaded key ring with kids {[k.kid for k in self._ring]}")
+        except Exception as e:
+            logger.error(f"Failed to load key ring manifest: {e}", exc_info=True)
+
+    def get(self):
+        now = time.monotonic()
+        if self._ring is not None and (
+            self._path is None or now - self._last_check < self._check_interval
+        ):
+            return self._ring
+
+        with self._lock:
+            if self._path is None:
+                if self._ring is None:
+                    self._ring = self._loader()
+            elif self._ring is None or now - self._last_check >= self._check_interval:
+                self._last_check = now
+                self._reload_if_changed()
+            if self._ring is None:
+                raise RuntimeError("No signing keys available")
+            return self._ring
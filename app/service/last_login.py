@@ -0,0 +1,173 @@
+# app/service/last_login.py
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import case, or_, update
+
+from app.database import db
+from app.models import User
+from app.utils.background import daemon_thread
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 30
+DEFAULT_BATCH_SIZE = 1000
+
+
+class LastLoginTracker:
+    """Coalesces last_login_at updates in memory and writes them periodically.
+
+    ``touch`` only records the newest login time per user id in a dict. A
+    background thread swaps the dict out every ``flush_interval`` seconds
+    and writes it with one ``UPDATE ... CASE`` per ``batch_size`` users, so
+    a user logging in many times between flushes costs a single row write
+    and login itself never writes. ``last_login_at`` may therefore lag by up
+    to one flush interval, plus whatever a killed worker had not flushed.
+    Failed writes are merged back and retried on the next flush.
+    """
+
+    def __init__(
+        self,
+        write=None,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        batch_size=DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self._write = write
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = daemon_thread(
+            self._run, "last-login", setup=self._forget_parent_pending
+        )
+        self._touches = 0
+        self._written = 0
+        self._flushes = 0
+        self._failures = 0
+
+    @property
+    def enabled(self):
+        return self._write is not None
+
+    def touch(self, user_id, at=None) -> None:
+        """Remember that ``user_id`` logged in at ``at`` (default now)."""
+        if not self.enabled:
+            return
+        at = at or datetime.utcnow()
+        self._thread.get()
+        with self._lock:
+            self._touches += 1
+            previous = self._pending.get(user_id)
+            if previous is None or at > previous:
+                self._pending[user_id] = at
+
+    def _forget_parent_pending(self) -> None:
+        # Times buffered by the parent are flushed by the parent
+        with self._lock:
+            self._pending = {}
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered login time now."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            items = list(pending.items())
+            for start in range(0, len(items), self.batch_size):
+                batch = dict(items[start : start + self.batch_size])
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.error(f"Failed to write last login times: {e}")
+                    self._requeue(dict(items[start:]))
+                    with self._lock:
+                        self._failures += 1
+                    return
+                with self._lock:
+                    self._written += len(batch)
+                    self._flushes += 1
+
+    def _requeue(self, times) -> None:
+        with self._lock:
+            for user_id, at in times.items():
+                previous = self._pending.get(user_id)
+                if previous is None or at > previous:
+                    self._pending[user_id] = at
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending": len(self._pending),
+                "touches": self._touches,
+                "written": self._written,
+                "flushes": self._flushes,
+                "failures": self._failures,
+            }
+
+
+def build_update(times):
+    """One UPDATE setting each user's last_login_at from ``{user_id: time}``.
+
+    Rows already holding a later time, written by another worker, are left
+    alone, so the column never moves backwards.
+    """
+    last_login_at = case(times, value=User.id)
+    return (
+        update(User)
+        .where(User.id.in_(list(times)))
+        .where(or_(User.last_login_at.is_(None), User.last_login_at < last_login_at))
+        .values(last_login_at=last_login_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _database_writer(app):
+    """Return a function applying buffered login times on its own connection."""
+
+    def write(times):
+        with app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(build_update(times))
+
+    return write
+
+
+# Until init_last_login runs nothing is tracked
+_tracker = LastLoginTracker()
+
+
+def init_last_login(app) -> None:
+    """Configures last_login_at tracking from the Flask app config."""
+    global _tracker
+    enabled = app.config.get("LAST_LOGIN_TRACKING_ENABLED", False)
+    _tracker = LastLoginTracker(
+        write=_database_writer(app) if enabled else None,
+        flush_interval=app.config.get(
+            "LAST_LOGIN_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL
+        ),
+        batch_size=app.config.get("LAST_LOGIN_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+    )
+    logger.debug(f"Last login tracking enabled: {enabled}")
+
+
+def get_last_logins():
+    return _tracker
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    # Write what is still buffered when a worker shuts down cleanly;
+    # registered once, for whichever tracker is current, which writes
+    # through the app it was configured with
+    _tracker.flush()
@@ -0,0 +1,303 @@
+# app/service/login_events.py
+
+import atexit
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import has_request_context, request
+from sqlalchemy import delete, insert, text
+
+from app.database import db
+from app.models import LoginEvent
+from app.utils.background import daemon_thread
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_PARTITIONS_AHEAD = 7
+
+LOGIN_SUCCESS = "login_success"
+LOGIN_FAILURE = "login_failure"
+REGISTER = "register"
+REACTIVATE = "reactivate"
+DEACTIVATE = "deactivate"
+DEACTIVATE_FAILURE = "deactivate_failure"
+
+# Values longer than their column would fail the whole multi-row INSERT
+# in strict mode, so they are clipped before queueing
+_USERNAME_LENGTH = LoginEvent.username.type.length
+_REASON_LENGTH = LoginEvent.reason.type.length
+
+# Catch-all partition kept empty at the top of the range, so new days are
+# split off it without moving rows
+_MAX_PARTITION = "pmax"
+
+
+class LoginEventWriter:
+    """Queues audit events in memory and writes them in batches off the request path.
+
+    ``record`` only builds a row and puts it on a bounded queue. A background
+    thread drains the queue and writes up to ``batch_size`` rows at a time,
+    once a batch fills or ``flush_interval`` seconds after its first event.
+    The audit trail is best-effort: when the queue is full, or a write
+    fails, events are dropped and counted rather than slowing logins down.
+    Events still queued when a worker is killed are lost.
+    """
+
+    def __init__(
+        self,
+        write=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        max_queue=DEFAULT_MAX_QUEUE,
+    ) -> None:
+        self._write = write
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = daemon_thread(self._run, "login-events")
+        self._recorded = 0
+        self._dropped = 0
+        self._written = 0
+        self._flushes = 0
+        self._failures = 0
+
+    @property
+    def enabled(self):
+        return self._write is not None
+
+    def record(self, event, user_id=None, username=None, reason=None) -> None:
+        """Queue one event; never blocks and never raises."""
+        if not self.enabled:
+            return
+        row = {
+            "created_at": datetime.utcnow(),
+            "id": uuid.uuid4().hex,
+            "event": event,
+            "user_id": user_id,
+            "username": _clip(username, _USERNAME_LENGTH),
+            "reason": _clip(reason, _REASON_LENGTH),
+            "ip_address": _client_ip(),
+        }
+        self._thread.get()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.warning("Login event queue full, dropping event")
+            return
+        with self._lock:
+            self._recorded += 1
+
+    def _run(self) -> None:
+        while True:
+            self._write_batch(self._next_batch())
+
+    def _next_batch(self):
+        # Block for the first event, then gather more until the batch is
+        # full or the flush interval has passed
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch) -> None:
+        try:
+            self._write(batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} login events: {e}")
+            with self._lock:
+                self._failures += 1
+                self._dropped += len(batch)
+            return
+        with self._lock:
+            self._written += len(batch)
+            self._flushes += 1
+
+    def flush(self) -> None:
+        """Write everything queued so far on the calling thread."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "queued": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "recorded": self._recorded,
+                "written": self._written,
+                "dropped": self._dropped,
+                "flushes": self._flushes,
+                "failures": self._failures,
+            }
+
+
+def _clip(value, length):
+    return value[:length] if isinstance(value, str) else value
+
+
+def _client_ip():
+    return request.remote_addr if has_request_context() else None
+
+
+def _database_writer(app):
+    """Return a function inserting rows into login_events on its own connection."""
+
+    def write(rows):
+        with app.app_context():
+            with db.engine.begin() as conn:
+                # An executemany, which the MySQL drivers send as one
+                # multi-row INSERT
+                conn.execute(insert(LoginEvent), rows)
+
+    return write
+
+
+# Until init_login_events runs nothing is recorded
+_writer = LoginEventWriter()
+
+
+def init_login_events(app) -> None:
+    """Configures the login audit log writer from the Flask app config."""
+    global _writer
+    enabled = app.config.get("LOGIN_EVENTS_ENABLED", False)
+    _writer = LoginEventWriter(
+        write=_database_writer(app) if enabled else None,
+        batch_size=app.config.get("LOGIN_EVENTS_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+        flush_interval=app.config.get(
+            "LOGIN_EVENTS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL
+        ),
+        max_queue=app.config.get("LOGIN_EVENTS_MAX_QUEUE", DEFAULT_MAX_QUEUE),
+    )
+    logger.debug(f"Login audit log enabled: {enabled}")
+
+
+def get_login_events():
+    return _writer
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    # Write what is still queued when a worker shuts down cleanly; registered
+    # once, for whichever writer is current
+    _writer.flush()
+
+
+def _partition_name(day):
+    return f"p{day:%Y%m%d}"
+
+
+def _partition_day(name):
+    try:
+        return datetime.strptime(name, "p%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def maintain_partitions(
+    db,
+    retention_days=DEFAULT_RETENTION_DAYS,
+    days_ahead=DEFAULT_PARTITIONS_AHEAD,
+    today=None,
+):
+    """Apply retention to login_events and make room for the coming days.
+
+    On a MySQL table partitioned by day, partitions for the next
+    ``days_ahead`` days are split off the empty catch-all and partitions
+    older than ``retention_days`` are dropped, which is a metadata change
+    however many rows they hold. Anywhere else old rows are deleted.
+    Meant to run daily, e.g. ``flask login-events maintain`` from cron.
+    """
+    # created_at is written in UTC, so partition days follow the UTC date
+    today = today or datetime.utcnow().date()
+    cutoff = today - timedelta(days=retention_days)
+    partitions = (
+        _existing_partitions(db) if db.get_bind().dialect.name == "mysql" else []
+    )
+    if not partitions:
+        result = db.execute(
+            delete(LoginEvent).where(
+                LoginEvent.created_at < datetime.combine(cutoff, datetime.min.time())
+            )
+        )
+        db.commit()
+        logger.info(f"Deleted {result.rowcount} login events before {cutoff}")
+        return {"deleted": result.rowcount}
+
+    days = {_partition_day(name) for name in partitions} - {None}
+    last_day = max(days, default=today - timedelta(days=1))
+    # Continue from the last partition, so days missed by an earlier run
+    # still get their own partition
+    created = []
+    day = last_day + timedelta(days=1)
+    while day <= today + timedelta(days=days_ahead):
+        created.append(day)
+        day += timedelta(days=1)
+    if created:
+        clauses = [
+            f"PARTITION {_partition_name(day)} VALUES LESS THAN "
+            f"('{day + timedelta(days=1):%Y-%m-%d}')"
+            for day in created
+        ]
+        clauses.append(f"PARTITION {_MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        db.execute(
+            text(
+                f"ALTER TABLE {LoginEvent.__tablename__} REORGANIZE PARTITION "
+                f"{_MAX_PARTITION} INTO ({', '.join(clauses)})"
+            )
+        )
+
+    dropped = sorted(day for day in days if day < cutoff)
+    if dropped:
+        db.execute(
+            text(
+                f"ALTER TABLE {LoginEvent.__tablename__} DROP PARTITION "
+                f"{', '.join(_partition_name(day) for day in dropped)}"
+            )
+        )
+    db.commit()
+    logger.info(
+        f"Login event partitions: {len(created)} created, {len(dropped)} dropped"
+    )
+    return {
+        "created": [_partition_name(day) for day in created],
+        "dropped": [_partition_name(day) for day in dropped],
+    }
+
+
+def _existing_partitions(db):
+    return db.scalars(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+            "AND PARTITION_NAME IS NOT NULL"
+        ),
+        {"table": LoginEvent.__tablename__},
+    ).all()
@@ -0,0 +1,63 @@
+# app/service/profile_cache.py
+
+import logging
+
+from app.utils.cache import TTLCache
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 30
+DEFAULT_MAX_ENTRIES = 20000
+
+
+class ProfileCache:
+    """Per-worker cache of public user profiles (``User.to_dict()``).
+
+    Each profile is reachable by id and by username. Account changes made
+    through this worker invalidate both keys; changes made elsewhere are
+    seen once the entry expires after ``ttl``.
+    """
+
+    def __init__(
+        self, enabled=True, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.enabled = enabled
+        self._cache = TTLCache(max_size=max_entries, ttl=ttl)
+
+    def get_by_id(self, user_id):
+        return self._cache.get(("id", user_id)) if self.enabled else None
+
+    def get_by_username(self, username):
+        return self._cache.get(("username", username)) if self.enabled else None
+
+    def store(self, profile) -> None:
+        if self.enabled:
+            self._cache.set(("id", profile["id"]), profile)
+            self._cache.set(("username", profile["username"]), profile)
+
+    def invalidate(self, user_id, *usernames) -> None:
+        self._cache.delete(("id", user_id))
+        for username in usernames:
+            self._cache.delete(("username", username))
+
+    def stats(self):
+        return {"enabled": self.enabled, **self._cache.stats()}
+
+
+_cache = ProfileCache()
+
+
+def init_profile_cache(app) -> None:
+    """Configures the profile cache from the Flask app config."""
+    global _cache
+    _cache = ProfileCache(
+        enabled=app.config.get("PROFILE_CACHE_ENABLED", True),
+        ttl=app.config.get("PROFILE_CACHE_TTL", DEFAULT_TTL),
+        max_entries=app.config.get("PROFILE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+    )
+    logger.debug(f"Profile cache enabled: {_cache.enabled}")
+
+
+def get_profile_cache():
+    return _cache
@@ -0,0 +1,139 @@
+# app/service/refresh_tokens.py
+
+import datetime
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+
+from app.models import RefreshToken, User
+from app.utils.exceptions import AuthenticationError
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL", str(30 * 24 * 3600)))
+DEFAULT_PRUNE_BATCH_SIZE = 1000
+
+
+def _utcnow():
+    # Columns are naive UTC, matching User.created_at
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+
+def _hash_secret(secret):
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(db, user_id, family_id=None):
+    """Add a new refresh token for the user and return its opaque value.
+
+    Tokens look like ``<lookup>.<secret>``. Only the lookup prefix and a
+    SHA-256 of the secret are stored. The secret is 256 bits of randomness,
+    so a fast hash is enough and no password-style stretching is needed.
+    The caller commits.
+    """
+    lookup = secrets.token_urlsafe(12)
+    secret = secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            lookup=lookup,
+            token_hash=_hash_secret(secret),
+            family_id=family_id or secrets.token_hex(16),
+            expires_at=_utcnow() + datetime.timedelta(seconds=REFRESH_TOKEN_TTL),
+        )
+    )
+    return f"{lookup}.{secret}"
+
+
+def rotate_refresh_token(db, token):
+    """Exchange a refresh token for a new one in the same family.
+
+    Returns ``(user_id, token_version, new_token)``. Presenting a token that
+    was already rotated means it leaked, so the whole family is revoked. The
+    caller commits.
+    """
+    lookup, _, secret = (token or "").partition(".")
+    if not lookup or not secret:
+        raise AuthenticationError("Invalid refresh token")
+
+    row = (
+        db.query(RefreshToken, User.is_active, User.token_version)
+        .join(User, User.id == RefreshToken.user_id)
+        .filter(RefreshToken.lookup == lookup)
+        .first()
+    )
+    if row is None:
+        raise AuthenticationError("Invalid refresh token")
+    refresh_token, is_active, token_version = row
+
+    if not hmac.compare_digest(refresh_token.token_hash, _hash_secret(secret)):
+        raise AuthenticationError("Invalid refresh token")
+
+    now = _utcnow()
+    if refresh_token.expires_at <= now or not is_active:
+        raise AuthenticationError("Invalid refresh token")
+
+    # The conditional update makes rotation atomic: of two concurrent
+    # refreshes with the same token only one sees a live row
+    rotated = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.id == refresh_token.id, RefreshToken.revoked_at.is_(None))
+        .update({"revoked_at": now}, synchronize_session=False)
+    )
+    if rotated != 1:
+        logger.warning(
+            f"Refresh token reuse detected, revoking family {refresh_token.family_id}"
+        )
+        revoke_refresh_token_family(db, refresh_token.family_id)
+        db.commit()
+        raise AuthenticationError("Invalid refresh token")
+
+    new_token = issue_refresh_token(
+        db, refresh_token.user_id, family_id=refresh_token.family_id
+    )
+    return refresh_token.user_id, token_version, new_token
+
+
+def prune_refresh_tokens(db, batch_size=DEFAULT_PRUNE_BATCH_SIZE):
+    """Delete expired refresh tokens, ``batch_size`` rows per transaction.
+
+    An expired token is rejected before reuse detection runs, so rotated
+    and revoked rows can go as soon as they expire. Returns the number of
+    rows deleted.
+    """
+    now = _utcnow()
+    deleted = 0
+    while True:
+        ids = (
+            db.query(RefreshToken.id)
+            .filter(RefreshToken.expires_at <= now)
+            .limit(batch_size)
+            .all()
+        )
+        if not ids:
+            break
+        deleted += (
+            db.query(RefreshToken)
+            .filter(RefreshToken.id.in_([row.id for row in ids]))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if len(ids) < batch_size:
+            break
+    logger.info(f"Pruned {deleted} expired refresh tokens")
+    return deleted
+
+
+def revoke_refresh_token_family(db, family_id) -> None:
+    db.query(RefreshToken).filter(
+        RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": _utcnow()}, synchronize_session=False)
+
+
+def revoke_user_refresh_tokens(db, user_id) -> None:
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": _utcnow()}, synchronize_session=False)
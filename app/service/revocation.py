@@ -0,0 +1,204 @@
+# app/service/revocation.py
+
+import datetime
+import logging
+import threading
+import time
+
+from app.models import RevokedToken
+from app.utils.bloom import BloomFilter
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 5
+DEFAULT_BLOOM_CAPACITY = 10000
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+
+# Re-read a little before the watermark so rows committed slightly out of
+# order are not missed; adding a jti twice is harmless
+_WATERMARK_OVERLAP = datetime.timedelta(seconds=5)
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+
+class RevocationList:
+    """Per-worker copy of the revoked-token denylist.
+
+    Lookups never touch the database: a Bloom filter answers the common
+    "not revoked" case, and an exact dict of jti -> expiry settles the rare
+    "maybe". At most once per ``refresh_interval`` seconds one request pulls
+    rows revoked since the last watermark, so a logout on another worker is
+    seen within that interval. Entries are dropped once their token expires.
+    """
+
+    def __init__(
+        self,
+        loader=None,
+        refresh_interval=DEFAULT_REFRESH_INTERVAL,
+        bloom_capacity=DEFAULT_BLOOM_CAPACITY,
+        bloom_error_rate=DEFAULT_BLOOM_ERROR_RATE,
+    ) -> None:
+        self._loader = loader
+        self._refresh_interval = refresh_interval
+        self._bloom_capacity = bloom_capacity
+        self._bloom_error_rate = bloom_error_rate
+        self._bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self._revoked = {}
+        # Guards _revoked and _bloom; a jti added while the filter is
+        # rebuilt must not be lost when the new filter replaces the old one
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._watermark = None
+        self._last_refresh = None
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    def add(self, jti, expires_at) -> None:
+        with self._lock:
+            self._add(jti, expires_at)
+
+    def _add(self, jti, expires_at) -> None:
+        # Caller holds self._lock
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self._maybe_refresh()
+        if jti not in self._bloom:
+            return False
+        return jti in self._revoked
+
+    def _maybe_refresh(self) -> None:
+        if self._loader is None:
+            return
+        now = time.monotonic()
+        if (
+            self._last_refresh is not None
+            and now - self._last_refresh < self._refresh_interval
+        ):
+            return
+        # One thread refreshes; the others keep answering from the current set
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_refresh = now
+            self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self) -> None:
+        since = (
+            None if self._watermark is None else self._watermark - _WATERMARK_OVERLAP
+        )
+        try:
+            rows = self._loader(since)
+        except Exception as e:
+            self._refresh_failures += 1
+            logger.error(f"Failed to refresh revoked tokens: {e}")
+            return
+
+        with self._lock:
+            for jti, expires_at, revoked_at in rows:
+                self._add(jti, expires_at)
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+            if self._watermark is None:
+                self._watermark = _utcnow()
+            self._prune()
+        self._refreshes += 1
+
+    def _prune(self) -> None:
+        # Caller holds self._lock
+        now = _utcnow()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            self._revoked.pop(jti, None)
+        if expired or len(self._bloom) > self._bloom.capacity:
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        # Caller holds self._lock
+        jtis = list(self._revoked)
+        bloom = BloomFilter(
+            max(self._bloom_capacity, 2 * len(jtis)), self._bloom_error_rate
+        )
+        for jti in jtis:
+            bloom.add(jti)
+        self._bloom = bloom
+        logger.debug(f"Rebuilt revocation filter with {len(jtis)} entries")
+
+    def stats(self):
+        return {
+            "size": len(self._revoked),
+            "refreshes": self._refreshes,
+            "refresh_failures": self._refresh_failures,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "bloom": self._bloom.stats(),
+        }
+
+
+def _load_revocations(since):
+    """Fetch denylist rows revoked since ``since`` (all live rows if None).
+
+    Runs on the current request's session, which the request closes.
+    """
+    query = RevokedToken.query.with_entities(
+        RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at
+    )
+    if since is None:
+        query = query.filter(RevokedToken.expires_at > _utcnow())
+    else:
+        query = query.filter(RevokedToken.revoked_at >= since)
+    return query.all()
+
+
+# Until init_revocation runs only tokens revoked by this worker are known
+_revocations = RevocationList()
+
+
+def init_revocation(app) -> None:
+    """Configures the revocation list from the Flask app config."""
+    global _revocations
+    refresh_interval = app.config.get(
+        "REVOCATION_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL
+    )
+    _revocations = RevocationList(
+        loader=_load_revocations,
+        refresh_interval=refresh_interval,
+        bloom_capacity=app.config.get(
+            "REVOCATION_BLOOM_CAPACITY", DEFAULT_BLOOM_CAPACITY
+        ),
+        bloom_error_rate=app.config.get(
+            "REVOCATION_BLOOM_ERROR_RATE", DEFAULT_BLOOM_ERROR_RATE
+        ),
+    )
+    logger.debug(f"Revocation list refreshes every {refresh_interval}s")
+
+
+def get_revocation_list():
+    return _revocations
+
+
+def revoke_token(db, claims):
+    """Add a token to the denylist and drop rows that have expired.
+
+    Returns the expiry stored for the token. The caller commits and then
+    adds the jti to this worker's list.
+    """
+    expires_at = datetime.datetime.fromtimestamp(claims["exp"], datetime.UTC).replace(
+        tzinfo=None
+    )
+    db.query(RevokedToken).filter(RevokedToken.expires_at <= _utcnow()).delete(
+        synchronize_session=False
+    )
+    db.add(
+        RevokedToken(
+            jti=claims["jti"], user_id=claims["user_id"], expires_at=expires_at
+        )
+    )
+    return expires_at
@@ -0,0 +1,91 @@
+# app/service/token_versions.py
+
+import logging
+
+from app.models import User
+from app.utils.cache import TTLCache
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 5
+DEFAULT_MAX_ENTRIES = 100000
+
+
+class TokenVersionCache:
+    """Per-worker map of user id -> current ``token_version``.
+
+    Tokens carry the version they were issued under in the ``ver`` claim and
+    are rejected once the user's version has moved past it. Versions are
+    re-read at most once per ``ttl`` seconds per user, so a bump made by
+    another worker takes effect within that window.
+    """
+
+    def __init__(
+        self, loader=None, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self._loader = loader
+        self._cache = TTLCache(max_size=max_entries, ttl=ttl)
+        self._load_failures = 0
+
+    def current(self, user_id):
+        """Return the user's token version, or None if it is not known."""
+        version = self._cache.get(user_id)
+        if version is not None or self._loader is None:
+            return version
+        try:
+            version = self._loader(user_id)
+        except Exception as e:
+            self._load_failures += 1
+            logger.error(f"Failed to load token version: {e}")
+            return None
+        if version is not None:
+            self._cache.set(user_id, version)
+        return version
+
+    def is_stale(self, claims):
+        current = self.current(claims["user_id"])
+        return current is not None and claims.get("ver", 0) < current
+
+    def invalidate(self, user_id) -> None:
+        self._cache.delete(user_id)
+
+    def stats(self):
+        return {**self._cache.stats(), "load_failures": self._load_failures}
+
+
+def _load_token_version(user_id):
+    # Runs on the current request's session, which the request closes
+    return User.query.with_entities(User.token_version).filter_by(id=user_id).scalar()
+
+
+# Until init_token_versions runs no versions are loaded and nothing is stale
+_versions = TokenVersionCache()
+
+
+def init_token_versions(app) -> None:
+    """Configures the token version cache from the Flask app config."""
+    global _versions
+    ttl = app.config.get("TOKEN_VERSION_CACHE_TTL", DEFAULT_TTL)
+    _versions = TokenVersionCache(
+        loader=_load_token_version,
+        ttl=ttl,
+        max_entries=app.config.get(
+            "TOKEN_VERSION_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES
+        ),
+    )
+    logger.debug(f"Token versions are re-read every {ttl}s")
+
+
+def get_token_versions():
+    return _versions
+
+
+def bump_token_version(db, user_id) -> None:
+    """Invalidate every token issued to the user with a single UPDATE.
+
+    The caller commits and then calls ``get_token_versions().invalidate``.
+    """
+    db.query(User).filter(User.id == user_id).update(
+        {User.token_version: User.token_version + 1}, synchronize_session=False
+    )
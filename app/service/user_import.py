@@ -0,0 +1,260 @@
+# app/service/user_import.py
+
+import csv
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from marshmallow import ValidationError as MarshmallowValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.models import User
+from app.schemas.auth_schemas import RegisterSchema
+from app.service.hashing import hash_passwords
+from app.service.username_filter import get_username_filter
+from app.utils.exceptions import ServiceUnavailableError
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+FORMATS = ("csv", "ndjson")
+
+_FIELDS = ("email", "password", "first_name", "last_name", "username")
+_IN_USE = {"message": "Email or username is already in use"}
+
+
+def read_rows(stream, fmt):
+    """Yield ``(row_number, row)`` from a CSV or NDJSON text stream.
+
+    Rows are numbered from 1 in file order; blank NDJSON lines do not count.
+    A row that cannot be parsed into an object is yielded as None.
+    """
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(stream), start=1):
+            yield row_number, row
+        return
+    if fmt != "ndjson":
+        raise ValueError(f"Unsupported import format: {fmt}")
+    row_number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row_number, row if isinstance(row, dict) else None
+
+
+class ImportCheckpoint:
+    """Remembers the last row number whose batch was committed."""
+
+    def __init__(self, path) -> None:
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return int(json.load(f)["committed_through"])
+        except FileNotFoundError:
+            return 0
+
+    def save(self, row_number) -> None:
+        # Write then rename, so a crash never leaves a torn checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"committed_through": row_number}, f)
+        os.replace(tmp_path, self.path)
+
+
+def import_users(
+    rows,
+    db,
+    batch_size=DEFAULT_BATCH_SIZE,
+    resume_after=0,
+    checkpoint=None,
+    hash_workers=None,
+    shared_pool=False,
+):
+    """Create users from ``rows`` and yield progress events as they happen.
+
+    Rows are validated with ``RegisterSchema``. Valid rows are hashed in
+    parallel and inserted ``batch_size`` at a time with one executemany and
+    one commit per batch. Events are dicts:
+
+    - ``{"row": n, "error": ...}`` for every rejected row
+    - ``{"committed_through": n, "imported": k}`` after each batch commits
+    - a final ``{"done": True, ...}`` summary
+
+    Rows up to ``resume_after`` are skipped, so an interrupted import can be
+    restarted from its last ``committed_through``. A database error ends the
+    import with an ``{"error": ...}`` event; committed batches are kept.
+
+    Passwords are hashed on a private pool of ``hash_workers`` threads (one
+    per CPU by default), which suits the CLI. With ``shared_pool`` they go
+    one at a time through the request hashing pool instead, so an import
+    running inside a web worker is subject to its backpressure.
+    """
+    importer = _UserImporter(db, batch_size, checkpoint, hash_workers, shared_pool)
+    try:
+        yield from importer.run(rows, resume_after)
+    finally:
+        importer.close()
+
+
+class _UserImporter:
+    def __init__(self, db, batch_size, checkpoint, hash_workers, shared_pool) -> None:
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        self.checkpoint = checkpoint
+        self.executor = None
+        if not shared_pool:
+            self.executor = ThreadPoolExecutor(
+                max_workers=hash_workers or os.cpu_count() or 1,
+                thread_name_prefix="user-import",
+            )
+        self.schema = RegisterSchema()
+        self.committed_through = 0
+        self.imported = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def run(self, rows, resume_after):
+        self.committed_through = resume_after
+        batch = []
+        last_row = resume_after
+        try:
+            for row_number, row in rows:
+                if row_number <= resume_after:
+                    self.skipped += 1
+                    continue
+                last_row = row_number
+                data, errors = self._validate(row)
+                if errors:
+                    yield self._reject(row_number, errors)
+                    continue
+                batch.append((row_number, data))
+                if len(batch) >= self.batch_size:
+                    yield from self._flush(batch, last_row)
+                    batch = []
+            yield from self._flush(batch, last_row)
+        except SQLAlchemyError as db_err:
+            logger.error(f"Database error during user import: {db_err}", exc_info=True)
+            self.db.rollback()
+            yield {
+                "error": "Database error occurred",
+                "committed_through": self.committed_through,
+            }
+            return
+        except ServiceUnavailableError:
+            logger.error("Username filter unavailable during user import")
+            yield {
+                "error": "Service temporarily unavailable",
+                "committed_through": self.committed_through,
+            }
+            return
+
+        logger.info(
+            f"User import finished: {self.imported} imported, {self.failed} failed"
+        )
+        yield {
+            "done": True,
+            "imported": self.imported,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "committed_through": self.committed_through,
+        }
+
+    def _validate(self, row):
+        if row is None:
+            return None, {"message": "Malformed row"}
+        try:
+            return self.schema.load({field: row.get(field) for field in _FIELDS}), None
+        except MarshmallowValidationError as ve:
+            return None, ve.messages
+
+    def _reject(self, row_number, errors):
+        self.failed += 1
+        return {"row": row_number, "error": errors}
+
+    def _flush(self, batch, last_row):
+        accepted = []
+        for row_number, data, errors in self._check_conflicts(batch):
+            if errors:
+                yield self._reject(row_number, errors)
+            else:
+                accepted.append((row_number, data))
+
+        hashes = hash_passwords(
+            [data["password"] for _, data in accepted], self.executor
+        )
+        values = [
+            {**{field: data[field] for field in _FIELDS}, "password": hashed}
+            for (_, data), hashed in zip(accepted, hashes)
+        ]
+        if values:
+            # Before the insert commits, so no worker's username filter
+            # turns the new names away
+            username_filter = get_username_filter()
+            for value in values:
+                username_filter.announce(value["username"])
+            try:
+                self.db.execute(insert(User), values)
+                self.db.commit()
+                inserted = values
+            except IntegrityError:
+                # Lost a race with another writer; find the offending rows
+                self.db.rollback()
+                inserted = []
+                for (row_number, _), value in zip(accepted, values):
+                    if self._insert_one(value):
+                        inserted.append(value)
+                    else:
+                        yield self._reject(row_number, _IN_USE)
+
+            self.imported += len(inserted)
+
+        if last_row > self.committed_through:
+            self.committed_through = last_row
+            if self.checkpoint is not None:
+                self.checkpoint.save(last_row)
+            yield {"committed_through": last_row, "imported": self.imported}
+
+    def _check_conflicts(self, batch):
+        """Flag rows whose email or username is taken or repeated in the batch."""
+        if not batch:
+            return
+        emails = [data["email"] for _, data in batch]
+        usernames = [data["username"] for _, data in batch]
+        taken = set()
+        for email, username in self.db.execute(
+            select(User.email, User.username).where(
+                or_(User.email.in_(emails), User.username.in_(usernames))
+            )
+        ):
+            taken.update((("email", email), ("username", username)))
+
+        for row_number, data in batch:
+            keys = {("email", data["email"]), ("username", data["username"])}
+            if keys & taken:
+                yield row_number, data, _IN_USE
+            else:
+                taken |= keys
+                yield row_number, data, None
+
+    def _insert_one(self, value):
+        try:
+            self.db.execute(insert(User), [value])
+            self.db.commit()
+            return True
+        except IntegrityError:
+            self.db.rollback()
+            return False
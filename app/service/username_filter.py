@@ -0,0 +1,220 @@
+# app/service/username_filter.py
+
+import logging
+import time
+
+from app.models import User
+from app.utils.background import daemon_thread
+from app.utils.bloom import BloomFilter
+from app.utils.cache_backends import create_backend
+from app.utils.exceptions import ServiceUnavailableError
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_REBUILD_INTERVAL = 300
+DEFAULT_CAPACITY = 100000
+DEFAULT_ERROR_RATE = 0.01
+
+# Set for every username registered or renamed to, before the change
+# commits, so workers whose filter predates it still look the name up
+_RECENT_PREFIX = "username_filter:recent:"
+# A recent marker outlives this many rebuild intervals, and a filter is only
+# trusted for one interval less; the difference covers a slow transaction
+# that announced its name shortly before a rebuild started
+_RECENT_INTERVALS = 3
+_TRUSTED_INTERVALS = 2
+
+
+class UsernameFilter:
+    """Per-worker Bloom filter that turns away logins for unknown usernames.
+
+    A background thread rebuilds the filter from the users table every
+    ``rebuild_interval`` seconds. Names registered or renamed to since are
+    not in it, so ``announce`` records each one in the ``shared`` cache tier
+    before the change commits, and the marker outlives the next rebuild. A
+    name missing from the filter is rejected without a query only if it has
+    no such marker and the filter was rebuilt recently enough for every
+    newer name to still have one. In any other case, including before the
+    first load, without a shared tier or when it fails, the name is let
+    through to the database.
+    """
+
+    def __init__(
+        self,
+        loader=None,
+        shared=None,
+        rebuild_interval=DEFAULT_REBUILD_INTERVAL,
+        capacity=DEFAULT_CAPACITY,
+        error_rate=DEFAULT_ERROR_RATE,
+    ) -> None:
+        self._loader = loader
+        self._shared = shared
+        self._rebuild_interval = rebuild_interval
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._bloom = None
+        self._loaded_at = None
+        self._thread = daemon_thread(self._run, "username-filter")
+        self._rebuilds = 0
+        self._load_failures = 0
+        self._rejected = 0
+        self._passed = 0
+        self._false_positives = 0
+        self._shared_errors = 0
+
+    @property
+    def enabled(self):
+        return self._loader is not None
+
+    def might_exist(self, username):
+        """Return False only for a name known not to exist; never queries."""
+        if not self.enabled:
+            return True
+        self._thread.get()
+        bloom, loaded_at = self._bloom, self._loaded_at
+        if bloom is None or username in bloom:
+            return True
+        if self._shared is None or (
+            time.monotonic() - loaded_at >= _TRUSTED_INTERVALS * self._rebuild_interval
+        ):
+            self._passed += 1
+            return True
+        try:
+            recent = self._shared.get(_RECENT_PREFIX + username)
+        except Exception as e:
+            self._shared_error("read", e)
+            self._passed += 1
+            return True
+        if recent is not None:
+            self._passed += 1
+            return True
+        self._rejected += 1
+        return False
+
+    def announce(self, username) -> None:
+        """Record a name about to be registered or renamed to.
+
+        Call it before committing. Raises ServiceUnavailableError when the
+        shared tier cannot record it, since other workers would then reject
+        the name until their next rebuild.
+        """
+        if not self.enabled:
+            return
+        if self._shared is not None:
+            try:
+                self._shared.set(
+                    _RECENT_PREFIX + username,
+                    b"1",
+                    _RECENT_INTERVALS * self._rebuild_interval,
+                )
+            except Exception as e:
+                self._shared_error("announce", e)
+                raise ServiceUnavailableError()
+        self.add(username)
+
+    def add(self, username) -> None:
+        bloom = self._bloom
+        if bloom is not None:
+            bloom.add(username)
+
+    def record_missing(self, username) -> None:
+        """Count a name the filter let through that has no user."""
+        bloom = self._bloom
+        if bloom is not None and username in bloom:
+            self._false_positives += 1
+
+    def _run(self) -> None:
+        while True:
+            self._rebuild()
+            time.sleep(self._rebuild_interval)
+
+    def _rebuild(self) -> None:
+        # Taken before the query, so names committed while it runs are
+        # covered by their recent markers
+        started = time.monotonic()
+        usernames = []
+        try:
+            self._loader(usernames.append)
+        except Exception as e:
+            self._load_failures += 1
+            logger.error(f"Failed to rebuild username filter: {e}")
+            return
+        bloom = BloomFilter(max(self._capacity, 2 * len(usernames)), self._error_rate)
+        for username in usernames:
+            bloom.add(username)
+        self._bloom, self._loaded_at = bloom, started
+        self._rebuilds += 1
+        logger.debug(f"Rebuilt username filter with {len(usernames)} entries")
+
+    def _shared_error(self, operation, error) -> None:
+        self._shared_errors += 1
+        logger.warning(f"Shared username filter {operation} failed: {error}")
+
+    def stats(self):
+        loaded_at = self._loaded_at
+        return {
+            "enabled": self.enabled,
+            "backend": self._shared.name if self._shared is not None else None,
+            "rejected": self._rejected,
+            "passed": self._passed,
+            "false_positives": self._false_positives,
+            "rebuilds": self._rebuilds,
+            "load_failures": self._load_failures,
+            "shared_errors": self._shared_errors,
+            "age_seconds": (
+                round(time.monotonic() - loaded_at, 3)
+                if loaded_at is not None
+                else None
+            ),
+            "bloom": self._bloom.stats() if self._bloom is not None else None,
+        }
+
+
+def _username_loader(app):
+    """Return a loader passing every username to ``add``.
+
+    It runs on the filter's own thread, so it opens an app context and
+    streams the rows before the context, and its session, are torn down.
+    """
+
+    def load(add):
+        with app.app_context():
+            for (username,) in User.query.with_entities(User.username).yield_per(10000):
+                add(username)
+
+    return load
+
+
+# Until init_username_filter runs every name is let through
+_filter = UsernameFilter()
+
+
+def init_username_filter(app) -> None:
+    """Configures the username filter from the Flask app config."""
+    global _filter
+    enabled = app.config.get("USERNAME_FILTER_ENABLED", False)
+    shared = None
+    if enabled:
+        shared = create_backend(
+            app.config.get("USERNAME_FILTER_BACKEND"),
+            url=app.config.get("USERNAME_FILTER_URL"),
+            cache_name=app.config.get("USERNAME_FILTER_UWSGI_NAME"),
+        )
+    _filter = UsernameFilter(
+        loader=_username_loader(app) if enabled else None,
+        shared=shared,
+        rebuild_interval=app.config.get(
+            "USERNAME_FILTER_REBUILD_INTERVAL", DEFAULT_REBUILD_INTERVAL
+        ),
+        capacity=app.config.get("USERNAME_FILTER_CAPACITY", DEFAULT_CAPACITY),
+        error_rate=app.config.get("USERNAME_FILTER_ERROR_RATE", DEFAULT_ERROR_RATE),
+    )
+    logger.debug(
+        f"Username filter enabled: {enabled}, "
+        f"shared backend: {shared.name if shared else None}"
+    )
+
+
+def get_username_filter():
+    return _filter
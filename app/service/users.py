@@ -0,0 +1,185 @@
+# app/service/users.py
+
+import base64
+import datetime
+import json
+import logging
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import load_only
+
+from app.database import use_replica
+from app.models import User
+from app.schemas.auth_schemas import BatchGetUsersSchema, ListUsersSchema
+from app.service.profile_cache import get_profile_cache
+from app.utils.exceptions import ValidationError
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+# The public user fields, as returned by User.to_dict
+USER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "created_at",
+    "last_login_at",
+)
+
+
+def _encode_cursor(created_at, user_id):
+    raw = json.dumps([created_at.isoformat(), user_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(created_at), int(user_id)
+    except (ValueError, TypeError):
+        raise ValidationError({"cursor": ["Invalid cursor."]})
+
+
+def _parse_fields(field_names):
+    if not field_names:
+        return USER_FIELDS
+    requested = tuple(name.strip() for name in field_names.split(",") if name.strip())
+    unknown = [name for name in requested if name not in USER_FIELDS]
+    if unknown or not requested:
+        raise ValidationError({"fields": [f"Unknown fields: {', '.join(unknown)}"]})
+    return requested
+
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime.datetime) else value
+
+
+def list_users(params, db=None):
+    """Return one page of users ordered by ``(created_at, id)``.
+
+    Pages are addressed by an opaque cursor holding the last row's sort key,
+    so each page is an index range scan on ix_users_created_at_id (or
+    ix_users_is_active_created_at_id when filtering on is_active) and costs
+    the same however deep it is. Prefix filters compile to ``LIKE 'p%'`` and
+    use the username and email indexes.
+    """
+    data = ListUsersSchema().load(params)
+    field_names = _parse_fields(data["field_names"])
+    limit = data["limit"]
+
+    logger.info("List users request")
+    logger.debug(f"List users params: {data}")
+
+    columns = [User.__table__.c[name] for name in field_names]
+    query = select(User.created_at, User.id, *columns)
+    if data["is_active"] is not None:
+        query = query.where(User.is_active == data["is_active"])
+    if data["username_prefix"]:
+        query = query.where(
+            User.username.startswith(data["username_prefix"], autoescape=True)
+        )
+    if data["email_prefix"]:
+        query = query.where(
+            User.email.startswith(data["email_prefix"], autoescape=True)
+        )
+    if data["cursor"]:
+        created_at, user_id = _decode_cursor(data["cursor"])
+        # Spelled out rather than as a row comparison so every engine seeks
+        # the index on created_at; only rows tied on it are filtered by id
+        query = query.where(
+            and_(
+                User.created_at >= created_at,
+                or_(User.created_at > created_at, User.id > user_id),
+            )
+        )
+    # One extra row tells whether another page exists
+    query = query.order_by(User.created_at, User.id).limit(limit + 1)
+
+    with use_replica(db):
+        rows = db.execute(query).all()
+
+    page = rows[:limit]
+    users = [
+        {name: _serialize(value) for name, value in zip(field_names, row[2:])}
+        for row in page
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        created_at, user_id = page[-1][:2]
+        next_cursor = _encode_cursor(created_at, user_id)
+    return {"users": users, "next_cursor": next_cursor}, 200
+
+
+def _fetch_profiles(db, ids, usernames):
+    """Load the public fields of users matching any of ``ids`` or ``usernames``."""
+    query = select(User).options(
+        load_only(*(getattr(User, name) for name in USER_FIELDS))
+    )
+    conditions = []
+    if ids:
+        conditions.append(User.id.in_(ids))
+    if usernames:
+        conditions.append(User.username.in_(usernames))
+    with use_replica(db):
+        users = db.scalars(query.where(or_(*conditions))).all()
+    return [user.to_dict() for user in users]
+
+
+def _unique_profiles(profiles):
+    """Drop missing and repeated profiles, keeping the first occurrence."""
+    results = []
+    seen = set()
+    for profile in profiles:
+        if profile is not None and profile["id"] not in seen:
+            seen.add(profile["id"])
+            results.append(profile)
+    return results
+
+
+def batch_get_users(ids=None, usernames=None, db=None):
+    """Resolve up to 100 user ids and usernames to profiles at once.
+
+    Profiles come from the per-worker profile cache where possible; all
+    misses are fetched with a single ``IN`` query. Users are returned in
+    request order without duplicates, and keys with no user are listed
+    under ``not_found``.
+    """
+    data = BatchGetUsersSchema().load({"ids": ids or [], "usernames": usernames or []})
+    ids, usernames = data["ids"], data["usernames"]
+    logger.info(f"Batch get for {len(ids)} ids and {len(usernames)} usernames")
+
+    cache = get_profile_cache()
+    by_id = {}
+    by_username = {}
+    for user_id in ids:
+        profile = cache.get_by_id(user_id)
+        if profile is not None:
+            by_id[user_id] = profile
+    for username in usernames:
+        profile = cache.get_by_username(username)
+        if profile is not None:
+            by_username[username] = profile
+
+    missing_ids = {user_id for user_id in ids if user_id not in by_id}
+    missing_usernames = {name for name in usernames if name not in by_username}
+    if missing_ids or missing_usernames:
+        for profile in _fetch_profiles(db, missing_ids, missing_usernames):
+            cache.store(profile)
+            by_id[profile["id"]] = profile
+            by_username[profile["username"]] = profile
+
+    results = _unique_profiles(
+        [by_id.get(user_id) for user_id in ids]
+        + [by_username.get(username) for username in usernames]
+    )
+    return {
+        "users": results,
+        "not_found": {
+            "ids": [user_id for user_id in ids if user_id not in by_id],
+            "usernames": [name for name in usernames if name not in by_username],
+        },
+    }, 200
@@ -0,0 +1,32 @@
+# app/utils/admin.py
+
+import functools
+import hmac
+import logging
+
+from flask import current_app, jsonify, request
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+
+def admin_required(view):
+    """Allow the view only for requests carrying the admin API token.
+
+    The token is sent in the ``X-Admin-Token`` header and compared with
+    ``ADMIN_API_TOKEN``. Without a configured token the admin routes are off.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = current_app.config.get("ADMIN_API_TOKEN")
+        if not expected:
+            logger.warning("Admin request while the admin API is disabled")
+            return jsonify({"error": "Admin API is disabled"}), 403
+        provided = request.headers.get("X-Admin-Token", "")
+        if not hmac.compare_digest(provided.encode("utf-8"), expected.encode("utf-8")):
+            logger.warning("Admin request with an invalid token")
+            return jsonify({"error": "Invalid admin token"}), 401
+        return view(*args, **kwargs)
+
+    return wrapper
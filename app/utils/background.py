@@ -0,0 +1,56 @@
+# app/utils/background.py
+
+import os
+import threading
+
+
+class PerProcess:
+    """Lazily builds a value once per process with ``factory``.
+
+    uWSGI forks workers after the app is loaded, and neither threads nor
+    executors survive a fork, so each worker builds its own on first use.
+    """
+
+    def __init__(self, factory) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._pid = None
+        self._value = None
+
+    def get(self):
+        """Return this process's value, building it on the first call."""
+        if self._pid == os.getpid():
+            return self._value
+        with self._lock:
+            if self._pid != os.getpid():
+                self._value = self._factory()
+                self._pid = os.getpid()
+            return self._value
+
+    def pop(self):
+        """Forget the value; return it if this process built it, else None."""
+        with self._lock:
+            value = self._value if self._pid == os.getpid() else None
+            self._value = None
+            self._pid = None
+            return value
+
+
+def start_daemon_thread(target, name):
+    thread = threading.Thread(target=target, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+def daemon_thread(target, name, setup=None):
+    """Return a PerProcess whose ``get`` runs ``target`` on a daemon thread.
+
+    ``setup``, if given, runs in each process just before its thread starts.
+    """
+
+    def start():
+        if setup is not None:
+            setup()
+        return start_daemon_thread(target, name)
+
+    return PerProcess(start)
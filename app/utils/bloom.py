@@ -0,0 +1,60 @@
+# app/utils/bloom.py
+
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Membership answers are either "definitely not present" or "possibly
+    present"; the false positive rate stays near ``error_rate`` while at most
+    ``capacity`` items have been added. Items cannot be removed, so owners
+    rebuild the filter when its contents shrink or outgrow the capacity.
+    """
+
+    def __init__(self, capacity=10000, error_rate=0.01) -> None:
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8,
+            int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)),
+        )
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, item):
+        # Kirsch-Mitzenmacher double hashing from a single 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item) -> None:
+        positions = self._positions(item)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self._count += 1
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self):
+        """Number of ``add`` calls, an upper bound on distinct items."""
+        return self._count
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "items": self._count,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+        }
@@ -0,0 +1,123 @@
+# app/utils/cache_backends.py
+
+import threading
+import time
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - exercised only without redis-py
+    redis = None
+
+try:
+    import uwsgi
+except ImportError:  # pragma: no cover - only importable inside uWSGI
+    uwsgi = None
+
+
+class CacheBackend:
+    """Byte-valued key/value store shared by more than one worker.
+
+    Backends only move bytes; callers own serialization. Every method may
+    raise on transport errors, and callers are expected to treat a failure
+    as a miss rather than fail the request.
+    """
+
+    name = None
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl) -> None:
+        raise NotImplementedError
+
+    def delete(self, key) -> None:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """In-process stand-in for a shared cache, used by tests and local runs."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class UWSGICacheBackend(CacheBackend):
+    """uWSGI caching framework, shared by every worker on one node.
+
+    The named cache must be declared with ``cache2`` in uwsgi.ini; it lives
+    in the master process, so entries survive worker reloads.
+    """
+
+    name = "uwsgi"
+
+    def __init__(self, cache_name) -> None:
+        if uwsgi is None:
+            raise RuntimeError("The uWSGI cache is only available under uWSGI")
+        self.cache_name = cache_name
+
+    def get(self, key):
+        return uwsgi.cache_get(key, self.cache_name)
+
+    def set(self, key, value, ttl) -> None:
+        uwsgi.cache_update(key, value, int(ttl), self.cache_name)
+
+    def delete(self, key) -> None:
+        uwsgi.cache_del(key, self.cache_name)
+
+
+class RedisBackend(CacheBackend):
+    """Redis (or any server speaking its protocol), shared across nodes."""
+
+    name = "redis"
+
+    def __init__(self, url, timeout=0.05) -> None:
+        if redis is None:
+            raise RuntimeError("redis is not installed")
+        # Short timeouts: a slow cache must cost less than the query it saves
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=timeout, socket_connect_timeout=timeout
+        )
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value, ttl) -> None:
+        self._client.set(key, value, ex=max(1, int(ttl)))
+
+    def delete(self, key) -> None:
+        self._client.delete(key)
+
+
+def create_backend(name, url=None, cache_name=None, timeout=0.05):
+    """Build the backend configured by ``name``, or None when it is empty."""
+    if not name:
+        return None
+    if name == MemoryBackend.name:
+        return MemoryBackend()
+    if name == UWSGICacheBackend.name:
+        return UWSGICacheBackend(cache_name)
+    if name == RedisBackend.name:
+        return RedisBackend(url, timeout=timeout)
+    raise ValueError(f"Unknown cache backend: {name}")
@@ -0,0 +1,55 @@
+# app/utils/client_auth.py
+
+import functools
+import hmac
+import logging
+
+from flask import current_app, jsonify, request
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+
+def client_credentials_required(setting, realm, feature):
+    """Build a decorator allowing a view only for clients listed in ``setting``.
+
+    Clients send their id and secret with HTTP Basic auth, checked against
+    the ``setting`` dict in the app config. Without configured clients the
+    view is off and answers 403.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            clients = current_app.config.get(setting)
+            if not clients:
+                logger.warning(f"{feature} request while it is disabled")
+                return jsonify({"error": f"{feature} is disabled"}), 403
+            auth = request.authorization
+            expected = (
+                clients.get(auth.username) if auth and auth.type == "basic" else None
+            )
+            provided = (auth.password or "") if expected else ""
+            if not expected or not hmac.compare_digest(
+                provided.encode("utf-8"), expected.encode("utf-8")
+            ):
+                logger.warning(f"{feature} request with invalid client credentials")
+                response = jsonify({"error": "invalid_client"})
+                response.headers["WWW-Authenticate"] = f'Basic realm="{realm}"'
+                return response, 401
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# RFC 7662 requires the introspection endpoint to authenticate its callers
+introspection_client_required = client_credentials_required(
+    "INTROSPECTION_CLIENTS", "introspect", "Introspection"
+)
+
+# Read-only profile lookups for other services, kept apart from the admin API
+user_lookup_client_required = client_credentials_required(
+    "USER_LOOKUP_CLIENTS", "users", "User lookup"
+)
@@ -16,3 +16,11 @@ class AuthorizationError(Exception):
 class DatabaseError(Exception):
     def __init__(self, message="Database operation failed") -> None:
         self.message = message
+
+
+class ServiceUnavailableError(Exception):
+    def __init__(
+        self, message="Service temporarily unavailable", retry_after=1
+    ) -> None:
+        self.message = message
+        self.retry_after = retry_after
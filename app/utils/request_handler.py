@@ -8,6 +8,7 @@ from app.utils.exceptions import (
     AuthenticationError,
     AuthorizationError,
     DatabaseError,
+    ServiceUnavailableError,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,15 @@ def handle_request(service_function, *args, **kwargs):
             f"Authorization error in {service_function.__name__}: {aze.message}"
         )
         return jsonify({"error": aze.message}), 403
+    except ServiceUnavailableError as se:
+        logger.warning(
+            f"Service unavailable in {service_function.__name__}: {se.message}"
+        )
+        return (
+            jsonify({"error": se.message}),
+            503,
+            {"Retry-After": str(se.retry_after)},
+        )
     except DatabaseError as de:
         logger.error(f"Database error in {service_function.__name__}: {de}")
         return jsonify({"error": "Database error occurred"}), 500
@@ -2,6 +2,48 @@
 
 import pytest
 from app import create_app
+from app.service import (
+    auth_record_cache,
+    credential_cache,
+    hashers,
+    hashing,
+    last_login,
+    login_events,
+    profile_cache,
+    revocation,
+    token_versions,
+    username_filter,
+)
+
+# Module-level services that create_app and the tests replace
+_SINGLETONS = (
+    (auth_record_cache, "_cache"),
+    (credential_cache, "_cache"),
+    (hashers, "_hashers"),
+    (hashers, "_preferred"),
+    (hashing, "_pool"),
+    (last_login, "_tracker"),
+    (login_events, "_writer"),
+    (profile_cache, "_cache"),
+    (revocation, "_revocations"),
+    (token_versions, "_versions"),
+    (username_filter, "_filter"),
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_singletons():
+    """Keep the module-level services isolated between tests."""
+    saved = [(module, name, getattr(module, name)) for module, name in _SINGLETONS]
+    yield
+    for module, name, value in saved:
+        setattr(module, name, value)
+
+
+@pytest.fixture
+def no_background_threads(mocker):
+    """Keep services from starting their background threads."""
+    return mocker.patch("app.utils.background.start_daemon_thread")
 
 
 @pytest.fixture
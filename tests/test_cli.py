@@ -0,0 +1,109 @@
+# tests/test_cli.py
+
+import gzip
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def mock_import_users(mocker):
+    mocker.patch(
+        "app.cli.get_db",
+        return_value=MagicMock(__enter__=MagicMock(), __exit__=MagicMock()),
+    )
+    return mocker.patch(
+        "app.cli.import_users",
+        return_value=iter([{"done": True, "imported": 1}]),
+    )
+
+
+def test_users_import_prints_progress(app, tmp_path, mock_import_users) -> None:
+    path = tmp_path / "users.ndjson"
+    path.write_text('{"username": "johndoe"}\n')
+
+    result = app.test_cli_runner().invoke(
+        args=["users", "import", str(path), "--batch-size", "100"]
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {"done": True, "imported": 1}
+    _, kwargs = mock_import_users.call_args
+    assert kwargs["batch_size"] == 100
+    assert kwargs["resume_after"] == 0
+    assert kwargs["checkpoint"].path == f"{path}.checkpoint"
+
+
+def test_users_import_resumes_from_checkpoint(app, tmp_path, mock_import_users) -> None:
+    path = tmp_path / "users.csv"
+    path.write_text("email,password,first_name,last_name,username\n")
+    (tmp_path / "users.csv.checkpoint").write_text('{"committed_through": 42}')
+
+    result = app.test_cli_runner().invoke(args=["users", "import", str(path)])
+
+    assert result.exit_code == 0
+    _, kwargs = mock_import_users.call_args
+    assert kwargs["resume_after"] == 42
+
+
+def test_users_import_requires_known_format(app, tmp_path, mock_import_users) -> None:
+    path = tmp_path / "users.txt"
+    path.write_text("")
+
+    result = app.test_cli_runner().invoke(args=["users", "import", str(path)])
+
+    assert result.exit_code != 0
+    mock_import_users.assert_not_called()
+
+
+def test_users_export_writes_file(app, tmp_path, mocker) -> None:
+    mocker.patch(
+        "app.cli.get_db",
+        return_value=MagicMock(__enter__=MagicMock(), __exit__=MagicMock()),
+    )
+    mocker.patch("app.cli.user_export.export_users", return_value=iter(["a\n", "b\n"]))
+    output = tmp_path / "users.ndjson.gz"
+
+    result = app.test_cli_runner().invoke(
+        args=["users", "export", "--gzip", "--output", str(output)]
+    )
+
+    assert result.exit_code == 0
+    assert gzip.decompress(output.read_bytes()) == b"a\nb\n"
+
+
+def test_login_events_maintain_uses_configured_retention(app, mocker) -> None:
+    mocker.patch(
+        "app.cli.get_db",
+        return_value=MagicMock(__enter__=MagicMock(), __exit__=MagicMock()),
+    )
+    mock_maintain = mocker.patch(
+        "app.cli.maintain_partitions", return_value={"created": [], "dropped": []}
+    )
+    app.config["LOGIN_EVENTS_RETENTION_DAYS"] = 30
+
+    result = app.test_cli_runner().invoke(
+        args=["login-events", "maintain", "--days-ahead", "3"]
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {"created": [], "dropped": []}
+    _, kwargs = mock_maintain.call_args
+    assert kwargs == {"retention_days": 30, "days_ahead": 3}
+
+
+def test_refresh_tokens_prune_reports_deleted_rows(app, mocker) -> None:
+    mocker.patch(
+        "app.cli.get_db",
+        return_value=MagicMock(__enter__=MagicMock(), __exit__=MagicMock()),
+    )
+    mock_prune = mocker.patch("app.cli.prune_refresh_tokens", return_value=12)
+
+    result = app.test_cli_runner().invoke(
+        args=["refresh-tokens", "prune", "--batch-size", "50"]
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {"deleted": 12}
+    assert mock_prune.call_args.kwargs == {"batch_size": 50}
@@ -82,3 +82,184 @@ def test_get_db_exception(mocker):
     mock_logger_error.assert_called_once_with("Database session rollback due to error: Test exception")
     mock_session.rollback.assert_called_once()
     mock_session.close.assert_called_once()
+
+
+def test_timed_queue_pool_records_checkouts():
+    """
+    Test that TimedQueuePool counts checkouts and reports pool occupancy.
+    """
+    # Arrange
+    from sqlalchemy import create_engine
+    from app.database import TimedQueuePool
+
+    engine = create_engine(
+        "sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0
+    )
+
+    # Act
+    with engine.connect():
+        during = engine.pool.stats()
+    after = engine.pool.stats()
+
+    # Assert
+    assert during["checked_out"] == 1
+    assert after["checked_out"] == 0
+    assert after["checkouts"] == 1
+    assert after["timeouts"] == 0
+
+
+def test_init_db_uses_timed_pool_when_sized(mocker):
+    """
+    Test that init_db installs TimedQueuePool when pool sizing is configured.
+    """
+    # Arrange
+    from app.database import TimedQueuePool
+
+    app = MagicMock()
+    app.config = {"SQLALCHEMY_ENGINE_OPTIONS": {"pool_size": 2}}
+    mocker.patch.object(db, 'init_app')
+
+    # Act
+    init_db(app)
+
+    # Assert
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == {
+        "poolclass": TimedQueuePool,
+        "pool_size": 2,
+    }
+
+
+@pytest.fixture
+def routed_db(tmp_path, mocker):
+    """
+    Fixture for a Flask-SQLAlchemy instance with a primary and a replica bind.
+    """
+    from flask import Flask
+    from flask_sqlalchemy import SQLAlchemy
+    from app.database import ReplicaLagMonitor, RoutingSession
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config["SQLALCHEMY_BINDS"] = {"replica": f"sqlite:///{tmp_path / 'replica.db'}"}
+    routed = SQLAlchemy(app, session_options={"class_": RoutingSession})
+    monitor = mocker.patch("app.database._replica_monitor", ReplicaLagMonitor())
+    with app.app_context():
+        yield routed, monitor
+
+
+def test_routing_session_reads_replica_until_write(routed_db):
+    """
+    Test that opted-in reads use the replica until the session writes.
+    """
+    # Arrange
+    import sqlalchemy as sa
+    from app.database import use_replica
+
+    routed, monitor = routed_db
+    session = routed.session
+    primary, replica = routed.engines[None], routed.engines["replica"]
+    insert = sa.insert(sa.table("t", sa.column("x")))
+
+    # Act & Assert
+    assert session.get_bind() is primary
+    with use_replica(session):
+        assert session.get_bind() is replica
+        assert session.get_bind(clause=insert) is primary
+        # Read-your-writes: later reads stay on the primary
+        assert session.get_bind() is primary
+    session.close()
+    with use_replica(session):
+        assert session.get_bind() is replica
+    assert monitor.stats()["replica_reads"] == 2
+
+
+def test_routing_session_tracks_replica_reads(routed_db):
+    """
+    Test that a session remembers the replica served a read until closed.
+    """
+    # Arrange
+    from app.database import read_from_replica, use_replica
+
+    routed, _ = routed_db
+    session = routed.session
+
+    # Act & Assert
+    session.get_bind()
+    assert not read_from_replica(session)
+    with use_replica(session):
+        session.get_bind()
+    assert read_from_replica(session)
+    session.close()
+    assert not read_from_replica(session)
+
+
+def test_routing_session_falls_back_when_replica_lags(routed_db, mocker):
+    """
+    Test that reads go to the primary while the replica is behind.
+    """
+    # Arrange
+    from app.database import use_replica
+
+    routed, monitor = routed_db
+    mocker.patch.object(monitor, "_probe", return_value=10.0)
+
+    # Act
+    with use_replica(routed.session):
+        bind = routed.session.get_bind()
+
+    # Assert
+    assert bind is routed.engines[None]
+    assert monitor.stats()["primary_fallbacks"] == 1
+    assert monitor.stats()["lag_seconds"] == 10.0
+
+
+def test_replica_lag_probe(mocker):
+    """
+    Test the lag probe for MySQL replicas and other dialects.
+    """
+    # Arrange
+    from app.database import ReplicaLagMonitor
+
+    monitor = ReplicaLagMonitor(max_lag=2.0)
+    sqlite_engine = MagicMock()
+    sqlite_engine.dialect.name = "sqlite"
+    mysql_engine = MagicMock()
+    mysql_engine.dialect.name = "mysql"
+    result = mysql_engine.connect.return_value.__enter__.return_value.exec_driver_sql
+    result.return_value.mappings.return_value.first.return_value = {
+        "Seconds_Behind_Source": 1
+    }
+    broken_engine = MagicMock()
+    broken_engine.dialect.name = "mysql"
+    broken_engine.connect.side_effect = SQLAlchemyError("down")
+
+    # Act & Assert
+    assert monitor._probe(sqlite_engine) == 0.0
+    assert monitor._probe(mysql_engine) == 1.0
+    assert monitor._probe(broken_engine) is None
+
+
+def test_statement_cache_stats_count_hits_and_misses(mocker):
+    """
+    Test that re-executing a statement is counted as a compiled-cache hit.
+    """
+    # Arrange
+    import sqlalchemy as sa
+    from app.database import StatementCacheStats, get_statement_cache_stats
+
+    mocker.patch("app.database._statement_cache_stats", StatementCacheStats())
+    engine = sa.create_engine("sqlite://")
+    stmt = sa.select(sa.literal_column("1")).where(
+        sa.literal_column("2") == sa.bindparam("value")
+    )
+
+    # Act
+    with engine.connect() as conn:
+        conn.execute(stmt, {"value": 1})
+        conn.execute(stmt, {"value": 2})
+        conn.exec_driver_sql("SELECT 1")
+
+    # Assert
+    stats = get_statement_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["uncached"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
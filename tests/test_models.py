@@ -1,6 +1,6 @@
 # tests/test_models.py
 
-from app.models import User
+from app.models import User, UserAuthRecord
 from datetime import datetime
 import logging
 
@@ -97,6 +97,7 @@ def test_user_to_dict_with_created_at(caplog) -> None:
         "last_name": user.last_name,
         "is_active": user.is_active,
         "created_at": user.created_at.isoformat(),
+        "last_login_at": None,
     }
     assert user_dict == expected_dict
 
@@ -131,5 +132,33 @@ def test_user_to_dict_without_created_at(caplog) -> None:
         "last_name": user.last_name,
         "is_active": user.is_active,
         "created_at": None,
+        "last_login_at": None,
     }
-    assert user_dict == expected_dict
\ No newline at end of file
+    assert user_dict == expected_dict
+
+def test_user_to_dict_with_last_login_at() -> None:
+    user = User(username="testuser")
+    user.last_login_at = datetime(2023, 10, 2, 8, 30, 0)
+
+    assert user.to_dict()["last_login_at"] == "2023-10-02T08:30:00"
+
+
+# -------------------- UserAuthRecord Tests -------------------- #
+
+
+def test_user_auth_record_is_slotted() -> None:
+    """Test that UserAuthRecord holds the login columns without a __dict__."""
+    # Act
+    record = UserAuthRecord(1, "hashed", True, 0)
+
+    # Assert
+    assert (record.id, record.password, record.is_active, record.token_version) == (
+        1,
+        "hashed",
+        True,
+        0,
+    )
+    assert not hasattr(record, "__dict__")
+    assert [column.key for column in UserAuthRecord.COLUMNS] == list(
+        UserAuthRecord.__slots__
+    )
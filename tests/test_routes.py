@@ -1,5 +1,8 @@
 # tests/test_routes.py
 
+import base64
+import gzip
+
 import pytest
 from unittest.mock import MagicMock
 from sqlalchemy.exc import SQLAlchemyError
@@ -40,9 +43,15 @@ def mock_auth_functions(mocker):
         "login": mocker.patch("app.routes.login"),
         "register": mocker.patch("app.routes.register"),
         "logout": mocker.patch("app.routes.logout"),
+        "logout_all": mocker.patch("app.routes.logout_all"),
         "reset_password": mocker.patch("app.routes.reset_password"),
         "change_password": mocker.patch("app.routes.change_password"),
         "deactivate_account": mocker.patch("app.routes.deactivate_account"),
+        "introspect": mocker.patch("app.routes.introspect"),
+        "introspect_batch": mocker.patch("app.routes.introspect_batch"),
+        "refresh": mocker.patch("app.routes.refresh"),
+        "list_users": mocker.patch("app.routes.list_users"),
+        "batch_get_users": mocker.patch("app.routes.batch_get_users"),
     }
 
 
@@ -82,7 +91,11 @@ def test_login_success(
     assert response.status_code == expected_status
     assert response.get_json() == expected_response
     mock_handle_request.assert_called_once_with(
-        mock_auth_functions["login"], "user1", "pass1", db=mocker.ANY
+        mock_auth_functions["login"],
+        "user1",
+        "pass1",
+        with_refresh_token=False,
+        db=mocker.ANY,
     )
 
 
@@ -122,7 +135,11 @@ def test_login_errors(
         assert response.status_code == 500
         assert response.get_json() == {"error": "An unexpected error occurred"}
     mock_handle_request.assert_called_once_with(
-        mock_auth_functions["login"], "user1", "pass1", db=mocker.ANY
+        mock_auth_functions["login"],
+        "user1",
+        "pass1",
+        with_refresh_token=False,
+        db=mocker.ANY,
     )
 
 
@@ -246,12 +263,27 @@ def test_logout_success(
 ) -> None:
     mock_handle_request.return_value = (expected_response, expected_status)
 
-    response = client.post("/service/auth/logout")
+    response = client.post(
+        "/service/auth/logout", headers={"Authorization": "Bearer abc"}
+    )
 
     assert response.status_code == expected_status
     assert response.get_json() == expected_response
     mock_handle_request.assert_called_once_with(
-        mock_auth_functions["logout"], db=mocker.ANY
+        mock_auth_functions["logout"], "abc", db=mocker.ANY
+    )
+
+
+def test_logout_token_in_body(
+    client, mock_handle_request, mock_get_db, mock_auth_functions, mocker
+) -> None:
+    mock_handle_request.return_value = ({"message": "Logout successful"}, 200)
+
+    response = client.post("/service/auth/logout", json={"token": "abc"})
+
+    assert response.status_code == 200
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["logout"], "abc", db=mocker.ANY
     )
 
 
@@ -282,7 +314,24 @@ def test_logout_errors(
         assert response.status_code == 500
         assert response.get_json() == {"error": "An unexpected error occurred"}
     mock_handle_request.assert_called_once_with(
-        mock_auth_functions["logout"], db=mocker.ANY
+        mock_auth_functions["logout"], None, db=mocker.ANY
+    )
+
+
+def test_logout_all(
+    client, mock_handle_request, mock_get_db, mock_auth_functions, mocker
+) -> None:
+    expected = {"message": "Logged out of all sessions"}
+    mock_handle_request.return_value = (expected, 200)
+
+    response = client.post(
+        "/service/auth/logout/all", headers={"Authorization": "Bearer abc"}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == expected
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["logout_all"], "abc", db=mocker.ANY
     )
 
 
@@ -503,3 +552,400 @@ def test_health(client) -> None:
     response = client.get("/service/auth/health")
     assert response.status_code == 200
     assert response.get_json() == {"status": "OK"}
+
+
+# Tests for /metrics endpoint
+def test_metrics(client) -> None:
+    response = client.get("/service/auth/metrics")
+    assert response.status_code == 200
+    assert "hashing" in response.get_json()
+    assert response.get_json()["hashing"]["rejected"] == 0
+    assert "token_revocation" in response.get_json()
+    assert response.get_json()["auth_record_cache"]["enabled"] is False
+    assert response.get_json()["username_filter"]["enabled"] is False
+    assert response.get_json()["auth_record_lookups"]["in_flight"] == 0
+    assert "hit_rate" in response.get_json()["profile_cache"]
+    assert response.get_json()["login_events"]["dropped"] == 0
+    assert "pending" in response.get_json()["last_login"]
+    assert "default" in response.get_json()["db_pool"]
+    assert response.get_json()["db_replica"]["replica_reads"] == 0
+    assert "hit_rate" in response.get_json()["statement_cache"]
+
+
+# Tests for /users endpoint
+def test_list_users_route(
+    app, client, mock_handle_request, mock_get_db, mock_auth_functions, mocker
+) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    expected = {"users": [{"id": 1}], "next_cursor": None}
+    mock_handle_request.return_value = (expected, 200)
+
+    response = client.get(
+        "/service/auth/users?limit=10&fields=id",
+        headers={"X-Admin-Token": "admin-secret"},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == expected
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["list_users"],
+        {"limit": "10", "fields": "id"},
+        db=mocker.ANY,
+    )
+
+
+def test_list_users_requires_admin_token(app, client) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    response = client.get("/service/auth/users")
+    assert response.status_code == 401
+
+
+# Tests for /users:batchGet endpoint
+@pytest.fixture
+def user_lookup_auth(app):
+    """Register a service allowed to look users up and return its headers."""
+    app.config["USER_LOOKUP_CLIENTS"] = {"orders": "orders-secret"}
+    credentials = base64.b64encode(b"orders:orders-secret").decode()
+    return {"Authorization": f"Basic {credentials}"}
+
+
+def test_batch_get_users_route(
+    client,
+    mock_handle_request,
+    mock_get_db,
+    mock_auth_functions,
+    user_lookup_auth,
+    mocker,
+) -> None:
+    expected = {"users": [{"id": 1}], "not_found": {"ids": [], "usernames": []}}
+    mock_handle_request.return_value = (expected, 200)
+
+    response = client.post(
+        "/service/auth/users:batchGet",
+        json={"ids": [1], "usernames": ["johndoe"]},
+        headers=user_lookup_auth,
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == expected
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["batch_get_users"], [1], ["johndoe"], db=mocker.ANY
+    )
+
+
+def test_batch_get_users_rejects_admin_token(
+    app, client, mock_handle_request, user_lookup_auth
+) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+
+    response = client.post(
+        "/service/auth/users:batchGet",
+        json={"ids": [1]},
+        headers={"X-Admin-Token": "admin-secret"},
+    )
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == 'Basic realm="users"'
+    mock_handle_request.assert_not_called()
+
+
+def test_batch_get_users_requires_configured_clients(client) -> None:
+    response = client.post("/service/auth/users:batchGet", json={"ids": [1]})
+
+    assert response.status_code == 403
+    assert response.get_json() == {"error": "User lookup is disabled"}
+
+
+# Tests for /admin/users/import endpoint
+def test_import_users_requires_configured_admin_token(client) -> None:
+    response = client.post(
+        "/service/auth/admin/users/import",
+        data="",
+        headers={"X-Admin-Token": "anything", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 403
+    assert response.get_json() == {"error": "Admin API is disabled"}
+
+
+def test_import_users_rejects_invalid_admin_token(app, client) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    response = client.post(
+        "/service/auth/admin/users/import",
+        data="",
+        headers={"X-Admin-Token": "wrong", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 401
+
+
+def test_import_users_rejects_unknown_format(app, client) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    response = client.post(
+        "/service/auth/admin/users/import",
+        data="{}",
+        headers={"X-Admin-Token": "admin-secret", "Content-Type": "application/json"},
+    )
+    assert response.status_code == 415
+
+
+def test_import_users_streams_progress(app, client, mocker) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    mock_db_context(mocker)
+    mock_import = mocker.patch(
+        "app.routes.import_users",
+        return_value=iter(
+            [
+                {"row": 2, "error": {"message": "Malformed row"}},
+                {"done": True, "imported": 1, "failed": 1},
+            ]
+        ),
+    )
+
+    response = client.post(
+        "/service/auth/admin/users/import?batch_size=50&resume_after=10",
+        data='{"username": "johndoe"}\nnot json\n',
+        headers={
+            "X-Admin-Token": "admin-secret",
+            "Content-Type": "application/x-ndjson",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.get_data(as_text=True).splitlines() == [
+        '{"row": 2, "error": {"message": "Malformed row"}}',
+        '{"done": true, "imported": 1, "failed": 1}',
+    ]
+    _, kwargs = mock_import.call_args
+    assert kwargs["batch_size"] == 50
+    assert kwargs["resume_after"] == 10
+    assert kwargs["shared_pool"] is True
+
+
+# Tests for /admin/users/export endpoint
+def test_export_users_streams_rows(app, client, mocker) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    mock_db_context(mocker)
+    mock_export = mocker.patch(
+        "app.routes.user_export.export_users", return_value=iter(["a\n", "b\n"])
+    )
+
+    response = client.get(
+        "/service/auth/admin/users/export?format=csv&batch_size=10",
+        headers={"X-Admin-Token": "admin-secret"},
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == "attachment; filename=users.csv"
+    assert response.get_data(as_text=True) == "a\nb\n"
+    assert mock_export.call_args.args[1] == "csv"
+    assert mock_export.call_args.kwargs == {"batch_size": 10}
+
+
+def test_export_users_gzip(app, client, mocker) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    mock_db_context(mocker)
+    mocker.patch("app.routes.user_export.export_users", return_value=iter(["a\n"]))
+
+    response = client.get(
+        "/service/auth/admin/users/export?gzip=true",
+        headers={"X-Admin-Token": "admin-secret"},
+    )
+
+    assert response.mimetype == "application/gzip"
+    assert gzip.decompress(response.data) == b"a\n"
+
+
+def test_export_users_rejects_unknown_format(app, client) -> None:
+    app.config["ADMIN_API_TOKEN"] = "admin-secret"
+    response = client.get(
+        "/service/auth/admin/users/export?format=xml",
+        headers={"X-Admin-Token": "admin-secret"},
+    )
+    assert response.status_code == 400
+
+
+# Tests for /.well-known/jwks.json endpoint
+def test_jwks(client, mocker) -> None:
+    mocker.patch("app.routes.get_jwks_document", return_value=('{"keys":[]}', "abc123"))
+
+    response = client.get("/service/auth/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"keys": []}
+    assert response.headers["ETag"] == '"abc123"'
+    assert "public" in response.headers["Cache-Control"]
+    assert "max-age=" in response.headers["Cache-Control"]
+
+
+def test_jwks_not_modified(client, mocker) -> None:
+    mocker.patch("app.routes.get_jwks_document", return_value=('{"keys":[]}', "abc123"))
+
+    response = client.get(
+        "/service/auth/.well-known/jwks.json", headers={"If-None-Match": '"abc123"'}
+    )
+
+    assert response.status_code == 304
+
+
+def test_jwks_error(client, mocker) -> None:
+    mocker.patch("app.routes.get_jwks_document", side_effect=Exception("bad key"))
+
+    response = client.get("/service/auth/.well-known/jwks.json")
+
+    assert response.status_code == 500
+
+
+# Tests for /introspect endpoints
+@pytest.fixture
+def introspection_auth(app):
+    """Register a resource server and return its Basic auth headers."""
+    app.config["INTROSPECTION_CLIENTS"] = {"orders": "orders-secret"}
+    credentials = base64.b64encode(b"orders:orders-secret").decode()
+    return {"Authorization": f"Basic {credentials}"}
+
+
+def test_introspect_form_encoded(
+    client,
+    mock_handle_request,
+    mock_get_db,
+    mock_auth_functions,
+    introspection_auth,
+    mocker,
+) -> None:
+    mock_handle_request.return_value = ({"active": True}, 200)
+
+    response = client.post(
+        "/service/auth/introspect", data={"token": "abc"}, headers=introspection_auth
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"active": True}
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["introspect"], "abc", db=mocker.ANY
+    )
+
+
+def test_introspect_json(
+    client,
+    mock_handle_request,
+    mock_get_db,
+    mock_auth_functions,
+    introspection_auth,
+    mocker,
+) -> None:
+    mock_handle_request.return_value = ({"active": False}, 200)
+
+    response = client.post(
+        "/service/auth/introspect", json={"token": "abc"}, headers=introspection_auth
+    )
+
+    assert response.get_json() == {"active": False}
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["introspect"], "abc", db=mocker.ANY
+    )
+
+
+@pytest.mark.parametrize(
+    "url, payload",
+    [
+        ("/service/auth/introspect", {"token": "abc"}),
+        ("/service/auth/introspect/batch", {"tokens": ["abc"]}),
+    ],
+)
+@pytest.mark.parametrize(
+    "exception, error_response",
+    [
+        (SQLAlchemyError("DB Error"), {"error": "Database error occurred"}),
+        (Exception("Unexpected Error"), {"error": "An unexpected error occurred"}),
+    ],
+)
+def test_introspect_errors(
+    client,
+    mock_handle_request,
+    mock_get_db,
+    mock_auth_functions,
+    introspection_auth,
+    url,
+    payload,
+    exception,
+    error_response,
+) -> None:
+    mock_handle_request.side_effect = exception
+
+    response = client.post(url, json=payload, headers=introspection_auth)
+
+    assert response.status_code == 500
+    assert response.get_json() == error_response
+
+
+def test_introspect_batch(
+    client,
+    mock_handle_request,
+    mock_get_db,
+    mock_auth_functions,
+    introspection_auth,
+    mocker,
+) -> None:
+    mock_handle_request.return_value = ({"results": [{"active": True}]}, 200)
+
+    response = client.post(
+        "/service/auth/introspect/batch",
+        json={"tokens": ["abc"]},
+        headers=introspection_auth,
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"results": [{"active": True}]}
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["introspect_batch"], ["abc"], db=mocker.ANY
+    )
+
+
+@pytest.mark.parametrize(
+    "url", ["/service/auth/introspect", "/service/auth/introspect/batch"]
+)
+def test_introspect_requires_configured_clients(app, client, url) -> None:
+    app.config["INTROSPECTION_CLIENTS"] = {}
+
+    response = client.post(url, json={"token": "abc", "tokens": ["abc"]})
+
+    assert response.status_code == 403
+    assert response.get_json() == {"error": "Introspection is disabled"}
+
+
+@pytest.mark.parametrize(
+    "credentials",
+    [None, b"orders:wrong-secret", b"unknown:orders-secret"],
+    ids=["missing", "wrong-secret", "unknown-client"],
+)
+def test_introspect_rejects_invalid_client_credentials(
+    client, mock_handle_request, introspection_auth, credentials
+) -> None:
+    headers = {}
+    if credentials:
+        headers["Authorization"] = f"Basic {base64.b64encode(credentials).decode()}"
+
+    response = client.post(
+        "/service/auth/introspect", data={"token": "abc"}, headers=headers
+    )
+
+    assert response.status_code == 401
+    assert response.get_json() == {"error": "invalid_client"}
+    assert response.headers["WWW-Authenticate"] == 'Basic realm="introspect"'
+    mock_handle_request.assert_not_called()
+
+
+def test_refresh_route(
+    client, mock_handle_request, mock_get_db, mock_auth_functions, mocker
+) -> None:
+    expected = {"message": "Token refreshed", "token": "t", "refresh_token": "r"}
+    mock_handle_request.return_value = (expected, 200)
+
+    response = client.post("/service/auth/token/refresh", json={"refresh_token": "old"})
+
+    assert response.status_code == 200
+    assert response.get_json() == expected
+    mock_handle_request.assert_called_once_with(
+        mock_auth_functions["refresh"], "old", db=mocker.ANY
+    )
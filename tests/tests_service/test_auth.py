@@ -1,13 +1,20 @@
 import pytest
 from unittest.mock import call
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.utils.exceptions import (
     ValidationError,
     AuthenticationError,
     AuthorizationError,
     DatabaseError,
+    ServiceUnavailableError,
 )
 from app.models import User
+from app.service.auth_record_cache import AuthRecordCache
+from app.service.credential_cache import CredentialCache
+from app.service.hashers import get_hasher
+from app.service.revocation import RevocationList
+from app.utils.cache_backends import MemoryBackend
+from marshmallow import ValidationError as MarshmallowValidationError
 from app.schemas.auth_schemas import (
     RegisterSchema,
     LoginSchema,
@@ -21,9 +28,13 @@ from app.service.auth import (
     validate_email,
     validate_name,
     logout,
+    logout_all,
     reset_password,
     change_password,
     deactivate_account,
+    introspect,
+    introspect_batch,
+    refresh,
 )
 
 
@@ -42,6 +53,11 @@ def create_user(
     return user
 
 
+def auth_row(user):
+    """The row the projected login lookup returns for ``user``."""
+    return (user.id, user.password, user.is_active, user.token_version)
+
+
 @pytest.fixture
 def mock_db(mocker):
     return mocker.MagicMock()
@@ -54,7 +70,7 @@ def mock_logger(mocker):
 
 @pytest.fixture
 def mock_bcrypt(mocker):
-    return mocker.patch("app.service.auth.bcrypt")
+    return mocker.patch("app.service.hashers.bcrypt")
 
 
 @pytest.fixture
@@ -62,6 +78,11 @@ def mock_generate_jwt(mocker):
     return mocker.patch("app.service.auth.generate_jwt")
 
 
+@pytest.fixture
+def mock_issue_refresh_token(mocker):
+    return mocker.patch("app.service.auth.issue_refresh_token")
+
+
 @pytest.fixture
 def mock_register_schema_load(mocker):
     return mocker.patch.object(RegisterSchema, "load")
@@ -101,9 +122,6 @@ def test_register_success(mock_db, mock_logger, mock_bcrypt, mock_register_schem
     mock_bcrypt.gensalt.return_value = b"salt"
     mock_bcrypt.hashpw.return_value = b"hashed_password"
 
-    # Simulate no existing user
-    mock_db.query.return_value.filter.return_value.first.return_value = None
-
     # Act
     response, status_code = register(
         email, password, first_name, last_name, username, db=mock_db
@@ -116,7 +134,8 @@ def test_register_success(mock_db, mock_logger, mock_bcrypt, mock_register_schem
         call.info("Registration successful"),
     ]
     mock_logger.assert_has_calls(expected_calls, any_order=False)
-    mock_db.query.assert_called_once()
+    # The insert alone detects duplicates; no lookup on the happy path
+    mock_db.scalars.assert_not_called()
     mock_db.commit.assert_called_once()
     mock_db.add.assert_called_once()
 
@@ -147,7 +166,7 @@ def test_register_validation_error(mock_register_schema_load) -> None:
     assert str(exc_info.value) == "Invalid data"
 
 
-def test_register_existing_active_user(mock_db, mock_logger) -> None:
+def test_register_existing_active_user(mock_db, mock_logger, mock_bcrypt) -> None:
     # Arrange
     email = "test@example.com"
     username = "johndoe"
@@ -165,7 +184,9 @@ def test_register_existing_active_user(mock_db, mock_logger) -> None:
         is_active=True,
     )
 
-    mock_db.query.return_value.filter.return_value.first.return_value = existing_user
+    mock_bcrypt.hashpw.return_value = b"hashed_password"
+    mock_db.commit.side_effect = IntegrityError("INSERT", {}, Exception("dup"))
+    mock_db.scalars.return_value.first.return_value = existing_user
 
     # Act & Assert
     with pytest.raises(ValidationError) as exc_info:
@@ -173,6 +194,7 @@ def test_register_existing_active_user(mock_db, mock_logger) -> None:
     assert exc_info.value.message == {"message": "Email or username is already in use"}
 
     mock_logger.warning.assert_called_with("Email or username is already in use")
+    mock_db.rollback.assert_called_once()
 
 
 def test_register_database_error(
@@ -193,7 +215,6 @@ def test_register_database_error(
         "username": username,
     }
 
-    mock_db.query.return_value.filter.return_value.first.return_value = None
     mock_bcrypt.gensalt.return_value = b"salt"
     mock_bcrypt.hashpw.return_value = b"hashed_password"
     mock_db.commit.side_effect = SQLAlchemyError("DB Error")
@@ -235,7 +256,9 @@ def test_register_reactivate_existing_inactive_user(
         last_name="OldLastName",
         is_active=False,
     )
-    mock_db.query.return_value.filter.return_value.first.return_value = existing_user
+    mock_db.scalars.return_value.first.return_value = existing_user
+    # The optimistic insert hits the unique index; the reactivation succeeds
+    mock_db.commit.side_effect = [IntegrityError("INSERT", {}, Exception("dup")), None]
 
     mock_bcrypt.gensalt.return_value = b"new_salt"
     mock_bcrypt.hashpw.return_value = b"new_hashed_password"
@@ -253,9 +276,9 @@ def test_register_reactivate_existing_inactive_user(
         call.info("Account reactivated successfully"),
     ]
     mock_logger.assert_has_calls(expected_calls, any_order=False)
-    mock_db.query.assert_called_once()
-    mock_db.commit.assert_called_once()
-    mock_db.add.assert_not_called()  # No new user should be added
+    mock_db.scalars.assert_called_once()
+    assert mock_db.commit.call_count == 2
+    mock_db.rollback.assert_called_once()  # The failed insert is discarded
 
     # Verify that the existing user's details were updated
     assert existing_user.password == "new_hashed_password"
@@ -272,6 +295,57 @@ def test_register_reactivate_existing_inactive_user(
     ), "Unexpected status code for reactivating existing inactive user"
 
 
+def test_register_reactivation_username_taken(
+    mock_db, mock_logger, mock_bcrypt, mock_register_schema_load
+) -> None:
+    # Arrange
+    mock_register_schema_load.return_value = {
+        "email": "test@example.com",
+        "password": "NewPassword123",
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "username": "taken",
+    }
+    existing_user = create_user(
+        email="test@example.com",
+        username="johndoe",
+        password="old_hashed_password",
+        first_name="Jane",
+        last_name="Doe",
+        is_active=False,
+    )
+    mock_db.scalars.return_value.first.return_value = existing_user
+    # Both the insert and the reactivation hit a unique index
+    mock_db.commit.side_effect = IntegrityError("INSERT", {}, Exception("dup"))
+    mock_bcrypt.hashpw.return_value = b"new_hashed_password"
+
+    # Act & Assert
+    with pytest.raises(ValidationError) as exc_info:
+        register("test@example.com", "NewPassword123", "Jane", "Doe", "taken", db=mock_db)
+    assert exc_info.value.message == {"message": "Email or username is already in use"}
+    assert mock_db.rollback.call_count == 2
+
+
+def test_register_integrity_error_without_conflict(
+    mock_db, mock_logger, mock_bcrypt, mock_register_schema_load
+) -> None:
+    # Arrange
+    mock_register_schema_load.return_value = {
+        "email": "test@example.com",
+        "password": "Password123",
+        "first_name": "John",
+        "last_name": "Doe",
+        "username": "johndoe",
+    }
+    mock_db.scalars.return_value.first.return_value = None
+    mock_db.commit.side_effect = IntegrityError("INSERT", {}, Exception("other"))
+    mock_bcrypt.hashpw.return_value = b"hashed_password"
+
+    # Act & Assert
+    with pytest.raises(DatabaseError):
+        register("test@example.com", "Password123", "John", "Doe", "johndoe", db=mock_db)
+
+
 def test_register_unexpected_exception(
     mock_db, mock_logger, mock_bcrypt, mock_register_schema_load
 ) -> None:
@@ -290,9 +364,6 @@ def test_register_unexpected_exception(
         "username": username,
     }
 
-    # Simulate no existing user
-    mock_db.query.return_value.filter.return_value.first.return_value = None
-
     # Simulate an unexpected exception during user creation
     mock_db.add.side_effect = Exception("Unexpected Error")
 
@@ -304,13 +375,41 @@ def test_register_unexpected_exception(
     mock_logger.exception.assert_called_with("Error registering user: Unexpected Error")
 
 
+def test_register_saturated_hashing_pool_is_not_logged_as_error(
+    mock_db, mock_logger, mock_register_schema_load, mocker
+) -> None:
+    # Arrange
+    mock_register_schema_load.return_value = {
+        "email": "test@example.com",
+        "password": "Password123",
+        "first_name": "John",
+        "last_name": "Doe",
+        "username": "johndoe",
+    }
+    mocker.patch(
+        "app.service.auth.hash_password", side_effect=ServiceUnavailableError()
+    )
+
+    # Act & Assert
+    with pytest.raises(ServiceUnavailableError):
+        register(
+            "test@example.com", "Password123", "John", "Doe", "johndoe", db=mock_db
+        )
+    mock_logger.exception.assert_not_called()
+
+
 # -------------------------
 # Tests for login function
 # -------------------------
 
 
 def test_login_success(
-    mock_db, mock_logger, mock_bcrypt, mock_generate_jwt, mock_login_schema_load
+    mock_db,
+    mock_logger,
+    mock_bcrypt,
+    mock_generate_jwt,
+    mock_issue_refresh_token,
+    mock_login_schema_load,
 ) -> None:
     # Arrange
     username = "johndoe"
@@ -330,14 +429,18 @@ def test_login_success(
     mock_login_schema_load.return_value = {
         "username": username,
         "password": password,
+        "with_refresh_token": True,
     }
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = user
+    mock_db.execute.return_value.first.return_value = auth_row(user)
     mock_bcrypt.checkpw.return_value = True  # Simulate successful password check
     mock_generate_jwt.return_value = "mock_jwt_token"
+    mock_issue_refresh_token.return_value = "mock_refresh_token"
 
     # Act
-    response, status_code = login(username, password, db=mock_db)
+    response, status_code = login(
+        username, password, db=mock_db, with_refresh_token=True
+    )
 
     # Assert
     expected_calls = [
@@ -349,15 +452,270 @@ def test_login_success(
     mock_bcrypt.checkpw.assert_called_with(
         password.encode("utf-8"), hashed_password.encode("utf-8")
     )
-    mock_generate_jwt.assert_called_with(user.id)
+    mock_generate_jwt.assert_called_with(user.id, user.token_version)
+    mock_issue_refresh_token.assert_called_once_with(mock_db, user.id)
+    mock_db.commit.assert_called_once()
 
     assert response == {
         "message": "Login successful",
         "token": "mock_jwt_token",
+        "refresh_token": "mock_refresh_token",
     }, "Unexpected login response"
     assert status_code == 200, "Unexpected status code for login"
 
 
+def test_login_without_refresh_token_does_not_write(
+    mock_db,
+    mock_logger,
+    mock_bcrypt,
+    mock_generate_jwt,
+    mock_issue_refresh_token,
+    mock_login_schema_load,
+) -> None:
+    # Arrange
+    user = create_user(
+        email="johndoe@example.com",
+        username="johndoe",
+        password="hashed_password",
+        first_name="John",
+        last_name="Doe",
+    )
+    mock_login_schema_load.return_value = {
+        "username": "johndoe",
+        "password": "Password123",
+        "with_refresh_token": False,
+    }
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_bcrypt.checkpw.return_value = True
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    # Act
+    response, status_code = login("johndoe", "Password123", db=mock_db)
+
+    # Assert
+    assert response == {"message": "Login successful", "token": "mock_jwt_token"}
+    assert status_code == 200
+    mock_issue_refresh_token.assert_not_called()
+    mock_db.add.assert_not_called()
+    mock_db.commit.assert_not_called()
+
+
+def test_login_upgrades_outdated_hash(
+    mock_db, mock_logger, mock_bcrypt, mock_generate_jwt, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    username = "johndoe"
+    password = "Password123"
+    mocker.patch.object(get_hasher("bcrypt"), "rounds", 12)
+
+    user = create_user(
+        email="johndoe@example.com",
+        username=username,
+        password="$2b$10$outdatedhash",
+        first_name="John",
+        last_name="Doe",
+    )
+
+    mock_login_schema_load.return_value = {
+        "username": username,
+        "password": password,
+    }
+
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_bcrypt.checkpw.return_value = True
+    mock_bcrypt.hashpw.return_value = b"$2b$12$upgradedhash"
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    # Act
+    response, status_code = login(username, password, db=mock_db)
+
+    # Assert
+    mock_bcrypt.gensalt.assert_called_with(rounds=12)
+    # The new hash is written with an UPDATE by primary key
+    mock_db.execute.assert_called_with(
+        mocker.ANY, {"user_id": user.id, "new_password": "$2b$12$upgradedhash"}
+    )
+    # Only the upgraded hash is committed; no refresh token was asked for
+    mock_db.commit.assert_called_once()
+    mock_logger.info.assert_any_call("Password hash upgraded")
+    assert status_code == 200
+
+
+def test_login_hash_upgrade_invalidates_shared_record(
+    mock_db, mock_bcrypt, mock_generate_jwt, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    mocker.patch.object(get_hasher("bcrypt"), "rounds", 12)
+    shared = MemoryBackend()
+    record_cache = AuthRecordCache(enabled=True, shared=shared)
+    mocker.patch("app.service.auth.get_auth_record_cache", return_value=record_cache)
+    user = create_user(
+        email="johndoe@example.com",
+        username="johndoe",
+        password="$2b$10$outdatedhash",
+        first_name="John",
+        last_name="Doe",
+    )
+    mock_login_schema_load.return_value = {
+        "username": "johndoe",
+        "password": "Password123",
+    }
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_bcrypt.checkpw.return_value = True
+    mock_bcrypt.hashpw.return_value = b"$2b$12$upgradedhash"
+    mock_generate_jwt.return_value = "mock_jwt_token"
+    other_worker = AuthRecordCache(enabled=True, shared=shared)
+
+    # Act
+    login("johndoe", "Password123", db=mock_db)
+
+    # Assert: no worker keeps the outdated hash
+    assert other_worker.get("johndoe") is None
+    assert record_cache.get("johndoe") is None
+
+
+def test_login_hash_upgrade_failure_does_not_fail_login(
+    mock_db, mock_logger, mock_bcrypt, mock_generate_jwt, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    username = "johndoe"
+    password = "Password123"
+    mocker.patch.object(get_hasher("bcrypt"), "rounds", 12)
+
+    user = create_user(
+        email="johndoe@example.com",
+        username=username,
+        password="$2b$10$outdatedhash",
+        first_name="John",
+        last_name="Doe",
+    )
+
+    mock_login_schema_load.return_value = {
+        "username": username,
+        "password": password,
+    }
+
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_db.commit.side_effect = [SQLAlchemyError("DB Error"), None]
+    mock_bcrypt.checkpw.return_value = True
+    mock_bcrypt.hashpw.return_value = b"$2b$12$upgradedhash"
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    # Act
+    response, status_code = login(username, password, db=mock_db)
+
+    # Assert
+    mock_logger.warning.assert_called_with("Failed to upgrade password hash: DB Error")
+    mock_db.rollback.assert_called_once()
+    assert status_code == 200
+
+
+def test_login_uses_credential_cache(
+    mock_db, mock_logger, mock_bcrypt, mock_generate_jwt, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    username = "johndoe"
+    password = "Password123"
+    mocker.patch(
+        "app.service.auth.get_credential_cache",
+        return_value=CredentialCache(enabled=True),
+    )
+
+    user = create_user(
+        email="johndoe@example.com",
+        username=username,
+        password="hashed_password",
+        first_name="John",
+        last_name="Doe",
+    )
+
+    mock_login_schema_load.return_value = {
+        "username": username,
+        "password": password,
+    }
+
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_bcrypt.checkpw.return_value = True
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    # Act
+    login(username, password, db=mock_db)
+    response, status_code = login(username, password, db=mock_db)
+
+    # Assert
+    mock_bcrypt.checkpw.assert_called_once()
+    mock_logger.debug.assert_any_call("Credential cache hit")
+    assert status_code == 200
+
+
+def test_login_uses_auth_record_cache(
+    mock_db, mock_logger, mock_bcrypt, mock_generate_jwt, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    username = "johndoe"
+    password = "Password123"
+    record_cache = AuthRecordCache(enabled=True)
+    mocker.patch("app.service.auth.get_auth_record_cache", return_value=record_cache)
+
+    user = create_user(
+        email="johndoe@example.com",
+        username=username,
+        password="hashed_password",
+        first_name="John",
+        last_name="Doe",
+    )
+
+    mock_login_schema_load.return_value = {
+        "username": username,
+        "password": password,
+    }
+
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_bcrypt.checkpw.return_value = True
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    # Act
+    login(username, password, db=mock_db)
+    response, status_code = login(username, password, db=mock_db)
+
+    # Assert
+    mock_db.execute.assert_called_once()
+    assert record_cache.stats()["hits"] == 1
+    assert status_code == 200
+
+
+def test_login_keeps_replica_reads_out_of_shared_cache(
+    mock_db, mock_bcrypt, mock_generate_jwt, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    shared = MemoryBackend()
+    record_cache = AuthRecordCache(enabled=True, shared=shared)
+    mocker.patch("app.service.auth.get_auth_record_cache", return_value=record_cache)
+    mocker.patch("app.service.auth.read_from_replica", return_value=True)
+    user = create_user(
+        email="johndoe@example.com",
+        username="johndoe",
+        password="hashed_password",
+        first_name="John",
+        last_name="Doe",
+    )
+    mock_login_schema_load.return_value = {
+        "username": "johndoe",
+        "password": "Password123",
+    }
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_bcrypt.checkpw.return_value = True
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    # Act
+    response, status_code = login("johndoe", "Password123", db=mock_db)
+
+    # Assert
+    assert status_code == 200
+    assert record_cache.get("johndoe") is not None
+    assert shared.get("auth_record:johndoe") is None
+
+
 def test_login_validation_error(mock_login_schema_load) -> None:
     # Arrange
     mock_login_schema_load.side_effect = ValidationError("Invalid data")
@@ -378,7 +736,7 @@ def test_login_invalid_username(mock_db, mock_logger, mock_login_schema_load) ->
         "password": password,
     }
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = None
+    mock_db.execute.return_value.first.return_value = None
 
     # Act & Assert
     with pytest.raises(AuthenticationError) as exc_info:
@@ -388,6 +746,123 @@ def test_login_invalid_username(mock_db, mock_logger, mock_login_schema_load) ->
     mock_logger.warning.assert_called_with("Invalid username or password")
 
 
+def test_login_unknown_username_rejected_by_filter_skips_query(
+    mock_db, mock_logger, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    mock_login_schema_load.return_value = {
+        "username": "nonexistent",
+        "password": "Password123",
+    }
+    mock_filter = mocker.patch("app.service.auth.get_username_filter")
+    mock_filter.return_value.might_exist.return_value = False
+
+    # Act & Assert
+    with pytest.raises(AuthenticationError):
+        login("nonexistent", "Password123", db=mock_db)
+
+    mock_db.execute.assert_not_called()
+    mock_filter.return_value.record_missing.assert_not_called()
+
+
+def test_login_counts_username_filter_false_positive(
+    mock_db, mock_logger, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    mock_login_schema_load.return_value = {
+        "username": "nonexistent",
+        "password": "Password123",
+    }
+    mock_filter = mocker.patch("app.service.auth.get_username_filter")
+    mock_filter.return_value.might_exist.return_value = True
+    mock_db.execute.return_value.first.return_value = None
+
+    # Act & Assert
+    with pytest.raises(AuthenticationError):
+        login("nonexistent", "Password123", db=mock_db)
+
+    mock_filter.return_value.record_missing.assert_called_once_with("nonexistent")
+
+
+def test_register_announces_username_before_insert(
+    mock_db, mock_logger, mock_bcrypt, mock_register_schema_load, mocker
+) -> None:
+    # Arrange
+    mock_register_schema_load.return_value = {
+        "email": "bob@example.com",
+        "username": "bob",
+        "password": "Password123",
+        "first_name": "Bob",
+        "last_name": "Doe",
+    }
+    mock_filter = mocker.patch("app.service.auth.get_username_filter")
+    mock_filter.return_value.announce.side_effect = ServiceUnavailableError()
+
+    # Act & Assert
+    with pytest.raises(ServiceUnavailableError):
+        register("bob@example.com", "bob", "Password123", "Bob", "Doe", db=mock_db)
+
+    mock_filter.return_value.announce.assert_called_once_with("bob")
+    mock_db.add.assert_not_called()
+
+
+def test_login_records_audit_events_and_last_login(
+    mock_db, mock_logger, mock_bcrypt, mock_generate_jwt, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    mock_events = mocker.patch("app.service.auth.get_login_events")
+    mock_last_logins = mocker.patch("app.service.auth.get_last_logins")
+    user = create_user(
+        email="johndoe@example.com",
+        username="johndoe",
+        password="hashed_password",
+        first_name="John",
+        last_name="Doe",
+        user_id=7,
+    )
+    mock_login_schema_load.return_value = {
+        "username": "johndoe",
+        "password": "Password123",
+    }
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    # Act
+    mock_bcrypt.checkpw.return_value = False
+    with pytest.raises(AuthenticationError):
+        login("johndoe", "Password123", db=mock_db)
+    mock_bcrypt.checkpw.return_value = True
+    login("johndoe", "Password123", db=mock_db)
+
+    # Assert
+    assert mock_events.return_value.record.call_args_list == [
+        call("login_failure", 7, "johndoe", "bad_password"),
+        call("login_success", 7, "johndoe"),
+    ]
+    # Only the successful login is buffered for last_login_at
+    mock_last_logins.return_value.touch.assert_called_once_with(7)
+
+
+def test_login_records_unknown_username(
+    mock_db, mock_logger, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    mock_events = mocker.patch("app.service.auth.get_login_events")
+    mock_login_schema_load.return_value = {
+        "username": "nonexistent",
+        "password": "Password123",
+    }
+    mock_db.execute.return_value.first.return_value = None
+
+    # Act & Assert
+    with pytest.raises(AuthenticationError):
+        login("nonexistent", "Password123", db=mock_db)
+
+    mock_events.return_value.record.assert_called_once_with(
+        "login_failure", None, "nonexistent", "unknown_user"
+    )
+
+
 def test_login_inactive_user(mock_db, mock_logger, mock_login_schema_load) -> None:
     # Arrange
     username = "johndoe"
@@ -408,7 +883,7 @@ def test_login_inactive_user(mock_db, mock_logger, mock_login_schema_load) -> No
         "password": password,
     }
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = user
+    mock_db.execute.return_value.first.return_value = auth_row(user)
 
     # Act & Assert
     with pytest.raises(AuthorizationError) as exc_info:
@@ -440,7 +915,7 @@ def test_login_invalid_password(
         "password": password,
     }
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = user
+    mock_db.execute.return_value.first.return_value = auth_row(user)
     mock_bcrypt.checkpw.return_value = False  # Simulate failed password check
 
     # Act & Assert
@@ -473,7 +948,7 @@ def test_login_jwt_generation_failure(
         "password": password,
     }
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = user
+    mock_db.execute.return_value.first.return_value = auth_row(user)
     mock_bcrypt.checkpw.return_value = True
     mock_generate_jwt.return_value = None  # Simulate JWT generation failure
 
@@ -485,6 +960,32 @@ def test_login_jwt_generation_failure(
     mock_logger.error.assert_called_with("Failed to generate JWT")
 
 
+def test_login_saturated_hashing_pool_is_not_logged_as_error(
+    mock_db, mock_logger, mock_login_schema_load, mocker
+) -> None:
+    # Arrange
+    user = create_user(
+        email="johndoe@example.com",
+        username="johndoe",
+        password="hashed_password",
+        first_name="John",
+        last_name="Doe",
+    )
+    mock_login_schema_load.return_value = {
+        "username": "johndoe",
+        "password": "Password123",
+    }
+    mock_db.execute.return_value.first.return_value = auth_row(user)
+    mocker.patch(
+        "app.service.auth.verify_password", side_effect=ServiceUnavailableError()
+    )
+
+    # Act & Assert
+    with pytest.raises(ServiceUnavailableError):
+        login("johndoe", "Password123", db=mock_db)
+    mock_logger.exception.assert_not_called()
+
+
 def test_login_database_error(mock_db, mock_logger, mock_login_schema_load) -> None:
     # Arrange
     username = "johndoe"
@@ -495,7 +996,7 @@ def test_login_database_error(mock_db, mock_logger, mock_login_schema_load) -> N
         "password": password,
     }
 
-    mock_db.query.side_effect = SQLAlchemyError("DB Error")
+    mock_db.execute.side_effect = SQLAlchemyError("DB Error")
 
     # Act & Assert
     with pytest.raises(DatabaseError):
@@ -586,10 +1087,115 @@ def test_validate_name_edge_cases() -> None:
 # -------------------------
 
 
-def test_logout() -> None:
-    response, status_code = logout()
+@pytest.fixture
+def revocation_list(mocker):
+    revocations = RevocationList()
+    mocker.patch("app.service.auth.get_revocation_list", return_value=revocations)
+    return revocations
+
+
+def test_logout(mock_db, revocation_list, mocker) -> None:
+    mocker.patch(
+        "app.service.auth.decode_jwt",
+        return_value={"user_id": 1, "exp": 4102444800, "iat": 1000, "jti": "abc"},
+    )
+
+    response, status_code = logout("token", db=mock_db)
+
     assert response == {"message": "Logout successful"}, "Unexpected logout response"
     assert status_code == 200, "Unexpected status code for logout"
+    revoked = mock_db.add.call_args.args[0]
+    assert (revoked.jti, revoked.user_id) == ("abc", 1)
+    mock_db.commit.assert_called_once()
+    assert revocation_list.is_revoked("abc")
+
+
+def test_logout_already_revoked_elsewhere(mock_db, revocation_list, mocker) -> None:
+    mocker.patch(
+        "app.service.auth.decode_jwt",
+        return_value={"user_id": 1, "exp": 4102444800, "iat": 1000, "jti": "abc"},
+    )
+    mock_db.commit.side_effect = IntegrityError("INSERT", {}, Exception("dup"))
+
+    response, status_code = logout("token", db=mock_db)
+
+    assert status_code == 200
+    mock_db.rollback.assert_called_once()
+    assert revocation_list.is_revoked("abc")
+
+
+def test_logout_invalid_token(mock_db, mocker) -> None:
+    mocker.patch("app.service.auth.decode_jwt", return_value=None)
+
+    with pytest.raises(AuthenticationError):
+        logout("token", db=mock_db)
+
+    mock_db.add.assert_not_called()
+
+
+def test_logout_token_without_jti(mock_db, mocker) -> None:
+    mocker.patch(
+        "app.service.auth.decode_jwt",
+        return_value={"user_id": 1, "exp": 4102444800, "iat": 1000},
+    )
+
+    response, status_code = logout("token", db=mock_db)
+
+    assert status_code == 200
+    mock_db.add.assert_not_called()
+
+
+def test_logout_requires_token() -> None:
+    with pytest.raises(MarshmallowValidationError):
+        logout()
+
+
+def test_logout_all(mock_db, mocker) -> None:
+    mocker.patch(
+        "app.service.auth.decode_jwt",
+        return_value={"user_id": 1, "exp": 4102444800, "iat": 1000, "ver": 0},
+    )
+    mock_bump = mocker.patch("app.service.auth.bump_token_version")
+    mock_revoke_refresh = mocker.patch("app.service.auth.revoke_user_refresh_tokens")
+    mock_versions = mocker.patch("app.service.auth.get_token_versions")
+
+    response, status_code = logout_all("token", db=mock_db)
+
+    assert status_code == 200
+    assert response == {"message": "Logged out of all sessions"}
+    mock_bump.assert_called_once_with(mock_db, 1)
+    mock_revoke_refresh.assert_called_once_with(mock_db, 1)
+    mock_db.commit.assert_called_once()
+    mock_versions.return_value.invalidate.assert_called_once_with(1)
+
+
+def test_logout_all_invalidates_cached_auth_record(mock_db, mocker) -> None:
+    mocker.patch(
+        "app.service.auth.decode_jwt",
+        return_value={"user_id": 1, "exp": 4102444800, "iat": 1000, "ver": 0},
+    )
+    mocker.patch("app.service.auth.bump_token_version")
+    mocker.patch("app.service.auth.revoke_user_refresh_tokens")
+    mocker.patch("app.service.auth.get_token_versions")
+    record_cache = AuthRecordCache(enabled=True)
+    record_cache.store(
+        "johndoe", object(), record_cache.version("johndoe")
+    )
+    mocker.patch("app.service.auth.get_auth_record_cache", return_value=record_cache)
+    mock_db.scalar.return_value = "johndoe"
+
+    logout_all("token", db=mock_db)
+
+    assert record_cache.get("johndoe") is None
+
+
+def test_logout_all_invalid_token(mock_db, mocker) -> None:
+    mocker.patch("app.service.auth.decode_jwt", return_value=None)
+
+    with pytest.raises(AuthenticationError):
+        logout_all("token", db=mock_db)
+
+    mock_db.commit.assert_not_called()
 
 
 # -------------------------
@@ -653,9 +1259,11 @@ def test_change_password_invalid_old_password(mock_logger) -> None:
 
 
 def test_deactivate_account_success(
-    mock_db, mock_logger, mock_deactivate_account_schema_load, mock_bcrypt
+    mock_db, mock_logger, mock_deactivate_account_schema_load, mock_bcrypt, mocker
 ) -> None:
     # Arrange
+    mock_record_cache = mocker.patch("app.service.auth.get_auth_record_cache")
+    mock_profile_cache = mocker.patch("app.service.auth.get_profile_cache")
     username = "johndoe"
     password = "Password123"
 
@@ -675,7 +1283,7 @@ def test_deactivate_account_success(
         is_active=True,
     )
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = user
+    mock_db.scalars.return_value.first.return_value = user
     mock_bcrypt.checkpw.return_value = True  # Simulate successful password check
 
     # Act
@@ -689,11 +1297,17 @@ def test_deactivate_account_success(
     ]
     mock_logger.assert_has_calls(expected_calls, any_order=False)
     mock_db.commit.assert_called_once()
+    # Bumping token_version invalidates every access token the user holds
+    mock_db.query.return_value.filter.return_value.update.assert_called()
     assert user.is_active is False, "User should be inactive after deactivation"
     assert response == {
         "message": "Account deactivated successfully"
     }, "Unexpected response for deactivation"
     assert status_code == 200, "Unexpected status code for deactivation"
+    mock_record_cache.return_value.invalidate.assert_called_once_with(username)
+    mock_profile_cache.return_value.invalidate.assert_called_once_with(
+        user.id, username
+    )
 
 
 def test_deactivate_account_invalid_credentials(
@@ -719,7 +1333,7 @@ def test_deactivate_account_invalid_credentials(
         is_active=True,
     )
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = user
+    mock_db.scalars.return_value.first.return_value = user
     mock_bcrypt.checkpw.return_value = False  # Simulate failed password check
 
     # Act
@@ -745,7 +1359,7 @@ def test_deactivate_account_user_not_found(
         "password": password,
     }
 
-    mock_db.query.return_value.filter_by.return_value.first.return_value = None
+    mock_db.scalars.return_value.first.return_value = None
 
     # Act
     response, status_code = deactivate_account(username, password, db=mock_db)
@@ -779,7 +1393,7 @@ def test_deactivate_account_already_inactive(
         last_name="Doe",
         is_active=False,  # User is already inactive
     )
-    mock_db.query.return_value.filter_by.return_value.first.return_value = existing_user
+    mock_db.scalars.return_value.first.return_value = existing_user
 
     # Act
     response, status_code = deactivate_account(username, password, db=mock_db)
@@ -822,7 +1436,7 @@ def test_deactivate_account_exception(
         "password": password,
     }
 
-    mock_db.query.side_effect = Exception("Unexpected Error")
+    mock_db.scalars.side_effect = Exception("Unexpected Error")
 
     # Act
     response, status_code = deactivate_account(username, password, db=mock_db)
@@ -948,3 +1562,115 @@ def test_validate_email_valid_subdomains() -> None:
 #     invalid_names = ["John123", "Alice!", "Bob_the_builder", "12345", " ", "Élodie"]
 #     for name in invalid_names:
 #         assert validate_name(name) is False, f"Expected False for invalid name {name}"
+
+
+# -------------------------
+# Tests for introspection
+# -------------------------
+
+
+def test_introspect_active_token(mocker) -> None:
+    mocker.patch(
+        "app.service.auth.decode_jwt",
+        return_value={"user_id": 5, "exp": 2000, "iat": 1000},
+    )
+
+    response, status_code = introspect("token")
+
+    assert status_code == 200
+    assert response == {
+        "active": True,
+        "token_type": "Bearer",
+        "sub": "5",
+        "user_id": 5,
+        "exp": 2000,
+        "iat": 1000,
+    }
+
+
+def test_introspect_inactive_token(mocker) -> None:
+    mocker.patch("app.service.auth.decode_jwt", return_value=None)
+
+    response, status_code = introspect("token")
+
+    assert status_code == 200
+    assert response == {"active": False}
+
+
+def test_introspect_requires_token() -> None:
+    with pytest.raises(MarshmallowValidationError):
+        introspect(None)
+
+
+def test_introspect_batch(mocker) -> None:
+    mocker.patch(
+        "app.service.auth.decode_jwt",
+        side_effect=[{"user_id": 5, "exp": 2000, "iat": 1000}, None],
+    )
+
+    response, status_code = introspect_batch(["good", "bad"])
+
+    assert status_code == 200
+    assert [result["active"] for result in response["results"]] == [True, False]
+
+
+def test_introspect_batch_limits_size() -> None:
+    with pytest.raises(MarshmallowValidationError):
+        introspect_batch(["token"] * 101)
+    with pytest.raises(MarshmallowValidationError):
+        introspect_batch([])
+
+
+# -------------------------
+# Tests for token refresh
+# -------------------------
+
+
+def test_refresh_success(mock_db, mock_generate_jwt, mocker) -> None:
+    mock_rotate = mocker.patch(
+        "app.service.auth.rotate_refresh_token", return_value=(1, 3, "new_refresh")
+    )
+    mock_generate_jwt.return_value = "mock_jwt_token"
+
+    response, status_code = refresh("old_refresh", db=mock_db)
+
+    mock_rotate.assert_called_once_with(mock_db, "old_refresh")
+    mock_generate_jwt.assert_called_once_with(1, 3)
+    mock_db.commit.assert_called_once()
+    assert status_code == 200
+    assert response == {
+        "message": "Token refreshed",
+        "token": "mock_jwt_token",
+        "refresh_token": "new_refresh",
+    }
+
+
+def test_refresh_invalid_token(mock_db, mock_generate_jwt, mocker) -> None:
+    mocker.patch(
+        "app.service.auth.rotate_refresh_token",
+        side_effect=AuthenticationError("Invalid refresh token"),
+    )
+
+    with pytest.raises(AuthenticationError):
+        refresh("bad", db=mock_db)
+
+    mock_generate_jwt.assert_not_called()
+    mock_db.commit.assert_not_called()
+
+
+def test_refresh_database_error(mock_db, mock_generate_jwt, mocker) -> None:
+    mocker.patch(
+        "app.service.auth.rotate_refresh_token", return_value=(1, 3, "new_refresh")
+    )
+    mock_generate_jwt.return_value = "mock_jwt_token"
+    mock_db.commit.side_effect = SQLAlchemyError("DB Error")
+
+    with pytest.raises(DatabaseError):
+        refresh("old_refresh", db=mock_db)
+
+    mock_db.rollback.assert_called_once()
+
+
+def test_refresh_requires_token() -> None:
+    with pytest.raises(MarshmallowValidationError):
+        refresh(None)
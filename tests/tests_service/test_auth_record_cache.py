@@ -0,0 +1,182 @@
+# tests/tests_service/test_auth_record_cache.py
+
+from app.models import UserAuthRecord
+from app.service import auth_record_cache
+from app.service.auth_record_cache import (
+    AuthRecordCache,
+    get_auth_record_cache,
+    init_auth_record_cache,
+)
+from app.utils.cache_backends import MemoryBackend
+
+
+def _record():
+    return UserAuthRecord(1, "hash", True, 0)
+
+
+def _store(cache, username, record=None, **kwargs):
+    cache.store(username, record or _record(), cache.version(username), **kwargs)
+
+
+def test_disabled_cache_never_hits() -> None:
+    cache = AuthRecordCache(enabled=False)
+
+    _store(cache, "johndoe")
+
+    assert cache.get("johndoe") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_store_and_get() -> None:
+    cache = AuthRecordCache(enabled=True)
+    record = _record()
+    _store(cache, "johndoe", record)
+
+    assert cache.get("johndoe") is record
+    assert cache.get("janedoe") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_invalidate_several_usernames() -> None:
+    cache = AuthRecordCache(enabled=True)
+    _store(cache, "johndoe")
+    _store(cache, "janedoe")
+
+    cache.invalidate("johndoe", "janedoe", None)
+
+    assert cache.get("johndoe") is None
+    assert cache.get("janedoe") is None
+
+
+def test_evicts_least_recently_used() -> None:
+    cache = AuthRecordCache(enabled=True, max_entries=1)
+    _store(cache, "johndoe")
+    _store(cache, "janedoe")
+
+    assert cache.get("johndoe") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_shared_tier_warms_other_workers() -> None:
+    shared = MemoryBackend()
+    first = AuthRecordCache(enabled=True, shared=shared)
+    second = AuthRecordCache(enabled=True, shared=shared)
+    _store(first, "johndoe")
+
+    record = second.get("johndoe")
+
+    assert (record.id, record.password, record.is_active, record.token_version) == (
+        1,
+        "hash",
+        True,
+        0,
+    )
+    assert second.stats()["shared"]["hits"] == 1
+    # The second lookup is served from the local tier
+    second.get("johndoe")
+    assert second.stats()["shared"]["hits"] == 1
+
+
+def test_local_only_store_skips_shared_tier() -> None:
+    shared = MemoryBackend()
+    first = AuthRecordCache(enabled=True, shared=shared)
+    second = AuthRecordCache(enabled=True, shared=shared)
+
+    _store(first, "johndoe", shared=False)
+
+    assert first.get("johndoe") is not None
+    assert second.get("johndoe") is None
+
+
+def test_invalidation_drops_only_that_username_elsewhere(mocker) -> None:
+    mock_time = mocker.patch("app.service.auth_record_cache.time")
+    mock_time.monotonic.return_value = 1000.0
+    shared = MemoryBackend()
+    first = AuthRecordCache(enabled=True, shared=shared, sync_interval=1)
+    second = AuthRecordCache(enabled=True, shared=shared, sync_interval=1)
+    _store(first, "johndoe")
+    _store(first, "janedoe")
+    assert second.get("johndoe") is not None
+    assert second.get("janedoe") is not None
+
+    first.invalidate("johndoe")
+
+    # Until the next check the other worker answers from its local tier
+    assert second.get("johndoe") is not None
+    mock_time.monotonic.return_value = 1001.0
+    assert second.get("johndoe") is None
+    assert second.get("janedoe") is not None
+    assert second.stats()["shared"]["stale"] == 1
+
+
+def test_store_skips_record_read_before_invalidation() -> None:
+    shared = MemoryBackend()
+    first = AuthRecordCache(enabled=True, shared=shared)
+    second = AuthRecordCache(enabled=True, shared=shared)
+    version = first.version("johndoe")
+
+    # Another worker invalidates while the first one is still querying
+    second.invalidate("johndoe")
+    first.store("johndoe", _record(), version)
+
+    assert first.get("johndoe") is None
+    assert second.get("johndoe") is None
+    assert first.stats()["shared"]["stale"] == 1
+
+
+def test_shared_entry_from_before_invalidation_is_ignored() -> None:
+    shared = MemoryBackend()
+    first = AuthRecordCache(enabled=True, shared=shared)
+    second = AuthRecordCache(enabled=True, shared=shared)
+    version = first.version("johndoe")
+    second.invalidate("johndoe")
+    # Written after the invalidation but under the old version
+    shared.set("auth_record:johndoe", auth_record_cache._dump(_record(), version), 60)
+
+    assert second.get("johndoe") is None
+    assert second.stats()["shared"]["stale"] == 1
+
+
+def test_shared_tier_errors_count_as_misses(mocker) -> None:
+    shared = mocker.Mock(name="backend")
+    shared.name = "redis"
+    shared.get.side_effect = ConnectionError("down")
+    shared.set.side_effect = ConnectionError("down")
+    cache = AuthRecordCache(enabled=True, shared=shared)
+
+    _store(cache, "johndoe")
+    cache.invalidate("johndoe")
+
+    assert cache.get("johndoe") is None
+    assert cache.stats()["shared"]["errors"] == 3
+
+
+def test_init_auth_record_cache_uses_app_config(mocker) -> None:
+    app = mocker.MagicMock()
+    app.config = {
+        "AUTH_RECORD_CACHE_ENABLED": True,
+        "AUTH_RECORD_CACHE_TTL": 5,
+        "AUTH_RECORD_CACHE_MAX_ENTRIES": 10,
+    }
+
+    init_auth_record_cache(app)
+
+    stats = get_auth_record_cache().stats()
+    assert stats["enabled"] is True
+    assert stats["max_size"] == 10
+    assert get_auth_record_cache()._cache.ttl == 5
+    assert "shared" not in stats
+
+
+def test_init_auth_record_cache_with_shared_backend(mocker) -> None:
+    app = mocker.MagicMock()
+    app.config = {
+        "AUTH_RECORD_CACHE_ENABLED": True,
+        "AUTH_RECORD_CACHE_BACKEND": "memory",
+    }
+
+    init_auth_record_cache(app)
+
+    assert get_auth_record_cache().stats()["shared"]["backend"] == "memory"
@@ -0,0 +1,60 @@
+# tests/tests_service/test_credential_cache.py
+
+from app.service.credential_cache import (
+    CredentialCache,
+    get_credential_cache,
+    init_credential_cache,
+)
+
+
+def test_disabled_cache_never_hits() -> None:
+    cache = CredentialCache(enabled=False)
+
+    cache.store(1, "Password123", "hash")
+
+    assert cache.check(1, "Password123", "hash") is False
+    assert cache.stats()["size"] == 0
+
+
+def test_hit_requires_same_password_and_hash() -> None:
+    cache = CredentialCache(enabled=True)
+    cache.store(1, "Password123", "hash")
+
+    assert cache.check(1, "Password123", "hash") is True
+    assert cache.check(1, "WrongPassword", "hash") is False
+    # A changed stored hash invalidates the entry
+    assert cache.check(1, "Password123", "new_hash") is False
+    assert cache.check(2, "Password123", "hash") is False
+
+
+def test_password_is_not_stored_in_plaintext() -> None:
+    cache = CredentialCache(enabled=True)
+    cache.store(1, "Password123", "hash")
+
+    digest, _ = cache._cache.get(1)
+    assert b"Password123" not in digest
+
+
+def test_invalidate() -> None:
+    cache = CredentialCache(enabled=True)
+    cache.store(1, "Password123", "hash")
+
+    cache.invalidate(1)
+
+    assert cache.check(1, "Password123", "hash") is False
+
+
+def test_init_credential_cache_uses_app_config(mocker) -> None:
+    app = mocker.MagicMock()
+    app.config = {
+        "CREDENTIAL_CACHE_ENABLED": True,
+        "CREDENTIAL_CACHE_TTL": 5,
+        "CREDENTIAL_CACHE_MAX_ENTRIES": 10,
+    }
+
+    init_credential_cache(app)
+
+    stats = get_credential_cache().stats()
+    assert stats["enabled"] is True
+    assert stats["max_size"] == 10
+    assert get_credential_cache()._cache.ttl == 5
@@ -0,0 +1,131 @@
+# tests/tests_service/test_hashers.py
+
+import pytest
+
+from app.service.hashers import (
+    Argon2Hasher,
+    BcryptHasher,
+    ScryptHasher,
+    configure_hashers,
+    get_hasher,
+    get_preferred_hasher,
+    identify_hasher,
+)
+
+
+@pytest.mark.parametrize(
+    "hasher",
+    [
+        BcryptHasher(rounds=4),
+        ScryptHasher(n=2**10, r=8, p=1),
+        Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1),
+    ],
+    ids=["bcrypt", "scrypt", "argon2id"],
+)
+def test_hasher_roundtrip(hasher) -> None:
+    encoded = hasher.hash("Password123")
+
+    assert hasher.identify(encoded)
+    assert hasher.verify("Password123", encoded) is True
+    assert hasher.verify("WrongPassword", encoded) is False
+    assert hasher.needs_rehash(encoded) is False
+
+
+def test_scrypt_encoding_carries_parameters() -> None:
+    encoded = ScryptHasher(n=2**10, r=4, p=2).hash("Password123")
+
+    assert encoded.startswith("$scrypt$ln=10,r=4,p=2$")
+    # A hasher with stronger settings can still verify, but wants a rehash
+    stronger = ScryptHasher(n=2**11, r=4, p=2)
+    assert stronger.verify("Password123", encoded) is True
+    assert stronger.needs_rehash(encoded) is True
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        "$scrypt$",
+        "$scrypt$ln=10,r=4$c2FsdA$a2V5",
+        "$scrypt$ln=ten,r=4,p=2$c2FsdA$a2V5",
+        "$scrypt$ln=0,r=4,p=2$c2FsdA$a2V5",
+        "$scrypt$ln=10,r=4,p=2$c2FsdA$a",
+    ],
+)
+def test_scrypt_malformed_hash_matches_nothing(encoded) -> None:
+    hasher = ScryptHasher(n=2**10)
+
+    assert hasher.verify("Password123", encoded) is False
+    assert hasher.needs_rehash(encoded) is False
+
+
+def test_scrypt_rejects_invalid_n() -> None:
+    with pytest.raises(ValueError):
+        ScryptHasher(n=1000)
+
+
+def test_argon2_needs_rehash_on_cost_change() -> None:
+    encoded = Argon2Hasher(time_cost=1, memory_cost=1024).hash("Password123")
+
+    assert Argon2Hasher(time_cost=2, memory_cost=1024).needs_rehash(encoded) is True
+
+
+def test_argon2_rejects_malformed_hash() -> None:
+    hasher = Argon2Hasher(time_cost=1, memory_cost=1024)
+
+    assert hasher.verify("Password123", "$argon2id$not-a-hash") is False
+
+
+def test_argon2_unavailable(mocker) -> None:
+    mocker.patch("app.service.hashers.argon2", None)
+    hasher = Argon2Hasher()
+
+    assert hasher.available is False
+    with pytest.raises(RuntimeError, match="argon2-cffi is not installed"):
+        hasher.hash("Password123")
+
+
+def test_bcrypt_needs_rehash_ignores_unparseable_hash() -> None:
+    assert BcryptHasher(rounds=12).needs_rehash("hashed_password") is False
+
+
+def test_identify_hasher_by_prefix() -> None:
+    configure_hashers({})
+
+    assert identify_hasher("$2b$12$abc").algorithm == "bcrypt"
+    assert identify_hasher("$scrypt$ln=14,r=8,p=1$a$b").algorithm == "scrypt"
+    assert identify_hasher("$argon2id$v=19$m=1024,t=1,p=1$a$b").algorithm == "argon2id"
+    # Unprefixed hashes predate the registry and are treated as bcrypt
+    assert identify_hasher("legacy").algorithm == "bcrypt"
+
+
+def test_configure_hashers_from_config() -> None:
+    configure_hashers(
+        {
+            "PASSWORD_HASHER": "argon2id",
+            "ARGON2_TIME_COST": 4,
+            "ARGON2_MEMORY_COST": 2048,
+            "ARGON2_PARALLELISM": 2,
+        },
+        bcrypt_rounds=11,
+    )
+
+    assert get_preferred_hasher().algorithm == "argon2id"
+    assert get_hasher("argon2id").time_cost == 4
+    assert get_hasher("argon2id").memory_cost == 2048
+    assert get_hasher("bcrypt").rounds == 11
+
+
+def test_configure_hashers_unknown_algorithm_falls_back(caplog) -> None:
+    configure_hashers({"PASSWORD_HASHER": "md5"})
+
+    assert get_preferred_hasher().algorithm == "bcrypt"
+    assert "Unknown password hasher: md5" in caplog.text
+
+
+def test_configure_hashers_argon2_missing_falls_back(mocker, caplog) -> None:
+    mocker.patch("app.service.hashers.argon2", None)
+
+    configure_hashers({"PASSWORD_HASHER": "argon2id"})
+
+    assert get_preferred_hasher().algorithm == "bcrypt"
+    assert "argon2-cffi is not installed" in caplog.text
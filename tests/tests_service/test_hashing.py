@@ -0,0 +1,231 @@
+# tests/tests_service/test_hashing.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.service import hashers, hashing
+from app.service.hashing import (
+    HashingPool,
+    calibrate_bcrypt_rounds,
+    get_bcrypt_rounds,
+    get_hashing_pool,
+    hash_password,
+    hash_passwords,
+    init_hashing,
+    needs_rehash,
+    verify_password,
+)
+from app.utils.exceptions import ServiceUnavailableError
+
+
+def test_pool_runs_function() -> None:
+    pool = HashingPool(max_workers=1, max_queue=1)
+
+    assert pool.run(lambda a, b: a + b, 2, 3) == 5
+
+    stats = pool.stats()
+    assert stats["submitted"] == 1
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["rejected"] == 0
+
+
+def test_pool_propagates_exceptions() -> None:
+    pool = HashingPool(max_workers=1, max_queue=0)
+
+    def boom():
+        raise RuntimeError("hash failed")
+
+    with pytest.raises(RuntimeError, match="hash failed"):
+        pool.run(boom)
+
+    # The slot must be released even when the task fails
+    assert pool.run(lambda: "ok") == "ok"
+
+
+def test_pool_rejects_when_saturated() -> None:
+    pool = HashingPool(max_workers=1, max_queue=0, retry_after=5)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(timeout=5)
+        return "done"
+
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(value=pool.run(blocking)))
+    worker.start()
+    started.wait(timeout=5)
+
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        pool.run(lambda: "never")
+    assert exc_info.value.retry_after == 5
+
+    release.set()
+    worker.join(timeout=5)
+    assert result["value"] == "done"
+    assert pool.stats()["rejected"] == 1
+
+
+def test_init_hashing_uses_app_config(mocker) -> None:
+    app = mocker.MagicMock()
+    app.config = {
+        "HASH_POOL_MAX_WORKERS": 3,
+        "HASH_POOL_MAX_QUEUE": 7,
+        "HASH_POOL_RETRY_AFTER": 2,
+    }
+
+    init_hashing(app)
+
+    pool = get_hashing_pool()
+    assert pool.max_workers == 3
+    assert pool.max_queue == 7
+    assert pool.retry_after == 2
+
+
+def test_hash_and_verify_password(mocker) -> None:
+    mock_bcrypt = mocker.patch("app.service.hashers.bcrypt")
+    mock_bcrypt.gensalt.return_value = b"salt"
+    mock_bcrypt.hashpw.return_value = b"hashed_password"
+    mock_bcrypt.checkpw.return_value = True
+
+    assert hash_password("Password123") == "hashed_password"
+    mock_bcrypt.gensalt.assert_called_once_with(rounds=get_bcrypt_rounds())
+    mock_bcrypt.hashpw.assert_called_once_with(b"Password123", b"salt")
+
+    assert verify_password("Password123", "hashed_password") is True
+    mock_bcrypt.checkpw.assert_called_once_with(b"Password123", b"hashed_password")
+
+
+def test_hash_and_verify_password_roundtrip() -> None:
+    # Keep the real algorithm but use the cheapest cost factor
+    hashers.configure_hashers({}, bcrypt_rounds=4)
+
+    hashed = hash_password("Password123")
+
+    assert verify_password("Password123", hashed) is True
+    assert verify_password("WrongPassword", hashed) is False
+
+
+def test_hash_passwords_keeps_input_order() -> None:
+    hashers.configure_hashers({}, bcrypt_rounds=4)
+    submitted = get_hashing_pool().stats()["submitted"]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        hashed = hash_passwords(["first", "second", "third"], executor)
+
+    # Bulk hashing stays off the request pool
+    assert get_hashing_pool().stats()["submitted"] == submitted
+    assert verify_password("first", hashed[0]) is True
+    assert verify_password("third", hashed[2]) is True
+
+
+def test_hash_passwords_without_executor_waits_for_the_shared_pool(mocker) -> None:
+    hashers.configure_hashers({}, bcrypt_rounds=4)
+    mock_sleep = mocker.patch("app.service.hashing.time.sleep")
+    pool = get_hashing_pool()
+    run = pool.run
+    rejections = [ServiceUnavailableError(retry_after=3)]
+    lock = threading.Lock()
+
+    def saturated_once(fn, *args):
+        with lock:
+            rejection = rejections.pop() if rejections else None
+        if rejection is not None:
+            raise rejection
+        return run(fn, *args)
+
+    mocker.patch.object(pool, "run", side_effect=saturated_once)
+
+    hashed = hash_passwords(["first", "second"])
+
+    assert pool.run.call_count == 3
+    mock_sleep.assert_called_once_with(3)
+    assert verify_password("first", hashed[0]) is True
+    assert verify_password("second", hashed[1]) is True
+
+
+def test_hash_passwords_without_executor_fills_the_shared_pool(mocker) -> None:
+    hashing._pool = HashingPool(max_workers=2, max_queue=0)
+    # Both hashes must be running at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=2)
+
+    def hash_in_parallel(password):
+        barrier.wait()
+        return f"hashed-{password}"
+
+    mocker.patch.object(hashing, "_hash", side_effect=hash_in_parallel)
+
+    assert hash_passwords(["first", "second"]) == ["hashed-first", "hashed-second"]
+    assert hashing._pool.stats()["rejected"] == 0
+
+
+def test_calibrate_bcrypt_rounds_keeps_floor_on_slow_hardware(mocker) -> None:
+    mocker.patch("app.service.hashing._time_bcrypt", return_value=500)
+
+    assert calibrate_bcrypt_rounds(150, min_rounds=10, max_rounds=16) == 10
+
+
+def test_calibrate_bcrypt_rounds_respects_ceiling(mocker) -> None:
+    mocker.patch("app.service.hashing._time_bcrypt", return_value=1)
+
+    assert calibrate_bcrypt_rounds(150, min_rounds=10, max_rounds=12) == 12
+
+
+def test_init_hashing_calibrates_when_target_set(mocker) -> None:
+    mock_calibrate = mocker.patch(
+        "app.service.hashing.calibrate_bcrypt_rounds", return_value=13
+    )
+    app = mocker.MagicMock()
+    app.config = {"BCRYPT_TARGET_MS": 150, "BCRYPT_MIN_ROUNDS": 11}
+
+    init_hashing(app)
+
+    mock_calibrate.assert_called_once_with(150, min_rounds=11, max_rounds=16)
+    assert get_bcrypt_rounds() == 13
+
+
+def test_init_hashing_uses_configured_rounds(mocker) -> None:
+    mock_calibrate = mocker.patch("app.service.hashing.calibrate_bcrypt_rounds")
+    app = mocker.MagicMock()
+    app.config = {"BCRYPT_TARGET_MS": 0, "BCRYPT_ROUNDS": 11}
+
+    init_hashing(app)
+
+    mock_calibrate.assert_not_called()
+    assert get_bcrypt_rounds() == 11
+
+
+@pytest.mark.parametrize(
+    "preferred, hashed_password, expected",
+    [
+        ("bcrypt", "$2b$12$abcdefghijklmnopqrstuv", False),
+        ("bcrypt", "$2b$10$abcdefghijklmnopqrstuv", True),
+        # A stronger hash from a node that calibrated higher is kept
+        ("bcrypt", "$2a$14$abcdefghijklmnopqrstuv", False),
+        ("bcrypt", "hashed_password", False),
+        ("scrypt", "$2b$12$abcdefghijklmnopqrstuv", True),
+        ("argon2id", "hashed_password", True),
+    ],
+)
+def test_needs_rehash(preferred, hashed_password, expected) -> None:
+    hashers.configure_hashers({"PASSWORD_HASHER": preferred}, bcrypt_rounds=12)
+
+    assert needs_rehash(hashed_password) is expected
+
+
+def test_init_hashing_configures_preferred_hasher(mocker) -> None:
+    app = mocker.MagicMock()
+    app.config = {"PASSWORD_HASHER": "scrypt", "SCRYPT_N": 1024}
+
+    init_hashing(app)
+
+    assert hashers.get_preferred_hasher().algorithm == "scrypt"
+    assert hashers.get_hasher("scrypt").n == 1024
+
+
+def test_time_bcrypt_measures_a_real_hash() -> None:
+    assert hashing._time_bcrypt(4) > 0
@@ -1,7 +1,30 @@
 # tests/tests_service/test_jwt.py
 
 import datetime
-from app.service.jwt import generate_jwt
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from app.service.jwt import (
+    _load_env_keyring,
+    decode_jwt,
+    generate_jwt,
+    get_claims_cache,
+    get_jwks,
+    get_jwks_document,
+)
+from app.service.keyring import KeyRingManager
+from app.service.revocation import RevocationList
+from app.service.token_versions import TokenVersionCache
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_keyring(mocker):
+    """Rebuild the key ring from the (patched) environment in every test."""
+    mocker.patch("app.service.jwt.SECRET_KEY", "smile-secret-key")
+    mocker.patch("app.service.jwt.JWT_ALGORITHM", "HS256")
+    mocker.patch("app.service.jwt._keyring", KeyRingManager(_load_env_keyring))
 
 
 def test_generate_jwt_success(mocker) -> None:
@@ -13,11 +36,13 @@ def test_generate_jwt_success(mocker) -> None:
     mocker.patch("app.service.jwt.SECRET_KEY", mock_secret_key)
 
     # Mock datetime.datetime to control the current time
-    fixed_now = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    fixed_now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
     mock_datetime = mocker.patch("app.service.jwt.datetime")
     mock_datetime.datetime.now.return_value = fixed_now
     mock_datetime.timedelta = datetime.timedelta
 
+    mocker.patch("app.service.jwt.secrets.token_hex", return_value="token-id")
+
     # Mock jwt.encode to return a predefined token
     mock_jwt_encode = mocker.patch(
         "app.service.jwt.jwt.encode", return_value=mock_token
@@ -39,9 +64,14 @@ def test_generate_jwt_success(mocker) -> None:
         "user_id": user_id,
         "exp": fixed_now + datetime.timedelta(hours=1),
         "iat": fixed_now,
+        "jti": "token-id",
+        "ver": 0,
     }
     mock_jwt_encode.assert_called_with(
-        expected_payload, mock_secret_key, algorithm="HS256"
+        expected_payload,
+        mock_secret_key.encode("utf-8"),
+        algorithm="HS256",
+        headers={"kid": "default"},
     )
     mock_logger.debug.assert_called_with(f"Generated JWT: {mock_token}")
 
@@ -82,10 +112,11 @@ def test_generate_jwt_default_secret_key(mocker) -> None:
     mocker.patch("app.service.jwt.SECRET_KEY", "smile-secret-key")
 
     # Mock datetime.datetime to control the current time
-    fixed_now = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    fixed_now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
     mock_datetime = mocker.patch("app.service.jwt.datetime")
     mock_datetime.datetime.now.return_value = fixed_now
     mock_datetime.timedelta = datetime.timedelta
+    mocker.patch("app.service.jwt.secrets.token_hex", return_value="token-id")
 
     # Mock jwt.encode to return a predefined token
     mock_jwt_encode = mocker.patch(
@@ -108,8 +139,147 @@ def test_generate_jwt_default_secret_key(mocker) -> None:
         "user_id": user_id,
         "exp": fixed_now + datetime.timedelta(hours=1),
         "iat": fixed_now,
+        "jti": "token-id",
+        "ver": 0,
     }
     mock_jwt_encode.assert_called_with(
-        expected_payload, "smile-secret-key", algorithm="HS256"
+        expected_payload,
+        b"smile-secret-key",
+        algorithm="HS256",
+        headers={"kid": "default"},
     )
     mock_logger.debug.assert_called_with(f"Generated JWT: {mock_token}")
+
+
+def _write_private_key(tmp_path, private_key):
+    path = tmp_path / "signing_key.pem"
+    path.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "algorithm, private_key",
+    [
+        ("EdDSA", ed25519.Ed25519PrivateKey.generate()),
+        ("RS256", rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+    ],
+)
+def test_generate_jwt_asymmetric(mocker, tmp_path, algorithm, private_key) -> None:
+    mocker.patch("app.service.jwt.JWT_ALGORITHM", algorithm)
+    mocker.patch(
+        "app.service.jwt.JWT_PRIVATE_KEY_PATH",
+        _write_private_key(tmp_path, private_key),
+    )
+
+    token = generate_jwt(42)
+
+    # Verify with nothing but the published JWKS
+    jwk = get_jwks()["keys"][0]
+    assert jwt.get_unverified_header(token)["kid"] == jwk["kid"]
+    public_key = jwt.PyJWK(jwk).key
+    claims = jwt.decode(token, public_key, algorithms=[algorithm])
+    assert claims["user_id"] == 42
+    assert jwk["alg"] == algorithm
+    assert jwk["use"] == "sig"
+    assert "d" not in jwk, "Private key material must not be published"
+
+
+def test_jwks_empty_for_symmetric_signing(mocker) -> None:
+    mocker.patch("app.service.jwt.JWT_ALGORITHM", "HS256")
+
+    assert get_jwks() == {"keys": []}
+    body, etag = get_jwks_document()
+    assert body == '{"keys":[]}'
+    assert etag
+
+
+def test_decode_jwt_roundtrip_and_cache(mocker) -> None:
+    mocker.patch("app.service.jwt._claims_cache", TTLCache())
+    token = generate_jwt(7)
+    mock_decode = mocker.spy(jwt, "decode")
+
+    claims = decode_jwt(token)
+    cached = decode_jwt(token)
+
+    assert claims["user_id"] == 7
+    assert cached is claims
+    mock_decode.assert_called_once()
+    assert get_claims_cache().stats()["hits"] == 1
+
+
+@pytest.mark.parametrize(
+    "token_factory",
+    [
+        # Garbage
+        lambda: "not-a-token",
+        # Signed with a key the ring does not know
+        lambda: pyjwt_encode({"kid": "unknown"}, "smile-secret-key"),
+        # Known kid, wrong secret
+        lambda: pyjwt_encode({"kid": "default"}, "other-secret"),
+        # Expired
+        lambda: pyjwt_encode({"kid": "default"}, "smile-secret-key", exp_delta=-60),
+    ],
+    ids=["garbage", "unknown-kid", "bad-signature", "expired"],
+)
+def test_decode_jwt_rejects_invalid_tokens(mocker, token_factory) -> None:
+    mocker.patch("app.service.jwt._claims_cache", TTLCache())
+
+    assert decode_jwt(token_factory()) is None
+
+
+def test_decode_jwt_without_kid_uses_active_key(mocker) -> None:
+    mocker.patch("app.service.jwt._claims_cache", TTLCache())
+    token = pyjwt_encode({}, "smile-secret-key")
+
+    assert decode_jwt(token)["user_id"] == 1
+
+
+def test_decode_jwt_rejects_revoked_token_even_when_cached(mocker) -> None:
+    mocker.patch("app.service.jwt._claims_cache", TTLCache())
+    revocations = RevocationList()
+    mocker.patch("app.service.jwt.get_revocation_list", return_value=revocations)
+    token = generate_jwt(7)
+    claims = decode_jwt(token)
+
+    revocations.add(claims["jti"], datetime.datetime(2999, 1, 1))
+
+    assert decode_jwt(token) is None
+
+
+def test_decode_jwt_rejects_token_after_version_bump(mocker) -> None:
+    mocker.patch("app.service.jwt._claims_cache", TTLCache())
+    versions = TokenVersionCache(loader=mocker.Mock(return_value=1))
+    mocker.patch("app.service.jwt.get_token_versions", return_value=versions)
+
+    assert decode_jwt(generate_jwt(7, token_version=0)) is None
+    assert decode_jwt(generate_jwt(7, token_version=1))["ver"] == 1
+
+
+def test_decode_jwt_rejects_cached_token_after_key_removal(mocker) -> None:
+    mocker.patch("app.service.jwt._claims_cache", TTLCache())
+    token = generate_jwt(7)
+    assert decode_jwt(token)["user_id"] == 7
+
+    # The manifest reloads without the key that signed the cached token
+    mocker.patch("app.service.jwt.SECRET_KEY", "rotated-secret")
+    mocker.patch("app.service.jwt.JWT_KEY_ID", "rotated")
+    mocker.patch("app.service.jwt._keyring", KeyRingManager(_load_env_keyring))
+
+    assert decode_jwt(token) is None
+    assert get_claims_cache().stats()["size"] == 0
+
+
+def pyjwt_encode(headers, secret, exp_delta=3600):
+    now = datetime.datetime.now(datetime.UTC)
+    payload = {
+        "user_id": 1,
+        "iat": now,
+        "exp": now + datetime.timedelta(seconds=exp_delta),
+    }
+    return jwt.encode(payload, secret, algorithm="HS256", headers=headers)
@@ -0,0 +1,177 @@
+# tests/tests_service/test_keyring.py
+
+import datetime
+import json
+import os
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from app.service.keyring import (
+    KeyRing,
+    KeyRingManager,
+    SigningKey,
+    _thumbprint,
+    load_keyring_manifest,
+)
+
+UTC = datetime.UTC
+
+
+def _pem():
+    return ed25519.Ed25519PrivateKey.generate().private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def _write_manifest(tmp_path, keys):
+    path = tmp_path / "keyring.json"
+    path.write_text(json.dumps({"keys": keys}))
+    return str(path)
+
+
+def test_thumbprint_matches_rfc7638_example() -> None:
+    # Example key from RFC 7638 section 3.1
+    jwk = {
+        "kty": "RSA",
+        "n": (
+            "0vx7agoebGcQSuuPiLJXZptN9nndrQmbXEps2aiAFbWhM78LhWx4cbbfAAtVT86zwu1R"
+            "K7aPFFxuhDR1L6tSoc_BJECPebWKRXjBZCiFV4n3oknjhMstn64tZ_2W-5JsGY4Hc5n9"
+            "yBXArwl93lqt7_RN5w6Cf0h4QyQ5v-65YGjQR0_FDW2QvzqY368QQMicAtaSqzs8KJZg"
+            "nYb9c7d0zgdAZHzu6qMQvRL5hajrn1n91CbOpbISD08qNLyrdkt-bFTWhAI4vMQFh6WeZ"
+            "u0fM4lFd2NcRwr3XPksINHaQ-G_xBniIqbw0Ls1jF44-csFCur-kEgU8awapJzKnqDKgw"
+        ),
+        "e": "AQAB",
+        "alg": "RS256",
+        "kid": "2011-04-29",
+    }
+
+    assert _thumbprint(jwk) == "NzbLsXh8uDCcd-6MNwXF4W_7noWXFZAfHkxZsRGC9Xs"
+
+
+def test_active_key_follows_schedule() -> None:
+    old = SigningKey.from_pem("EdDSA", _pem(), kid="old")
+    new = SigningKey.from_pem(
+        "EdDSA", _pem(), kid="new", not_before=datetime.datetime(2024, 6, 1, tzinfo=UTC)
+    )
+    ring = KeyRing([old, new])
+
+    assert ring.active_key(datetime.datetime(2024, 5, 31, tzinfo=UTC)) is old
+    assert ring.active_key(datetime.datetime(2024, 6, 1, tzinfo=UTC)) is new
+    # Both keys stay available for verification and in the JWKS
+    assert ring.get("old") is old
+    assert ring.get("missing") is None
+    assert [jwk["kid"] for jwk in ring.jwks()["keys"]] == ["new", "old"]
+
+
+def test_active_key_before_any_key_starts() -> None:
+    future = SigningKey.from_secret(
+        "future", "secret", not_before=datetime.datetime(2999, 1, 1, tzinfo=UTC)
+    )
+
+    assert KeyRing([future]).active_key() is future
+
+
+def test_symmetric_keys_are_not_published() -> None:
+    ring = KeyRing([SigningKey.from_secret("default", "secret")])
+
+    assert ring.jwks() == {"keys": []}
+    body, etag = ring.jwks_document()
+    assert body == '{"keys":[]}'
+    assert ring.jwks_document() == (body, etag)
+
+
+def test_keyring_rejects_invalid_key_sets() -> None:
+    with pytest.raises(ValueError):
+        KeyRing([])
+    with pytest.raises(ValueError):
+        KeyRing(
+            [SigningKey.from_secret("a", "one"), SigningKey.from_secret("a", "two")]
+        )
+    with pytest.raises(ValueError):
+        SigningKey.from_pem("HS512", _pem())
+
+
+def test_load_keyring_manifest(tmp_path, monkeypatch) -> None:
+    (tmp_path / "next.pem").write_bytes(_pem())
+    monkeypatch.setenv("LEGACY_SECRET", "legacy-secret")
+    path = _write_manifest(
+        tmp_path,
+        [
+            {
+                "kid": "next",
+                "algorithm": "EdDSA",
+                "private_key_path": "next.pem",
+                "not_before": "2024-06-01T00:00:00Z",
+            },
+            {"kid": "legacy", "algorithm": "HS256", "secret_env": "LEGACY_SECRET"},
+        ],
+    )
+
+    ring = load_keyring_manifest(path)
+
+    assert ring.get("legacy").signing_key == b"legacy-secret"
+    assert ring.get("next").not_before == datetime.datetime(2024, 6, 1, tzinfo=UTC)
+    assert ring.active_key(datetime.datetime(2024, 1, 1, tzinfo=UTC)).kid == "legacy"
+
+
+def test_manager_reloads_on_manifest_change(tmp_path, monkeypatch, mocker) -> None:
+    monkeypatch.setenv("SECRET_ONE", "one")
+    monkeypatch.setenv("SECRET_TWO", "two")
+    path = _write_manifest(
+        tmp_path, [{"kid": "one", "algorithm": "HS256", "secret_env": "SECRET_ONE"}]
+    )
+    mock_time = mocker.patch("app.service.keyring.time")
+    mock_time.monotonic.return_value = 1000.0
+    manager = KeyRingManager(None, manifest_path=path, check_interval=30)
+
+    assert manager.get().active_key().kid == "one"
+
+    _write_manifest(
+        tmp_path, [{"kid": "two", "algorithm": "HS256", "secret_env": "SECRET_TWO"}]
+    )
+    os.utime(path, ns=(1, 10**18))
+
+    # Within the check interval the cached ring is kept
+    mock_time.monotonic.return_value = 1010.0
+    assert manager.get().active_key().kid == "one"
+
+    mock_time.monotonic.return_value = 1031.0
+    assert manager.get().active_key().kid == "two"
+
+
+def test_manager_keeps_ring_when_reload_fails(tmp_path, monkeypatch, mocker) -> None:
+    monkeypatch.setenv("SECRET_ONE", "one")
+    path = _write_manifest(
+        tmp_path, [{"kid": "one", "algorithm": "HS256", "secret_env": "SECRET_ONE"}]
+    )
+    mock_time = mocker.patch("app.service.keyring.time")
+    mock_time.monotonic.return_value = 1000.0
+    manager = KeyRingManager(None, manifest_path=path, check_interval=30)
+    manager.get()
+
+    (tmp_path / "keyring.json").write_text("not json")
+    os.utime(path, ns=(1, 10**18))
+    mock_time.monotonic.return_value = 1031.0
+
+    assert manager.get().active_key().kid == "one"
+
+
+def test_manager_without_manifest_raises_when_missing(tmp_path, mocker) -> None:
+    manager = KeyRingManager(None, manifest_path=str(tmp_path / "missing.json"))
+
+    with pytest.raises(RuntimeError, match="No signing keys available"):
+        manager.get()
+
+
+def test_manager_uses_loader_without_manifest(mocker) -> None:
+    ring = KeyRing([SigningKey.from_secret("default", "secret")])
+    loader = mocker.Mock(return_value=ring)
+    manager = KeyRingManager(loader)
+
+    assert manager.get() is ring
+    assert manager.get() is ring
+    loader.assert_called_once()
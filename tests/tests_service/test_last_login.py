@@ -0,0 +1,126 @@
+# tests/tests_service/test_last_login.py
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.service import last_login
+from app.service.last_login import (
+    LastLoginTracker,
+    build_update,
+    get_last_logins,
+    init_last_login,
+)
+
+EARLY = datetime(2026, 10, 17, 12, 0, 0)
+LATE = datetime(2026, 10, 17, 12, 0, 5)
+
+
+# The tests flush by hand
+pytestmark = pytest.mark.usefixtures("no_background_threads")
+
+
+def tracker(write, **kwargs):
+    tracker = LastLoginTracker(write=write, **kwargs)
+    return tracker
+
+
+def test_disabled_tracker_buffers_nothing() -> None:
+    tracker = LastLoginTracker()
+
+    tracker.touch(1)
+
+    assert tracker.stats()["pending"] == 0
+
+
+def test_repeat_logins_coalesce_to_the_latest_time() -> None:
+    write = MagicMock()
+    t = tracker(write)
+
+    t.touch(1, LATE)
+    t.touch(1, EARLY)
+    t.touch(2, EARLY)
+    t.flush()
+
+    write.assert_called_once_with({1: LATE, 2: EARLY})
+    stats = t.stats()
+    assert stats["touches"] == 3
+    assert stats["written"] == 2
+    assert stats["pending"] == 0
+
+
+def test_flush_writes_in_batches() -> None:
+    write = MagicMock()
+    t = tracker(write, batch_size=2)
+
+    for user_id in range(5):
+        t.touch(user_id, EARLY)
+    t.flush()
+
+    assert [len(c.args[0]) for c in write.call_args_list] == [2, 2, 1]
+
+
+def test_failed_flush_is_retried() -> None:
+    write = MagicMock(side_effect=[RuntimeError("down"), None])
+    t = tracker(write)
+
+    t.touch(1, EARLY)
+    t.flush()
+    t.touch(1, LATE)
+    t.flush()
+
+    assert write.call_args.args[0] == {1: LATE}
+    stats = t.stats()
+    assert stats["failures"] == 1
+    assert stats["written"] == 1
+
+
+def test_flush_without_logins_writes_nothing() -> None:
+    write = MagicMock()
+
+    tracker(write).flush()
+
+    write.assert_not_called()
+
+
+def test_build_update_uses_one_case_statement() -> None:
+    sql = str(build_update({1: EARLY, 2: LATE}).compile(dialect=mysql.dialect()))
+
+    assert sql.startswith(
+        "UPDATE users SET last_login_at=CASE users.id WHEN %s THEN %s WHEN %s THEN %s"
+    )
+    # Never overwrites a later time written by another worker
+    assert "users.last_login_at IS NULL OR users.last_login_at < CASE" in sql
+
+
+def test_init_last_login_reads_config() -> None:
+    app = MagicMock()
+    app.config = {"LAST_LOGIN_TRACKING_ENABLED": False, "LAST_LOGIN_FLUSH_INTERVAL": 5}
+
+    init_last_login(app)
+
+    assert get_last_logins().enabled is False
+    assert get_last_logins().flush_interval == 5
+
+
+def test_init_last_login_does_not_register_exit_hooks(mocker) -> None:
+    register = mocker.patch("app.service.last_login.atexit.register")
+    app = MagicMock()
+    app.config = {"LAST_LOGIN_TRACKING_ENABLED": True}
+
+    init_last_login(app)
+    init_last_login(app)
+
+    register.assert_not_called()
+
+
+def test_exit_hook_flushes_the_current_tracker() -> None:
+    write = MagicMock()
+    last_login._tracker = tracker(write)
+    last_login._tracker.touch(1, EARLY)
+
+    last_login._flush_at_exit()
+
+    write.assert_called_once_with({1: EARLY})
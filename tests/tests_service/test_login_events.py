@@ -0,0 +1,179 @@
+# tests/tests_service/test_login_events.py
+
+import threading
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+from app.service import login_events
+from app.service.login_events import (
+    LOGIN_SUCCESS,
+    LoginEventWriter,
+    get_login_events,
+    init_login_events,
+    maintain_partitions,
+)
+
+
+class RecordingWrite:
+    def __init__(self, error=None) -> None:
+        self.batches = []
+        self.error = error
+        self.written = threading.Event()
+
+    def __call__(self, rows):
+        self.batches.append(rows)
+        self.written.set()
+        if self.error:
+            raise self.error
+
+
+def test_disabled_writer_records_nothing() -> None:
+    writer = LoginEventWriter()
+
+    writer.record(LOGIN_SUCCESS, 1, "johndoe")
+
+    assert writer.stats()["recorded"] == 0
+    assert writer.stats()["queued"] == 0
+
+
+def test_background_thread_writes_batches() -> None:
+    write = RecordingWrite()
+    writer = LoginEventWriter(write=write, flush_interval=0.05)
+
+    writer.record(LOGIN_SUCCESS, 1, "johndoe")
+    writer.record("login_failure", None, "nobody", "unknown_user")
+
+    assert write.written.wait(timeout=2)
+    rows = [row for batch in write.batches for row in batch]
+    assert [row["event"] for row in rows] == [LOGIN_SUCCESS, "login_failure"]
+    assert rows[1]["reason"] == "unknown_user"
+    assert rows[0]["id"] != rows[1]["id"]
+    assert rows[0]["ip_address"] is None
+
+
+def test_record_clips_values_to_column_widths(no_background_threads) -> None:
+    write = RecordingWrite()
+    writer = LoginEventWriter(write=write)
+
+    writer.record("login_failure", None, "x" * 10000, "y" * 100)
+    writer.flush()
+
+    row = write.batches[0][0]
+    assert len(row["username"]) == 150
+    assert len(row["reason"]) == 64
+
+
+def test_flush_writes_in_batches_of_batch_size(no_background_threads) -> None:
+    write = RecordingWrite()
+    writer = LoginEventWriter(write=write, batch_size=2)
+
+    for user_id in range(5):
+        writer.record(LOGIN_SUCCESS, user_id, "johndoe")
+    writer.flush()
+
+    assert [len(batch) for batch in write.batches] == [2, 2, 1]
+    stats = writer.stats()
+    assert stats["written"] == 5
+    assert stats["flushes"] == 3
+    assert stats["queued"] == 0
+
+
+def test_full_queue_drops_events(no_background_threads) -> None:
+    writer = LoginEventWriter(write=RecordingWrite(), max_queue=1)
+
+    writer.record(LOGIN_SUCCESS, 1, "johndoe")
+    writer.record(LOGIN_SUCCESS, 2, "janedoe")
+
+    stats = writer.stats()
+    assert stats["recorded"] == 1
+    assert stats["dropped"] == 1
+
+
+def test_failed_write_is_counted_and_dropped(no_background_threads) -> None:
+    writer = LoginEventWriter(write=RecordingWrite(error=RuntimeError("down")))
+
+    writer.record(LOGIN_SUCCESS, 1, "johndoe")
+    writer.flush()
+
+    stats = writer.stats()
+    assert stats["failures"] == 1
+    assert stats["dropped"] == 1
+    assert stats["written"] == 0
+
+
+def test_init_login_events_reads_config() -> None:
+    app = MagicMock()
+    app.config = {"LOGIN_EVENTS_ENABLED": False, "LOGIN_EVENTS_BATCH_SIZE": 50}
+
+    init_login_events(app)
+
+    writer = get_login_events()
+    assert writer.enabled is False
+    assert writer.batch_size == 50
+
+
+def mysql_session(partitions):
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = "mysql"
+    db.scalars.return_value.all.return_value = partitions
+    return db
+
+
+def test_maintain_partitions_creates_upcoming_days_and_drops_expired() -> None:
+    db = mysql_session(["p20261001", "p20261002", "p20261018", "pmax"])
+
+    result = maintain_partitions(
+        db, retention_days=15, days_ahead=2, today=date(2026, 10, 18)
+    )
+
+    assert result == {
+        "created": ["p20261019", "p20261020"],
+        "dropped": ["p20261001", "p20261002"],
+    }
+    reorganize, drop = [str(c.args[0]) for c in db.execute.call_args_list]
+    assert reorganize == (
+        "ALTER TABLE login_events REORGANIZE PARTITION pmax INTO ("
+        "PARTITION p20261019 VALUES LESS THAN ('2026-10-20'), "
+        "PARTITION p20261020 VALUES LESS THAN ('2026-10-21'), "
+        "PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+    )
+    assert drop == "ALTER TABLE login_events DROP PARTITION p20261001, p20261002"
+    db.commit.assert_called_once()
+
+
+def test_maintain_partitions_is_a_no_op_when_up_to_date() -> None:
+    db = mysql_session(["p20261018", "p20261019", "pmax"])
+
+    result = maintain_partitions(
+        db, retention_days=30, days_ahead=1, today=date(2026, 10, 18)
+    )
+
+    assert result == {"created": [], "dropped": []}
+    db.execute.assert_not_called()
+
+
+def test_maintain_partitions_uses_the_utc_date(mocker) -> None:
+    class UtcClock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime(2026, 10, 18, 23, 30)
+
+    mocker.patch.object(login_events, "datetime", UtcClock)
+    db = mysql_session(["p20261018", "pmax"])
+
+    result = maintain_partitions(db, retention_days=30, days_ahead=1)
+
+    assert result["created"] == ["p20261019"]
+
+
+def test_maintain_partitions_deletes_rows_without_partitioning() -> None:
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = "sqlite"
+    db.execute.return_value.rowcount = 3
+
+    result = maintain_partitions(db, retention_days=90, today=date(2026, 10, 18))
+
+    assert result == {"deleted": 3}
+    statement = db.execute.call_args.args[0]
+    assert statement.is_delete
+    db.commit.assert_called_once()
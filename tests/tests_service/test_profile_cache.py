@@ -0,0 +1,49 @@
+# tests/tests_service/test_profile_cache.py
+
+from app.service.profile_cache import (
+    ProfileCache,
+    get_profile_cache,
+    init_profile_cache,
+)
+
+PROFILE = {"id": 1, "username": "johndoe", "email": "j@example.com"}
+
+
+def test_profile_is_found_by_id_and_username() -> None:
+    cache = ProfileCache()
+
+    cache.store(PROFILE)
+
+    assert cache.get_by_id(1) is PROFILE
+    assert cache.get_by_username("johndoe") is PROFILE
+    assert cache.get_by_id(2) is None
+
+
+def test_invalidate_drops_both_keys() -> None:
+    cache = ProfileCache()
+    cache.store(PROFILE)
+
+    cache.invalidate(1, "johndoe")
+
+    assert cache.get_by_id(1) is None
+    assert cache.get_by_username("johndoe") is None
+
+
+def test_disabled_cache_never_hits() -> None:
+    cache = ProfileCache(enabled=False)
+
+    cache.store(PROFILE)
+
+    assert cache.get_by_id(1) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_init_profile_cache_uses_app_config(mocker) -> None:
+    app = mocker.MagicMock()
+    app.config = {"PROFILE_CACHE_ENABLED": False, "PROFILE_CACHE_MAX_ENTRIES": 10}
+
+    init_profile_cache(app)
+
+    stats = get_profile_cache().stats()
+    assert stats["enabled"] is False
+    assert stats["max_size"] == 10
@@ -0,0 +1,112 @@
+# tests/tests_service/test_refresh_tokens.py
+
+import datetime
+import hashlib
+
+import pytest
+
+from app.models import RefreshToken
+from app.service.refresh_tokens import (
+    issue_refresh_token,
+    prune_refresh_tokens,
+    rotate_refresh_token,
+)
+from app.utils.exceptions import AuthenticationError
+
+
+@pytest.fixture
+def mock_db(mocker):
+    return mocker.MagicMock()
+
+
+def _stored_token(secret="secret", expires_in=3600, family_id="family"):
+    return RefreshToken(
+        id=7,
+        user_id=1,
+        lookup="lookup",
+        token_hash=hashlib.sha256(secret.encode("utf-8")).hexdigest(),
+        family_id=family_id,
+        expires_at=datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        + datetime.timedelta(seconds=expires_in),
+    )
+
+
+def _lookup(mock_db, row):
+    mock_db.query.return_value.join.return_value.filter.return_value.first.return_value = (
+        row
+    )
+
+
+def test_issue_refresh_token_stores_only_a_hash(mock_db) -> None:
+    token = issue_refresh_token(mock_db, 1)
+
+    lookup, secret = token.split(".")
+    stored = mock_db.add.call_args.args[0]
+    assert stored.lookup == lookup
+    assert stored.token_hash == hashlib.sha256(secret.encode("utf-8")).hexdigest()
+    assert secret not in stored.token_hash
+    assert stored.family_id
+
+
+def test_rotate_refresh_token_keeps_family(mock_db) -> None:
+    _lookup(mock_db, (_stored_token(), True, 0))
+    mock_db.query.return_value.filter.return_value.update.return_value = 1
+
+    user_id, token_version, new_token = rotate_refresh_token(mock_db, "lookup.secret")
+
+    assert (user_id, token_version) == (1, 0)
+    assert new_token.split(".")[0] != "lookup"
+    assert mock_db.add.call_args.args[0].family_id == "family"
+    mock_db.commit.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "token, row",
+    [
+        ("no-separator", None),
+        ("lookup.secret", None),
+        ("lookup.wrong", (_stored_token(), True, 0)),
+        ("lookup.secret", (_stored_token(expires_in=-1), True, 0)),
+        ("lookup.secret", (_stored_token(), False, 0)),
+    ],
+)
+def test_rotate_refresh_token_rejects_invalid(mock_db, token, row) -> None:
+    _lookup(mock_db, row)
+
+    with pytest.raises(AuthenticationError):
+        rotate_refresh_token(mock_db, token)
+
+    mock_db.add.assert_not_called()
+
+
+def test_rotate_refresh_token_reuse_revokes_family(mock_db, mocker) -> None:
+    _lookup(mock_db, (_stored_token(), True, 0))
+    # The token was already rotated, so the conditional update matches nothing
+    mock_db.query.return_value.filter.return_value.update.return_value = 0
+    mock_revoke = mocker.patch("app.service.refresh_tokens.revoke_refresh_token_family")
+
+    with pytest.raises(AuthenticationError):
+        rotate_refresh_token(mock_db, "lookup.secret")
+
+    mock_revoke.assert_called_once_with(mock_db, "family")
+    mock_db.commit.assert_called_once()
+    mock_db.add.assert_not_called()
+
+
+def _id_row(row_id):
+    return type("Row", (), {"id": row_id})()
+
+
+def test_prune_refresh_tokens_deletes_in_batches(mock_db) -> None:
+    select_ids = mock_db.query.return_value.filter.return_value.limit.return_value
+    select_ids.all.side_effect = [
+        [_id_row(1), _id_row(2)],
+        [_id_row(3)],
+    ]
+    mock_db.query.return_value.filter.return_value.delete.side_effect = [2, 1]
+
+    deleted = prune_refresh_tokens(mock_db, batch_size=2)
+
+    assert deleted == 3
+    assert mock_db.commit.call_count == 2
+    mock_db.query.return_value.filter.return_value.limit.assert_called_with(2)
@@ -0,0 +1,102 @@
+# tests/tests_service/test_revocation.py
+
+import datetime
+import threading
+
+import pytest
+
+from app.service import revocation
+from app.service.revocation import RevocationList, revoke_token
+
+FUTURE = datetime.datetime(2999, 1, 1)
+PAST = datetime.datetime(2000, 1, 1)
+
+
+@pytest.fixture
+def mock_time(mocker):
+    mock_time = mocker.patch("app.service.revocation.time")
+    mock_time.monotonic.return_value = 1000.0
+    return mock_time
+
+
+def test_local_add_is_visible_immediately() -> None:
+    revocations = RevocationList()
+
+    revocations.add("abc", FUTURE)
+
+    assert revocations.is_revoked("abc")
+    assert not revocations.is_revoked("other")
+    assert not revocations.is_revoked(None)
+
+
+def test_refresh_is_incremental_and_rate_limited(mocker, mock_time) -> None:
+    revoked_at = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    loader = mocker.Mock(
+        side_effect=[[("a", FUTURE, revoked_at)], [("b", FUTURE, revoked_at)]]
+    )
+    revocations = RevocationList(loader=loader, refresh_interval=5)
+
+    assert revocations.is_revoked("a")
+    # Within the interval the loader is not called again
+    mock_time.monotonic.return_value = 1004.0
+    assert not revocations.is_revoked("b")
+
+    mock_time.monotonic.return_value = 1005.0
+    assert revocations.is_revoked("b")
+
+    assert loader.call_args_list[0].args == (None,)
+    # The next pull starts just before the newest row already seen
+    assert loader.call_args_list[1].args[0] < revoked_at
+    assert revocations.stats()["refreshes"] == 2
+
+
+def test_expired_entries_are_dropped(mocker, mock_time) -> None:
+    loader = mocker.Mock(return_value=[("old", PAST, PAST), ("new", FUTURE, PAST)])
+    revocations = RevocationList(loader=loader)
+
+    assert revocations.is_revoked("new")
+    assert not revocations.is_revoked("old")
+    assert revocations.stats()["size"] == 1
+
+
+def test_failed_refresh_keeps_current_entries(mocker, mock_time) -> None:
+    loader = mocker.Mock(side_effect=RuntimeError("no database"))
+    revocations = RevocationList(loader=loader)
+    revocations.add("abc", FUTURE)
+
+    assert revocations.is_revoked("abc")
+    assert revocations.stats()["refresh_failures"] == 1
+
+
+def test_revoke_token_stores_expiry(mocker) -> None:
+    mock_db = mocker.MagicMock()
+
+    expires_at = revoke_token(mock_db, {"jti": "abc", "user_id": 1, "exp": 0})
+
+    assert expires_at == datetime.datetime(1970, 1, 1)
+    stored = mock_db.add.call_args.args[0]
+    assert (stored.jti, stored.user_id, stored.expires_at) == ("abc", 1, expires_at)
+    # Expired rows are pruned in the same transaction
+    mock_db.query.return_value.filter.return_value.delete.assert_called_once()
+
+
+def test_add_during_bloom_rebuild_is_not_lost(mocker) -> None:
+    revocations = RevocationList()
+    revocations.add("old", FUTURE)
+    real_bloom = revocation.BloomFilter
+    adder = threading.Thread(target=revocations.add, args=("late", FUTURE))
+
+    def bloom_started_mid_rebuild(*args, **kwargs):
+        # The jti snapshot is already taken when the new filter is built
+        adder.start()
+        return real_bloom(*args, **kwargs)
+
+    mocker.patch.object(
+        revocation, "BloomFilter", side_effect=bloom_started_mid_rebuild
+    )
+    with revocations._lock:
+        revocations._rebuild_bloom()
+    adder.join(timeout=2)
+
+    assert revocations.is_revoked("late")
+    assert revocations.is_revoked("old")
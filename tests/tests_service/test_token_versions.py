@@ -0,0 +1,48 @@
+# tests/tests_service/test_token_versions.py
+
+from app.service.token_versions import TokenVersionCache, bump_token_version
+
+
+def test_versions_are_cached_per_user(mocker) -> None:
+    loader = mocker.Mock(return_value=2)
+    versions = TokenVersionCache(loader=loader, ttl=60)
+
+    assert versions.current(1) == 2
+    assert versions.current(1) == 2
+    loader.assert_called_once_with(1)
+
+    versions.invalidate(1)
+    assert versions.current(1) == 2
+    assert loader.call_count == 2
+
+
+def test_is_stale_compares_ver_claim(mocker) -> None:
+    versions = TokenVersionCache(loader=mocker.Mock(return_value=1))
+
+    assert versions.is_stale({"user_id": 1, "ver": 0})
+    assert not versions.is_stale({"user_id": 1, "ver": 1})
+    # Tokens issued before the claim existed count as version 0
+    assert versions.is_stale({"user_id": 1})
+
+
+def test_unknown_versions_are_never_stale(mocker) -> None:
+    assert not TokenVersionCache().is_stale({"user_id": 1, "ver": 0})
+
+    missing_user = TokenVersionCache(loader=mocker.Mock(return_value=None))
+    assert not missing_user.is_stale({"user_id": 1, "ver": 0})
+
+
+def test_load_failure_is_counted(mocker) -> None:
+    versions = TokenVersionCache(loader=mocker.Mock(side_effect=RuntimeError("db")))
+
+    assert versions.current(1) is None
+    assert versions.stats()["load_failures"] == 1
+
+
+def test_bump_token_version_is_a_single_update(mocker) -> None:
+    mock_db = mocker.MagicMock()
+
+    bump_token_version(mock_db, 1)
+
+    mock_db.query.return_value.filter.return_value.update.assert_called_once()
+    mock_db.commit.assert_not_called()
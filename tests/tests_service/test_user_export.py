@@ -0,0 +1,78 @@
+# tests/tests_service/test_user_export.py
+
+import datetime
+import gzip
+import json
+
+import pytest
+
+from app.models import User
+from app.service.user_export import export_users, gzip_chunks
+
+
+def _user(user_id):
+    return User(
+        id=user_id,
+        username=f"user{user_id}",
+        email=f"user{user_id}@example.com",
+        first_name="John",
+        last_name="Doe",
+        is_active=True,
+        created_at=datetime.datetime(2024, 1, 1),
+    )
+
+
+@pytest.fixture
+def mock_db(mocker):
+    db = mocker.MagicMock()
+    db.scalars.return_value.partitions.return_value = iter(
+        [[_user(1), _user(2)], [_user(3)]]
+    )
+    return db
+
+
+def test_export_ndjson_yields_one_chunk_per_batch(mock_db) -> None:
+    chunks = list(export_users(mock_db, "ndjson", batch_size=2))
+
+    assert len(chunks) == 2
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert rows[0] == _user(1).to_dict()
+    assert [row["id"] for row in rows] == [1, 2, 3]
+    statement = mock_db.scalars.call_args.args[0]
+    assert statement.get_execution_options()["yield_per"] == 2
+    # The password hash is never selected
+    assert "password" not in str(statement)
+
+
+def test_export_csv_starts_with_header(mock_db) -> None:
+    chunks = list(export_users(mock_db, "csv"))
+
+    assert chunks[0] == (
+        "id,username,email,first_name,last_name,is_active,created_at,"
+        "last_login_at\r\n"
+    )
+    assert chunks[1].splitlines()[0] == (
+        "1,user1,user1@example.com,John,Doe,True,2024-01-01T00:00:00,"
+    )
+
+
+def test_export_reads_from_replica(mock_db, mocker) -> None:
+    mock_use_replica = mocker.patch("app.service.user_export.use_replica")
+
+    list(export_users(mock_db))
+
+    mock_use_replica.assert_called_once_with(mock_db)
+
+
+def test_export_rejects_unknown_format(mock_db) -> None:
+    with pytest.raises(ValueError):
+        list(export_users(mock_db, "xml"))
+
+
+def test_gzip_chunks_round_trip() -> None:
+    chunks = list(gzip_chunks(["first\n", "second\n"]))
+
+    # Every input chunk is flushed so it can be sent right away
+    assert len(chunks) == 3
+    assert all(chunks[:2])
+    assert gzip.decompress(b"".join(chunks)) == b"first\nsecond\n"
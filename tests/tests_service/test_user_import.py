@@ -0,0 +1,194 @@
+# tests/tests_service/test_user_import.py
+
+import io
+
+import pytest
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.service.user_import import ImportCheckpoint, import_users, read_rows
+from app.utils.exceptions import ServiceUnavailableError
+
+
+def _row(index, **overrides):
+    row = {
+        "email": f"user{index}@example.com",
+        "password": "Password123",
+        "first_name": "John",
+        "last_name": "Doe",
+        "username": f"user{index}",
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def mock_db(mocker):
+    db = mocker.MagicMock()
+    # No existing users conflict unless a test says so
+    db.execute.return_value = []
+    return db
+
+
+@pytest.fixture(autouse=True)
+def mock_hash_passwords(mocker):
+    return mocker.patch(
+        "app.service.user_import.hash_passwords",
+        side_effect=lambda passwords, executor: [f"hashed-{p}" for p in passwords],
+    )
+
+
+def test_read_rows_csv() -> None:
+    stream = io.StringIO(
+        "email,password,first_name,last_name,username\n"
+        "a@example.com,Password123,John,Doe,johndoe\n"
+    )
+
+    rows = list(read_rows(stream, "csv"))
+
+    assert rows == [
+        (
+            1,
+            {
+                "email": "a@example.com",
+                "password": "Password123",
+                "first_name": "John",
+                "last_name": "Doe",
+                "username": "johndoe",
+            },
+        )
+    ]
+
+
+def test_read_rows_ndjson_marks_malformed_rows() -> None:
+    stream = io.StringIO('{"username": "johndoe"}\n\nnot json\n[1, 2]\n')
+
+    assert list(read_rows(stream, "ndjson")) == [
+        (1, {"username": "johndoe"}),
+        (2, None),
+        (3, None),
+    ]
+
+
+def test_read_rows_rejects_unknown_format() -> None:
+    with pytest.raises(ValueError):
+        list(read_rows(io.StringIO(""), "xml"))
+
+
+def test_checkpoint_round_trip(tmp_path) -> None:
+    checkpoint = ImportCheckpoint(str(tmp_path / "import.checkpoint"))
+
+    assert checkpoint.load() == 0
+    checkpoint.save(500)
+    assert checkpoint.load() == 500
+
+
+def test_import_inserts_in_batches(mock_db, mocker) -> None:
+    checkpoint = mocker.Mock()
+    rows = [(i, _row(i)) for i in range(1, 6)]
+
+    events = list(import_users(rows, mock_db, batch_size=2, checkpoint=checkpoint))
+
+    assert events[:3] == [
+        {"committed_through": 2, "imported": 2},
+        {"committed_through": 4, "imported": 4},
+        {"committed_through": 5, "imported": 5},
+    ]
+    assert events[-1] == {
+        "done": True,
+        "imported": 5,
+        "failed": 0,
+        "skipped": 0,
+        "committed_through": 5,
+    }
+    assert mock_db.commit.call_count == 3
+    # One conflict check and one executemany insert per batch
+    _, values = mock_db.execute.call_args.args
+    assert values == [{**_row(5), "password": "hashed-Password123"}]
+    checkpoint.save.assert_called_with(5)
+
+
+def test_import_can_hash_on_the_shared_pool(mock_db, mock_hash_passwords) -> None:
+    rows = [(1, _row("a")), (2, _row("b"))]
+
+    events = list(import_users(rows, mock_db, shared_pool=True))
+
+    assert events[-1]["imported"] == 2
+    mock_hash_passwords.assert_called_once_with(["Password123", "Password123"], None)
+
+
+def test_import_reports_invalid_and_duplicate_rows(mock_db) -> None:
+    mock_db.execute.side_effect = [[("taken@example.com", "someone")], None]
+    rows = [
+        (1, _row(1, email="not-an-email")),
+        (2, None),
+        (3, _row(3, email="taken@example.com")),
+        (4, _row(4)),
+        (5, _row(5, username="user4")),
+    ]
+
+    events = list(import_users(rows, mock_db, batch_size=10))
+
+    assert [event["row"] for event in events if "row" in event] == [1, 2, 3, 5]
+    assert events[1] == {"row": 2, "error": {"message": "Malformed row"}}
+    assert events[-1]["imported"] == 1
+    assert events[-1]["failed"] == 4
+
+
+def test_import_skips_rows_before_resume_point(mock_db) -> None:
+    rows = [(i, _row(i)) for i in range(1, 4)]
+
+    events = list(import_users(rows, mock_db, resume_after=2))
+
+    assert events[-1]["skipped"] == 2
+    assert events[-1]["imported"] == 1
+
+
+def test_import_falls_back_to_single_rows_on_integrity_error(mock_db) -> None:
+    mock_db.execute.side_effect = [
+        [],
+        IntegrityError("INSERT", {}, Exception("Duplicate entry")),
+        None,
+        IntegrityError("INSERT", {}, Exception("Duplicate entry")),
+    ]
+    rows = [(1, _row(1)), (2, _row(2))]
+
+    events = list(import_users(rows, mock_db))
+
+    assert {
+        "row": 2,
+        "error": {"message": "Email or username is already in use"},
+    } in events
+    assert events[-1]["imported"] == 1
+    assert mock_db.rollback.call_count == 2
+
+
+def test_import_stops_on_database_error(mock_db) -> None:
+    mock_db.execute.side_effect = [[], None, SQLAlchemyError("DB Error")]
+    rows = [(i, _row(i)) for i in range(1, 4)]
+
+    events = list(import_users(rows, mock_db, batch_size=2))
+
+    assert events == [
+        {"committed_through": 2, "imported": 2},
+        {"error": "Database error occurred", "committed_through": 2},
+    ]
+    mock_db.rollback.assert_called_once()
+
+
+def test_import_stops_when_usernames_cannot_be_announced(mock_db, mocker) -> None:
+    mock_filter = mocker.patch("app.service.user_import.get_username_filter")
+    mock_filter.return_value.announce.side_effect = [
+        None,
+        None,
+        ServiceUnavailableError(),
+    ]
+    rows = [(i, _row(i)) for i in range(1, 4)]
+
+    events = list(import_users(rows, mock_db, batch_size=2))
+
+    assert events == [
+        {"committed_through": 2, "imported": 2},
+        {"error": "Service temporarily unavailable", "committed_through": 2},
+    ]
+    # The batch whose names were not announced is never inserted
+    assert mock_db.commit.call_count == 1
@@ -0,0 +1,131 @@
+# tests/tests_service/test_username_filter.py
+
+import pytest
+
+from app.service.username_filter import (
+    UsernameFilter,
+    get_username_filter,
+    init_username_filter,
+)
+from app.utils.cache_backends import MemoryBackend
+from app.utils.exceptions import ServiceUnavailableError
+
+# The tests rebuild the filter by hand
+pytestmark = pytest.mark.usefixtures("no_background_threads")
+
+
+@pytest.fixture
+def mock_time(mocker):
+    mock_time = mocker.patch("app.service.username_filter.time")
+    mock_time.monotonic.return_value = 1000.0
+    return mock_time
+
+
+def loader_of(*usernames):
+    def load(add):
+        for username in usernames:
+            add(username)
+
+    return load
+
+
+def loaded_filter(loader, shared=None, **kwargs):
+    names = UsernameFilter(loader=loader, shared=shared, **kwargs)
+    names._rebuild()
+    return names
+
+
+def test_filter_without_loader_lets_everything_through() -> None:
+    assert UsernameFilter().might_exist("anyone") is True
+    assert UsernameFilter().stats()["enabled"] is False
+
+
+def test_rejects_unknown_usernames(mock_time) -> None:
+    names = loaded_filter(loader_of("johndoe"), shared=MemoryBackend())
+
+    assert names.might_exist("johndoe") is True
+    assert names.might_exist("mallory") is False
+    assert names.stats()["rejected"] == 1
+
+
+def test_never_rejects_without_shared_tier(mock_time) -> None:
+    names = loaded_filter(loader_of("johndoe"))
+
+    assert names.might_exist("mallory") is True
+    assert names.stats()["passed"] == 1
+
+
+def test_names_announced_elsewhere_are_let_through(mock_time) -> None:
+    shared = MemoryBackend()
+    names = loaded_filter(loader_of(), shared=shared)
+    other_worker = loaded_filter(loader_of(), shared=shared)
+
+    other_worker.announce("bob")
+
+    assert names.might_exist("bob") is True
+    assert other_worker.might_exist("bob") is True
+
+
+def test_stops_rejecting_once_the_filter_is_too_old(mock_time) -> None:
+    names = loaded_filter(loader_of(), shared=MemoryBackend(), rebuild_interval=300)
+
+    mock_time.monotonic.return_value = 1599.0
+    assert names.might_exist("mallory") is False
+    # Announcements older than this may have expired
+    mock_time.monotonic.return_value = 1600.0
+    assert names.might_exist("mallory") is True
+
+
+def test_fails_open_until_first_load(mocker, mock_time) -> None:
+    loader = mocker.Mock(side_effect=[Exception("DB down"), None])
+    names = loaded_filter(loader, shared=MemoryBackend())
+
+    assert names.might_exist("mallory") is True
+    assert names.stats()["load_failures"] == 1
+
+    names._rebuild()
+    assert names.might_exist("mallory") is False
+
+
+def test_shared_read_error_lets_the_name_through(mocker, mock_time) -> None:
+    shared = mocker.Mock(name="backend")
+    shared.get.side_effect = ConnectionError("down")
+    names = loaded_filter(loader_of(), shared=shared)
+
+    assert names.might_exist("mallory") is True
+    assert names.stats()["shared_errors"] == 1
+
+
+def test_announce_fails_when_shared_tier_is_down(mocker, mock_time) -> None:
+    shared = mocker.Mock(name="backend")
+    shared.set.side_effect = ConnectionError("down")
+    names = loaded_filter(loader_of(), shared=shared)
+
+    with pytest.raises(ServiceUnavailableError):
+        names.announce("bob")
+
+
+def test_counts_false_positives(mock_time) -> None:
+    names = loaded_filter(loader_of("ghost"), shared=MemoryBackend())
+
+    names.record_missing("ghost")
+    names.record_missing("mallory")
+
+    stats = names.stats()
+    assert stats["false_positives"] == 1
+    assert stats["bloom"]["items"] == 1
+
+
+def test_init_username_filter_uses_app_config(mocker) -> None:
+    app = mocker.MagicMock()
+    app.config = {
+        "USERNAME_FILTER_ENABLED": True,
+        "USERNAME_FILTER_BACKEND": "memory",
+        "USERNAME_FILTER_CAPACITY": 10,
+    }
+
+    init_username_filter(app)
+
+    assert get_username_filter().enabled is True
+    assert get_username_filter()._capacity == 10
+    assert get_username_filter().stats()["backend"] == "memory"
@@ -0,0 +1,159 @@
+# tests/tests_service/test_users.py
+
+import datetime
+
+import pytest
+from marshmallow import ValidationError as MarshmallowValidationError
+from sqlalchemy.dialects import mysql
+
+from app.models import User
+from app.service.profile_cache import ProfileCache
+from app.service.users import (
+    _decode_cursor,
+    _encode_cursor,
+    batch_get_users,
+    list_users,
+)
+from app.utils.exceptions import ValidationError
+
+CREATED_AT = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _rows(count, *values):
+    # Rows are (created_at, id, *requested fields)
+    return [(CREATED_AT, i, *values) for i in range(1, count + 1)]
+
+
+@pytest.fixture
+def mock_db(mocker):
+    return mocker.MagicMock()
+
+
+def _sql(mock_db):
+    statement = mock_db.execute.call_args.args[0]
+    return str(statement.compile(dialect=mysql.dialect()))
+
+
+def test_list_users_returns_next_cursor_when_more_rows(mock_db) -> None:
+    mock_db.execute.return_value.all.return_value = _rows(3, "johndoe")
+
+    response, status_code = list_users({"limit": "2", "fields": "username"}, db=mock_db)
+
+    assert status_code == 200
+    assert response["users"] == [{"username": "johndoe"}, {"username": "johndoe"}]
+    assert _decode_cursor(response["next_cursor"]) == (CREATED_AT, 2)
+    assert "LIMIT %s" in _sql(mock_db)
+
+
+def test_list_users_last_page_has_no_cursor(mock_db) -> None:
+    mock_db.execute.return_value.all.return_value = [
+        (CREATED_AT, 1, 1, "johndoe", "j@example.com", "John", "Doe", True, CREATED_AT)
+    ]
+
+    response, _ = list_users({}, db=mock_db)
+
+    assert response["next_cursor"] is None
+    assert response["users"][0]["created_at"] == "2024-01-01T12:00:00"
+    assert response["users"][0]["is_active"] is True
+
+
+def test_list_users_seeks_past_cursor(mock_db) -> None:
+    mock_db.execute.return_value.all.return_value = []
+    cursor = _encode_cursor(CREATED_AT, 42)
+
+    list_users({"cursor": cursor, "is_active": "true"}, db=mock_db)
+
+    sql = _sql(mock_db)
+    assert "users.created_at >= %s" in sql
+    assert "users.id > %s" in sql
+    assert "users.is_active = true" in sql
+    assert "OFFSET" not in sql
+    assert "ORDER BY users.created_at, users.id" in sql
+
+
+def test_list_users_prefix_filters_use_like(mock_db) -> None:
+    mock_db.execute.return_value.all.return_value = []
+
+    list_users({"username_prefix": "jo%", "email_prefix": "j"}, db=mock_db)
+
+    sql = _sql(mock_db)
+    assert "users.username LIKE concat(%s, '%%') ESCAPE '/'" in sql
+    assert "users.email LIKE concat(%s, '%%') ESCAPE '/'" in sql
+
+
+def test_list_users_rejects_invalid_cursor(mock_db) -> None:
+    with pytest.raises(ValidationError):
+        list_users({"cursor": "not-a-cursor"}, db=mock_db)
+
+
+def test_list_users_rejects_unknown_fields(mock_db) -> None:
+    with pytest.raises(ValidationError) as exc_info:
+        list_users({"fields": "id,password"}, db=mock_db)
+
+    assert exc_info.value.message == {"fields": ["Unknown fields: password"]}
+
+
+def test_list_users_validates_limit(mock_db) -> None:
+    with pytest.raises(MarshmallowValidationError):
+        list_users({"limit": "1000"}, db=mock_db)
+
+
+def _user(user_id):
+    return User(
+        id=user_id,
+        username=f"user{user_id}",
+        email=f"user{user_id}@example.com",
+        first_name="John",
+        last_name="Doe",
+        is_active=True,
+        created_at=CREATED_AT,
+    )
+
+
+@pytest.fixture
+def profile_cache(mocker):
+    cache = ProfileCache()
+    mocker.patch("app.service.users.get_profile_cache", return_value=cache)
+    return cache
+
+
+def test_batch_get_users_uses_one_in_query(mock_db, profile_cache) -> None:
+    mock_db.scalars.return_value.all.return_value = [_user(1), _user(2)]
+
+    response, status_code = batch_get_users(
+        [2, 1, 999], ["user1", "nobody"], db=mock_db
+    )
+
+    assert status_code == 200
+    assert [user["id"] for user in response["users"]] == [2, 1]
+    assert response["users"][0] == _user(2).to_dict()
+    assert response["not_found"] == {"ids": [999], "usernames": ["nobody"]}
+    mock_db.scalars.assert_called_once()
+    sql = str(mock_db.scalars.call_args.args[0].compile(dialect=mysql.dialect()))
+    assert "users.id IN" in sql
+    assert "users.username IN" in sql
+    assert "users.password" not in sql
+
+
+def test_batch_get_users_serves_cached_profiles(mock_db, profile_cache) -> None:
+    profile_cache.store(_user(1).to_dict())
+
+    response, _ = batch_get_users([1], ["user1"], db=mock_db)
+
+    assert [user["id"] for user in response["users"]] == [1]
+    mock_db.scalars.assert_not_called()
+
+
+def test_batch_get_users_caches_fetched_profiles(mock_db, profile_cache) -> None:
+    mock_db.scalars.return_value.all.return_value = [_user(1)]
+
+    batch_get_users([1], db=mock_db)
+
+    assert profile_cache.get_by_username("user1")["id"] == 1
+
+
+def test_batch_get_users_limits_batch_size(mock_db, profile_cache) -> None:
+    with pytest.raises(MarshmallowValidationError):
+        batch_get_users(list(range(101)), db=mock_db)
+    with pytest.raises(MarshmallowValidationError):
+        batch_get_users(db=mock_db)
@@ -0,0 +1,40 @@
+# tests/tests_utils/test_background.py
+
+from app.utils import background
+from app.utils.background import PerProcess, daemon_thread
+
+
+def test_per_process_builds_once_per_process(mocker) -> None:
+    factory = mocker.Mock(side_effect=["first", "second"])
+    value = PerProcess(factory)
+
+    assert value.get() == "first"
+    assert value.get() == "first"
+    # A forked worker builds its own
+    mocker.patch.object(background.os, "getpid", return_value=-1)
+    assert value.get() == "second"
+    assert factory.call_count == 2
+
+
+def test_pop_only_returns_this_process_value(mocker) -> None:
+    value = PerProcess(lambda: "built")
+    value.get()
+
+    mocker.patch.object(background.os, "getpid", return_value=-1)
+    assert value.pop() is None
+
+    mocker.stopall()
+    value.get()
+    assert value.pop() == "built"
+    assert value.pop() is None
+
+
+def test_daemon_thread_runs_setup_before_starting(no_background_threads) -> None:
+    calls = []
+    no_background_threads.side_effect = lambda target, name: calls.append(name)
+    thread = daemon_thread(lambda: None, "worker", setup=lambda: calls.append("setup"))
+
+    thread.get()
+    thread.get()
+
+    assert calls == ["setup", "worker"]
@@ -0,0 +1,31 @@
+# tests/tests_utils/test_bloom.py
+
+from app.utils.bloom import BloomFilter
+
+
+def test_added_items_are_always_found() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"item-{i}" for i in range(1000)]
+
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    assert len(bloom) == 1000
+
+
+def test_false_positive_rate_near_target() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"item-{i}")
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+
+    assert false_positives / 10000 < 0.03
+
+
+def test_empty_filter_contains_nothing() -> None:
+    bloom = BloomFilter(capacity=10)
+
+    assert "anything" not in bloom
+    assert bloom.stats()["items"] == 0
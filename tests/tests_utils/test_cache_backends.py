@@ -0,0 +1,76 @@
+# tests/tests_utils/test_cache_backends.py
+
+import pytest
+
+from app.utils import cache_backends
+from app.utils.cache_backends import (
+    MemoryBackend,
+    RedisBackend,
+    UWSGICacheBackend,
+    create_backend,
+)
+
+
+def test_memory_backend_get_set_delete() -> None:
+    backend = MemoryBackend()
+
+    backend.set("a", b"1", 60)
+
+    assert backend.get("a") == b"1"
+    backend.delete("a")
+    assert backend.get("a") is None
+    backend.delete("missing")
+
+
+def test_memory_backend_expires_entries(mocker) -> None:
+    mock_time = mocker.patch("app.utils.cache_backends.time")
+    mock_time.monotonic.return_value = 1000.0
+    backend = MemoryBackend()
+    backend.set("a", b"1", 5)
+
+    mock_time.monotonic.return_value = 1005.0
+
+    assert backend.get("a") is None
+
+
+def test_uwsgi_backend_uses_named_cache(mocker) -> None:
+    mock_uwsgi = mocker.patch.object(cache_backends, "uwsgi")
+    mock_uwsgi.cache_get.return_value = b"1"
+    backend = UWSGICacheBackend("auth_records")
+
+    assert backend.get("a") == b"1"
+    backend.set("a", b"1", 60)
+    backend.delete("a")
+
+    mock_uwsgi.cache_get.assert_called_once_with("a", "auth_records")
+    mock_uwsgi.cache_update.assert_called_once_with("a", b"1", 60, "auth_records")
+    mock_uwsgi.cache_del.assert_called_once_with("a", "auth_records")
+
+
+def test_redis_backend_sets_expiry(mocker) -> None:
+    mock_redis = mocker.patch.object(cache_backends, "redis")
+    client = mock_redis.Redis.from_url.return_value
+    backend = RedisBackend("redis://cache:6379/0")
+
+    backend.set("a", b"1", 60)
+    backend.delete("a")
+
+    client.set.assert_called_once_with("a", b"1", ex=60)
+    client.delete.assert_called_once_with("a")
+
+
+def test_unavailable_backends_raise(mocker) -> None:
+    mocker.patch.object(cache_backends, "uwsgi", None)
+    mocker.patch.object(cache_backends, "redis", None)
+
+    with pytest.raises(RuntimeError):
+        UWSGICacheBackend("auth_records")
+    with pytest.raises(RuntimeError):
+        RedisBackend("redis://cache:6379/0")
+
+
+def test_create_backend() -> None:
+    assert create_backend("") is None
+    assert isinstance(create_backend("memory"), MemoryBackend)
+    with pytest.raises(ValueError):
+        create_backend("memcached")
@@ -0,0 +1,81 @@
+# tests/tests_utils/test_singleflight.py
+
+import threading
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, count):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = flight.do(key, fn)
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        release.wait(5)
+        return "record"
+
+    threads, results, _ = _run_concurrently(flight, "johndoe", lookup, 5)
+    while flight.stats()["executions"] + flight.stats()["coalesced"] < 5:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["record"] * 5
+    stats = flight.stats()
+    assert stats["coalesced"] == 4
+    assert stats["coalescing_rate"] == 0.8
+    assert stats["in_flight"] == 0
+
+
+def test_waiters_receive_the_leaders_exception() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def lookup():
+        release.wait(5)
+        raise RuntimeError("DB down")
+
+    threads, _, errors = _run_concurrently(flight, "johndoe", lookup, 3)
+    while flight.stats()["executions"] + flight.stats()["coalesced"] < 3:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_sequential_calls_are_not_cached() -> None:
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do("a", lambda: int("x"))
+    assert flight.stats() == {
+        "in_flight": 0,
+        "executions": 3,
+        "coalesced": 0,
+        "coalescing_rate": 0.0,
+    }
@@ -7,6 +7,7 @@ from app.utils.exceptions import (
     AuthenticationError,
     AuthorizationError,
     DatabaseError,
+    ServiceUnavailableError,
 )
 from marshmallow import ValidationError as MarshmallowValidationError
 import logging
@@ -215,3 +216,27 @@ def test_handle_request_unexpected_error(client, mocker, caplog) -> None:
     assert f"Unexpected error in mock_service: {error_message}" in caplog.text
     # Additionally, check that the exception was logged with traceback
     assert "Traceback (most recent call last)" in caplog.text
+
+
+def test_handle_request_service_unavailable(client, mocker, caplog) -> None:
+    """Test handle_request when a ServiceUnavailableError is raised.
+    Ensures that a 503 with a Retry-After header is returned.
+    """
+    # Arrange
+    service_function = Mock()
+    service_function.__name__ = "mock_service"
+    service_function.side_effect = ServiceUnavailableError(retry_after=3)
+
+    # Set logging level to capture WARNING logs
+    caplog.set_level(logging.WARNING, logger="app.utils.request_handler")
+
+    # Act
+    response, status_code, headers = handle_request(service_function, "arg1")
+
+    # Assert
+    assert status_code == 503
+    assert headers == {"Retry-After": "3"}
+    assert response.json == {"error": "Service temporarily unavailable"}
+
+    # Verify logs
+    assert "Service unavailable in mock_service" in caplog.text